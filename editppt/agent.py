@@ -5,15 +5,27 @@ import json
 import base64
 import shutil
 from copy import deepcopy
+from contextlib import nullcontext
 
 
 import traceback
 
 from editppt.tools.tools import *
+from editppt.tools.tools import _find_shape_by_id, request_style_mapping
+from editppt.tools.journal import EditJournal, INVERTIBLE_TOOLS
+from editppt.tools.batch import run_batches
+from editppt.tools.geometry import BoxSet
+from editppt.parser import SLIDE_LEVEL_TOOLS, tool_target_shape_ids
+from editppt.utils.slide_image import prepare_image, provider_of, decode_image
+from editppt.utils.image_hash import RenderFingerprint, VerdictCache
 from editppt.utils.llm_client import call_llm, call_llm_gemini
+from editppt.scheduler import com_call, in_concurrent_run, SlideStructureChange
+from editppt.utils.slide_serializer import compact_slide_json, compact_tool_calls, format_tool_calls
 from editppt.prompts import *
 from editppt.utils.logger_manual import *
-from editppt.utils.utils import parse_active_slide_objects
+from editppt.utils.log_sink import get_sink
+from editppt.utils.tracer import span, traced, annotate, current_span
+from editppt.utils.llm_ledger import ledger_task
 
 from pathlib import Path
 
@@ -28,6 +40,25 @@ with open(SCHEMA_PATH, "r", encoding="utf-8") as f:
 
 
 
+def format_payload_message(payload_message: list) -> str:
+    """agent_payload_message_*.txt 형식"""
+    lines = []
+    for i, msg in enumerate(payload_message, 1):
+        lines.append(f"[{i}]\n")
+        lines.append(f"role: {msg.get('role')}\n")
+
+        content = msg.get("content")
+        if isinstance(content, list):
+            for block in content:
+                if block.get("type") == "text":
+                    lines.append(block.get("text", ""))
+                    lines.append("\n")
+        else:
+            lines.append(str(content) + "\n")
+        lines.append("\n" + "-" * 50 + "\n\n")
+    return "".join(lines)
+
+
 class EditAgent:
     def __init__(self, container, model: str):
         self.container = container
@@ -38,17 +69,38 @@ class EditAgent:
              os.remove(self.backup_path)
         self.container.prs.SaveAs(self.backup_path)
 
-        self.messages = []
+        # 실패한 시도는 시도마다 만드는 in-memory undo journal로 되돌린다.
+        # 파일 백업은 journal로 되돌릴 수 없을 때의 fallback이므로, 검증된 수정이
+        # 백업보다 새로우면(backup_dirty) 다음 시도 전에 갱신한다.
+        # deck 전체의 상태: True로 바꾸는 성공 처리와 갱신 모두 DeckLock 구간 안에서만 일어난다.
+        self.backup_dirty = False
+        # scheduler.run_plan()이 설정 (동시 실행 시 파일 rollback 구간 보호)
+        self.deck_lock = None
+
+        # page number -> 마지막 tool 배치 실행의 슬라이드별 timing (tools/batch.py)
+        # 같은 page의 task는 동시에 실행되지 않으므로 page별로 둔다
+        self.batch_reports = {}
 
+    @traced("task", report=True)
     def run(self, task: dict, parser: object, vision_validator_agent: object):
+        # LLM ledger의 task / page 태그 (tracing이 켜져 있으면 trace의 task span id와 같은 번호)
+        current = current_span()
+        with ledger_task(task.get("page number"), current.id if current is not None else None):
+            return self._run_task(task, parser, vision_validator_agent)
+
+    def _run_task(self, task: dict, parser: object, vision_validator_agent: object):
+        # task별 상태는 지역 변수로 (scheduler가 같은 EditAgent로 여러 task를 동시에 실행)
         feedback = []
+        messages = []
         max_retries = 5
         retry_count = 0
+        annotate(page=task.get("page number"), description=task.get("description", ""))
 
         print()
 
         while retry_count < max_retries:
             retry_count += 1
+            annotate(attempts=retry_count)
             payload_message = []
             page_number = task.get("page number")
             if not page_number:
@@ -58,12 +110,18 @@ class EditAgent:
             action = task.get("action", "")
             detailed_contents = task.get("contents", "")
 
-            contents = parser.process(page_number)
+            with self._mutation_section(exclusive=False):
+                contents = parser.process(page_number)
             
             # system/user message 구성
+            # 고정 지시문(+ tool schema)이 호출마다 같은 prefix가 되도록 슬라이드 상태는 그 뒤에 (provider prompt cache)
             payload_message.append({
                 "role": "system",
-                "content": create_edit_agent_system_prompt(contents)
+                "content": create_edit_agent_system_prompt()
+            })
+            payload_message.append({
+                "role": "user",
+                "content": create_edit_agent_state_prompt(compact_slide_json(contents))
             })
             payload_message.append({
                 "role": "user",
@@ -72,40 +130,27 @@ class EditAgent:
                 )
             })
 
-            with open(
+            # 직렬화/기록은 log sink worker thread에서 (LLM 호출 사이 지연 제거)
+            log_sink = get_sink()
+            log_sink.write_text(
                 log_path(f"agent_payload_message_{page_number}.txt"),
-                "w",
-                encoding="utf-8"
-            ) as f:
-                for i, msg in enumerate(payload_message, 1):
-                    f.write(f"[{i}]\n")
-                    f.write(f"role: {msg.get('role')}\n")
-
-                    content = msg.get("content")
-                    if isinstance(content, list):
-                        for block in content:
-                            if block.get("type") == "text":
-                                f.write(block.get("text", ""))
-                                f.write("\n")
-                    else:
-                        f.write(str(content) + "\n")
-                    f.write("\n" + "-" * 50 + "\n\n")
+                lambda messages=payload_message: format_payload_message(messages),
+                kind="agent_payload",
+            )
 
             response = call_llm(
                 model=self.model,
                 messages=payload_message,
                 tools=TOOLS_SCHEMA,
-                tool_choice="auto"
+                tool_choice="auto",
+                stage="edit_agent",
             )
 
-            response_dict = response.model_dump()  
-
-            with open(
+            log_sink.write_json(
                 log_path(f"agent_toolcall_response_{page_number}.json"),
-                "w",
-                encoding="utf-8"
-            ) as f:
-                json.dump(response_dict, f, ensure_ascii=False, indent=4)
+                response.model_dump,
+                kind="agent_response",
+            )
 
             # Tool Call Parsing
             tool_calls = []
@@ -118,128 +163,266 @@ class EditAgent:
                     })
 
             # LLM 메시지 로깅
-            with open(log_path(f"agent_Message_retry_{retry_count}.json"), "w", encoding="utf-8") as f:
-                json.dump(self.messages, f, ensure_ascii=False, indent=4)
-
-            #Tool Fail 시 fallback
-            failed_tool_name = None
-            failed_tool_args = None
-            tool_error_reason = None
-            
-            
-            # Tool 실행 
-            for tool_call in tool_calls:
-                function_name = tool_call["name"]
-                function_args = tool_call["arguments"]
-
-                logger.info(f"Tool Call: {function_name}({function_args})")
-
-                if function_name == "set_text_style_preserve_runs":
-                    function_args["slide_json"] = contents
-                    for key in ["bold", "italic", "underline", "font_name", "font_size"]:
-                        if key in function_args and function_args[key] is False:
-                            del function_args[key]
-
-                if function_name == "replace_shape_text":
-                    function_args["slide_json"] = contents
-                    function_args["agent_request"] = description, action, detailed_contents
+            log_sink.write_json(
+                log_path(f"agent_Message_{page_number}_retry_{retry_count}.json"),
+                list(messages),
+                kind="agent_messages",
+            )
 
-                try:
-                    self._execute_tool(function_name, function_args)
+            # 다른 task가 진행 중일 때 슬라이드를 추가/삭제/복제하면 그 task들의 page number가 어긋난다
+            # → scheduler가 이 task를 다른 task가 끝난 뒤 직렬로 다시 실행한다
+            if in_concurrent_run() and any(tc["name"] in SLIDE_LEVEL_TOOLS for tc in tool_calls):
+                raise SlideStructureChange(f"Slide-level tool calls on page {page_number} during a concurrent run")
 
-                except Exception as e:
-                    failed_tool_name = function_name
-                    failed_tool_args = deepcopy(function_args) 
-                    tool_error_reason = f"{function_name} failed: {e}"
-                    break
+            # pre-parse(OOXML)된 슬라이드는 prompt에만 쓰고, diff 기준과 tool의 slide_json은
+            # 수정 전 COM 파싱으로 (이미 COM으로 읽었으면 그대로)
+            with self._mutation_section(exclusive=False):
+                contents = parser.com_baseline(page_number)
 
+            # tool 인자 주입 + replace_shape_text의 style-mapping LLM 호출 (COM 구간 밖)
+            failed_tool_name, failed_tool_args, tool_error_reason = self._prepare_tool_calls(
+                tool_calls, contents, description, action, detailed_contents)
             if tool_error_reason:
-                executed_calls_str = ", ".join(
-                    [f"{tc['name']}({tc['arguments']})" for tc in tool_calls]
-                )
-
                 feedback.append(
                     f"""Tool Execution Failed
                     - Failed Tool: {failed_tool_name}
                     - Failed Args: {json.dumps(failed_tool_args, ensure_ascii=False)}
                     - Error: {tool_error_reason}
-                    - Planned Tools: [{executed_calls_str}]
+                    - Planned Tools: [{format_tool_calls(tool_calls)}]
                     """
                 )
-                self._rollback_ppt("tool", tool_error_reason)
+                logger.warning(f"tool Feedback: {tool_error_reason}")
                 continue
-    
 
-            # Validation 1 (Text/Logic)
-            valid, reason = parser.update_after_edit(
-                text_validation=True,
-                model=self.model,
-                page_number=page_number,
-                description=description,
-                action=action,
-                detailed_contents=detailed_contents,
-                used_tools = tool_calls
-            )
+            # 되돌릴 수 없는 tool이 있으면 파일 백업 갱신부터 검증/재오픈까지 deck 전체를 잠근다
+            # (백업과 재오픈 사이에 다른 task의 수정이 끼면 재오픈으로 사라진다).
+            # journal로 되돌리는 수정은 실행 + 재파싱만 잠그고 검증(LLM)은 잠금 밖에서 한다.
+            needs_file_backup = any(tc["name"] not in INVERTIBLE_TOOLS for tc in tool_calls)
+            exclusive = needs_file_backup
+            can_reopen = exclusive or self.deck_lock is None
+            journal = EditJournal()
+            hold = self._mutation_section(exclusive=True) if exclusive else self._pending_section()
+            with hold:
+                with self._attempt_section(exclusive):
+                    # Tool 실행 (COM thread)
+                    failed_tool_name, failed_tool_args, tool_error_reason = com_call(
+                        self._apply_tool_calls, page_number, tool_calls, journal, needs_file_backup)
+
+                    if tool_error_reason:
+                        # 주입된 slide_json은 feedback에서 제외 (재시도마다 slide 전체가 누적되지 않도록)
+                        executed_calls_str = format_tool_calls(tool_calls)
+                        failed_tool_args = compact_tool_calls(
+                            [{"name": failed_tool_name, "arguments": failed_tool_args}]
+                        )[0]["arguments"]
+
+                        feedback.append(
+                            f"""Tool Execution Failed
+                            - Failed Tool: {failed_tool_name}
+                            - Failed Args: {json.dumps(failed_tool_args, ensure_ascii=False)}
+                            - Error: {tool_error_reason}
+                            - Planned Tools: [{executed_calls_str}]
+                            """
+                        )
+                        if not self._rollback_ppt("tool", tool_error_reason, journal, can_reopen):
+                            break
+                        continue
+
+                    parser.parse_after_edit(page_number, tool_calls)
+
+                # Validation 1 (Text/Logic)
+                valid, reason = parser.validate_edit(
+                    model=self.model,
+                    page_number=page_number,
+                    description=description,
+                    action=action,
+                    detailed_contents=detailed_contents,
+                    used_tools=tool_calls,
+                )
+                failed_stage = None if valid else "text"
 
-            if valid:
-                # Validation 2 (Vision)
-                if vision_validator_agent is not None:
+                if valid and vision_validator_agent is not None:
+                    # Validation 2 (Vision)
                     valid, reason = vision_validator_agent.process(
                         page_number=page_number,
                         agent_request=action,
-                        parsed_contents=contents,
-                        used_tools=tool_calls)
-                    
-                    if valid:
-                        # [최종 성공]
-                        parser.edit_history.setdefault(page_number, []).append(deepcopy(parser.database.get(page_number, None)))
-                        parser.database[page_number] = parse_active_slide_objects(page_number, self.container.prs)
-
-                        with open(log_path("parser_Edithistory.json"), "w", encoding="utf-8") as f:
-                            json.dump(parser.edit_history, f, ensure_ascii=False, indent=4)
-                        with open(log_path("parser_Database.json"), "w", encoding="utf-8") as f:
-                            json.dump(parser.database, f, ensure_ascii=False, indent=4)
-
-                        
-                        # 성공 지점을 백업으로 갱신
-                        self.container.prs.SaveCopyAs(self.backup_path)
+                        parsed_contents=compact_slide_json(contents),
+                        used_tools=compact_tool_calls(tool_calls))
+                    failed_stage = None if valid else "vision"
+
+                if failed_stage is None:
+                    # [최종 성공]
+                    # parse_after_edit()의 수정 후 snapshot을 그대로 반영 (재파싱 없음)
+                    # database / edit history 로그는 commit 시 변경분만 append된다
+                    parser.commit_after_edit(page_number)
+
+                    # 성공 지점 확정. 파일 백업은 되돌릴 수 없는 tool을 실행하기 직전에만 갱신
+                    journal.clear()
+                    self.backup_dirty = True
+                    break
+
+                # 검증 실패 시 롤백 및 재시도 준비
+                executed_calls_str = format_tool_calls(tool_calls)
+                label = "Text" if failed_stage == "text" else "Vision"
+                feedback.append(f"Retry {retry_count} {label} Fail: {reason} | Tools: [{executed_calls_str}]")
+                with self._attempt_section(exclusive, resume=True):
+                    if not self._rollback_ppt(failed_stage, reason, journal, can_reopen):
                         break
-                    else:
-                        # Vision 실패 시 롤백 및 재시도 준비
-                        executed_calls_str = ", ".join([f"{tc['name']}({tc['arguments']})" for tc in tool_calls])
-                        feedback.append(f"Retry {retry_count} Vision Fail: {reason} | Tools: [{executed_calls_str}]")
-                        self._rollback_ppt("vision",reason)
-                        continue
-            else:
-                # Text/Logic 실패 시 롤백 및 재시도 준비
-                executed_calls_str = ", ".join([f"{tc['name']}({tc['arguments']})" for tc in tool_calls])
-                feedback.append(f"Retry {retry_count} Text Fail: {reason} | Tools: [{executed_calls_str}]")
-                self._rollback_ppt("text", reason)
                 continue
 
             # Feedback 파일 갱신
-            with open(log_path(f"agent_Feedback_{page_number}.json"), "w", encoding="utf-8") as f:
-                json.dump(feedback, f, ensure_ascii=False, indent=4)
+            get_sink().write_json(
+                log_path(f"agent_Feedback_{page_number}.json"),
+                list(feedback),
+                kind="agent_feedback",
+            )
+
+    def _mutation_section(self, exclusive: bool, resume: bool = False):
+        """
+        scheduler로 여러 task를 동시에 실행할 때만 DeckLock을 사용한다.
+        """
+        if self.deck_lock is None:
+            return nullcontext()
+        return self.deck_lock.section(exclusive=exclusive, resume=resume)
+
+    def _pending_section(self):
+        """journal 대상 수정의 실행 ~ 검증 구간 (exclusive section이 그동안 백업/재오픈하지 않도록)"""
+        if self.deck_lock is None:
+            return nullcontext()
+        return self.deck_lock.pending()
 
-    def _rollback_ppt(self, type, reason):
+    def _attempt_section(self, exclusive: bool, resume: bool = False):
         """
-        Close edited PPT and roll back to the last backup
+        시도 안에서 deck을 만지는 구간 (tool 실행 + 재파싱, rollback).
+        exclusive면 시도 전체를 이미 잠그고 있으므로 따로 잡지 않는다.
+        """
+        if exclusive:
+            return nullcontext()
+        return self._mutation_section(exclusive=False, resume=resume)
+
+    def _prepare_tool_calls(self, tool_calls, contents, description, action, detailed_contents):
+        """
+        Injects slide_json / agent_request and fetches replace_shape_text's style mapping.
+        Runs outside the COM section: the style-mapping LLM call reads only slide_json,
+        so other tasks' COM work does not wait behind it.
+
+        Returns:
+            (failed_tool_name, failed_tool_args, tool_error_reason), all None on success
+        """
+        for tool_call in tool_calls:
+            function_name = tool_call["name"]
+            function_args = tool_call["arguments"]
+
+            logger.info(f"Tool Call: {function_name}({function_args})")
+
+            if function_name == "set_text_style_preserve_runs":
+                function_args["slide_json"] = contents
+                for key in ["bold", "italic", "underline", "font_name", "font_size"]:
+                    if key in function_args and function_args[key] is False:
+                        del function_args[key]
+
+            if function_name == "replace_shape_text":
+                function_args["slide_json"] = contents
+                function_args["agent_request"] = description, action, detailed_contents
+                try:
+                    function_args["style_mapping"] = request_style_mapping(
+                        contents, function_args.get("shape_id"), function_args.get("new_text"),
+                        function_args["agent_request"],
+                    )
+                except Exception as e:
+                    logger.error(f"Style mapping failed: {e}")
+                    failed_args = compact_tool_calls([tool_call])[0]["arguments"]
+                    return function_name, failed_args, f"{function_name} failed: {e}"
+
+        return None, None, None
+
+    def _apply_tool_calls(self, page_number, tool_calls, journal, refresh_backup):
+        """
+        Runs the prepared tool calls against the deck (COM thread only).
+
+        Returns:
+            (failed_tool_name, failed_tool_args, tool_error_reason), all None on success
+        """
+        # journal로 되돌릴 수 없는 tool이 있을 때만 파일 백업을 최신 성공 상태로 맞춘다
+        # (journal로 되돌리는 수정마다 SaveCopyAs를 하지 않도록)
+        if refresh_backup:
+            self._refresh_file_backup()
+        journal.begin()
+
+        # 슬라이드별로 묶어 shape을 한 번만 찾고, 같은 shape에 대한 연속 호출은 합쳐 실행
+        prs = journal.wrap(self.container.prs)
+        failure, self.batch_reports[page_number] = run_batches(
+            prs, tool_calls,
+            lambda name, args: self._execute_tool(name, args, journal, prs),
+        )
+        if failure:
+            failed_call, e = failure
+            return failed_call["name"], deepcopy(failed_call["arguments"]), f"{failed_call['name']} failed: {e}"
+
+        return None, None, None
+
+    def _refresh_file_backup(self):
+        """
+        Save the current (last verified) state to the backup file if it is stale.
+        """
+        if self.backup_dirty:
+            self.container.prs.SaveCopyAs(self.backup_path)
+            self.backup_dirty = False
+
+    @traced("rollback")
+    def _rollback_ppt(self, type, reason, journal, can_reopen=True):
+        """
+        Undo the failed attempt in memory via the journal.
+        Falls back to closing the edited PPT and reopening the last backup.
+
+        Returns:
+            False if the attempt could not be rolled back (the task must stop)
         """
         logger.warning(f"{type} Feedback: {reason}")
+        annotate(kind=type)
+        return com_call(self._restore_ppt, journal, can_reopen)
+
+    def _restore_ppt(self, journal, can_reopen=True):
+        if journal.can_undo():
+            try:
+                journal.undo()
+                return True
+            except Exception as e:
+                logger.error(f"In-memory rollback failed, reopening backup: {e}")
+
+        journal.clear()
+        # 파일 백업은 되돌릴 수 없는 tool 실행 직전에만 갱신되므로,
+        # journal 대상 수정의 undo가 실패한 경우에는 백업이 오래되었을 수 있다
+        if self.backup_dirty or not can_reopen:
+            # 오래된 백업을 열면 검증된 수정(또는 다른 task의 진행 중인 수정)이 사라진다
+            logger.error(
+                "Rollback aborted: the file backup does not match the last verified state. "
+                "The failed attempt's edits are left in the deck; stopping this task."
+            )
+            annotate(aborted=True)
+            return False
         ppt_app = self.container.prs.Application
         self.container.prs.Close()
         time.sleep(0.5)
         self.container.prs = ppt_app.Presentations.Open(os.path.abspath(self.backup_path))
+        invalidate_shape_index()
+        return True
 
-    def _execute_tool(self, name, args):
+    def _execute_tool(self, name, args, journal, prs=None):
+        """
+        Raises:
+            ValueError: 없는 tool
+            tool이 낸 예외는 그대로 (run_batches가 그 call에서 멈추고 실패로 돌려준다)
+        """
         if name not in FUNCTION_MAP:
-            return f"Error: Tool '{name}' not found."
-        try:
-            return FUNCTION_MAP[name](self.container.prs, **args)
-        except Exception as e:
-            logger.error(f"Execution Error: {e}")
-            logger.error(traceback.format_exc())
-            return f"Error: {str(e)}"
+            raise ValueError(f"Tool '{name}' not found.")
+        with span("tool", tool=name) as current:
+            try:
+                return FUNCTION_MAP[name](prs if prs is not None else journal.wrap(self.container.prs), **args)
+            except Exception as e:
+                current.set(error=type(e).__name__)
+                logger.error(f"Execution Error: {e}")
+                logger.error(traceback.format_exc())
+                raise
 
 
 
@@ -248,9 +431,29 @@ class EditAgent:
 
 
 class VisionValidatorAgent:
-    def __init__(self, container, model: str):
+    def __init__(self, container, model: str, image_width: int = 1024, image_format: str = "auto",
+                 image_quality: int = 80, crop: bool = True, crop_margin: float = 36.0,
+                 keep_images: bool = False, verdict_cache: bool = True):
+        """
+        Args:
+            image_width: Slide.Export 픽셀 너비 (높이는 슬라이드 비율)
+            image_format: 'auto' (provider가 받는 손실 포맷 중 가장 작은 것) | 'webp' | 'jpeg' | 'png'
+            crop: 수정된 shape 영역 + crop_margin(pt)만 보낸다
+            keep_images: 보낸 이미지를 .SlideScreenshots에 남긴다 (디버깅용)
+            verdict_cache: 같은 슬라이드에서 이미 통과한 render와 같으면 vision 호출 생략
+        """
         self.container = container
         self.model = model
+        self.image_width = image_width
+        self.image_format = image_format
+        self.image_quality = image_quality
+        self.crop = crop
+        self.crop_margin = crop_margin
+        self.keep_images = keep_images
+        # 마지막 검증 이미지의 크기/바이트/토큰 추정 (utils/slide_image.py)
+        self.last_image_info = None
+        # 통과한 render의 perceptual hash (utils/image_hash.py)
+        self.verdict_cache = VerdictCache() if verdict_cache else None
 
         self.base_dir = Path(__file__).resolve().parents[1]
 
@@ -260,44 +463,128 @@ class VisionValidatorAgent:
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
     @classmethod
-    def create(cls, activate_valid: bool, container, model: str):
+    def create(cls, activate_valid: bool, container, model: str, **kwargs):
         if not activate_valid:
             return None
-        return cls(container, model)
+        return cls(container, model, **kwargs)
 
+    @traced("export")
+    def _export_slide(self, page_number, image_path, shape_ids):
+        """
+        COM thread: 목표 해상도로 한 번 export 후 메모리로 읽고, 수정된 shape의 박스를 함께 읽는다.
+
+        Returns:
+            (png_bytes, (slide_width, slide_height), boxes)
+        """
+        prs = self.container.prs
+        slide_width = prs.PageSetup.SlideWidth
+        slide_height = prs.PageSetup.SlideHeight
+        height = round(self.image_width * slide_height / slide_width)
+        prs.Slides(page_number).Export(str(image_path), "PNG", self.image_width, height)
+
+        boxes = []
+        for shape_id in shape_ids:
+            try:
+                shape = _find_shape_by_id(prs, page_number, shape_id)
+            except ValueError:
+                # 삭제된 shape 등
+                continue
+            boxes.append(tuple(BoxSet([shape]).boxes[0]))
+
+        png_bytes = image_path.read_bytes()
+        if not self.keep_images:
+            image_path.unlink(missing_ok=True)
+        return png_bytes, (slide_width, slide_height), boxes
+
+    def _modified_shape_ids(self, page_number, used_tools):
+        """이 슬라이드에서 수정된 Shape_Id (자를 수 없는 tool이 있으면 None → 전체 슬라이드)"""
+        shape_ids = set()
+        for tool in used_tools or []:
+            args = tool.get("arguments") or {}
+            if tool.get("name") in SLIDE_LEVEL_TOOLS or args.get("slide_number", page_number) != page_number:
+                return None
+            ids = tool_target_shape_ids(args)
+            if not ids:
+                # shape을 새로 만드는 tool 등 → 영역을 알 수 없음
+                return None
+            shape_ids |= ids
+        return shape_ids or None
+
+    @traced("vision")
     def process(self, page_number, agent_request, parsed_contents, used_tools):
         """
-        1. Extract slide PNG
-        2. Call Vision LLM
-        3. Parse and validate JSON result
+        1. Export the slide once; skip if it matches an already validated render
+        2. Crop to the modified shapes, re-encode in memory
+        3. Call Vision LLM
+        4. Parse and validate JSON result
         """
 
-        # --- Slide Export ---
-        slide = self.container.prs.Slides(page_number)
-
+        # --- Slide Export (COM thread) ---
+        shape_ids = self._modified_shape_ids(page_number, used_tools) if self.crop else None
         image_path = self.output_dir / f"slide_{page_number}.png"
-        slide.Export(str(image_path), "PNG")
+        png_bytes, slide_size, boxes = com_call(
+            self._export_slide, page_number, image_path, sorted(shape_ids or [], key=str))
+
+        render = decode_image(png_bytes)
+
+        # --- 이미 통과한 render와 같으면 vision 호출 생략 ---
+        fingerprint = None
+        if self.verdict_cache is not None:
+            if any(tool.get("name") in SLIDE_LEVEL_TOOLS for tool in used_tools or []):
+                # 슬라이드 순서가 바뀌었으므로 번호별 기록을 버린다
+                self.verdict_cache.clear()
+            fingerprint = RenderFingerprint(render)
+            if self.verdict_cache.lookup(page_number, fingerprint) is not None:
+                logger.info(
+                    f"Vision validation skipped: slide {page_number} matches a validated render "
+                    f"({self.verdict_cache.report()})"
+                )
+                annotate(skipped=True)
+                return True, None
 
-        with open(image_path, "rb") as image_file:
-            encoded_image = base64.b64encode(image_file.read()).decode("utf-8")
+        provider = provider_of(self.model)
+        image_bytes, mime_type, info = prepare_image(
+            png_bytes, slide_size, image=render,
+            boxes=boxes if shape_ids else None,
+            provider=provider,
+            image_format=self.image_format,
+            quality=self.image_quality,
+            margin=self.crop_margin,
+        )
+        self.last_image_info = info
+        logger.info(
+            f"Vision image slide {page_number}: {info['size'][0]}x{info['size'][1]} {info['format']}"
+            f"{' (cropped)' if info['cropped'] else ''}, {info['png_bytes']} -> {info['bytes']} bytes, "
+            f"~{info['tokens_full']} -> ~{info['tokens']} tokens"
+        )
+        if self.keep_images:
+            (self.output_dir / f"slide_{page_number}_sent.{info['format']}").write_bytes(image_bytes)
+
+        # 고정 지시문 → image → 이번 수정의 context 순서 (고정 prefix는 provider prompt cache에 걸린다)
+        context_prompt = create_vision_validator_agent_context_prompt(
+            agent_request,
+            parsed_contents,
+            used_tools,
+        )
 
         # --- LLM Call ---
         if self.model.startswith("gpt"):
+            encoded_image = base64.b64encode(image_bytes).decode("utf-8")
             messages_for_validation = [
                 {
                     "role": "user",
                     "content": [
                         {
                             "type": "input_text",
-                            "text": create_vision_validator_agent_system_prompt(
-                                agent_request,
-                                parsed_contents,
-                                used_tools,
-                            ),
+                            "text": create_vision_validator_agent_system_prompt(),
                         },
                         {
                             "type": "input_image",
-                            "image_url": f"data:image/png;base64,{encoded_image}",
+                            "image_url": f"data:{mime_type};base64,{encoded_image}",
+                        },
+                        {
+                            "type": "input_text",
+                            "text": context_prompt,
                         },
                     ],
                 }
@@ -306,30 +593,34 @@ class VisionValidatorAgent:
             response = call_llm(
                 model=self.model,
                 messages=messages_for_validation,
+                stage="vision",
             )
 
         elif self.model.startswith("gemini"):
-            with open(image_path, "rb") as f:
-                img_bytes = f.read()
-
-            system_prompt = create_vision_validator_agent_system_prompt(
-                agent_request,
-                parsed_contents,
-                used_tools,
-            )
-
             response = call_llm_gemini(
                 model=self.model,
-                messages=system_prompt,
-                image=img_bytes,
+                messages=context_prompt,
+                instructions=create_vision_validator_agent_system_prompt(),
+                image=image_bytes,
+                mime_type=mime_type,
+                stage="vision",
             )
 
         else:
             raise ValueError(f"Unsupported model for vision validation: {self.model}")
 
-        response_text = (response.output_text or "").strip()
+        # call_llm_gemini는 텍스트를 그대로 반환한다
+        response_text = (response if isinstance(response, str) else response.output_text or "").strip()
         print(response_text)
 
+        valid, reason = self._parse_verdict(response_text)
+        if fingerprint is not None:
+            self.verdict_cache.add(page_number, fingerprint, valid, reason)
+            logger.info(self.verdict_cache.report())
+        return valid, reason
+
+    def _parse_verdict(self, response_text):
+        """Vision 응답 → (valid, reason)"""
         # --- JSON Extraction ---
         json_match = re.search(r"\{.*\}", response_text, re.DOTALL)
         if not json_match:
@@ -0,0 +1 @@
+#editppt\benchmarks\__init__.py
\ No newline at end of file
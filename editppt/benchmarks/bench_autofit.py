@@ -0,0 +1,83 @@
+"""
+Autofit benchmark: 0.5pt shrink loop vs bisection in fit_text_to_height.
+
+    python -m editppt.benchmarks.bench_autofit --chars 1200 --height 200
+"""
+import argparse
+import time
+
+from editppt.benchmarks.fake_com import AccessCounter, FakeTextRange, TextStore
+from editppt.tools.tools import fit_text_to_height
+
+
+def build_text_range(counter, n_chars, base_size):
+    runs = []
+    written = 0
+    k = 0
+    while written < n_chars:
+        length = min(60, n_chars - written)
+        text = ("lorem ipsum dolor sit amet " * 3)[:length - 1] + "\r"
+        size = base_size if k % 3 else base_size * 1.5
+        runs.append((text, {"Size": size, "Bold": -1 if k % 2 else 0}))
+        written += length
+        k += 1
+    return FakeTextRange(TextStore.from_runs(counter, runs), whole=True)
+
+
+def legacy_shrink(tr, max_height, max_size=None, min_size=9.0):
+    """The previous replace_shape_text loop, kept here as the baseline."""
+    probes = 0
+    current_size = tr.Font.Size or max(
+        tr.Characters(i, 1).Font.Size for i in range(1, tr.Length + 1)
+    )
+    if max_size:
+        current_size = min(current_size, max_size)
+
+    while tr.BoundHeight > max_height and current_size > min_size:
+        probes += 1
+        current_size -= 0.5
+        tr.Font.Size = current_size
+
+    scale = current_size / tr.Font.Size if tr.Font.Size else 1.0
+    for i in range(1, tr.Length + 1):
+        ch = tr.Characters(i, 1)
+        if ch.Font.Size:
+            ch.Font.Size *= scale
+    return {"probes": probes, "font_size": current_size}
+
+
+def run_benchmark(n_chars, max_height, base_size):
+    results = {}
+    for name, fitter in (("legacy_shrink", legacy_shrink), ("bisect", fit_text_to_height)):
+        counter = AccessCounter()
+        tr = build_text_range(counter, n_chars, base_size)
+        t0 = time.perf_counter()
+        out = fitter(tr, max_height)
+        results[name] = {
+            "probes": out["probes"],
+            "layouts": tr._store.layout_count,
+            "com_calls": counter.total,
+            "final_height": round(tr.BoundHeight, 1),
+            "seconds": time.perf_counter() - t0,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark replace_shape_text autofit")
+    parser.add_argument("--chars", type=int, default=1200)
+    parser.add_argument("--height", type=float, default=200.0)
+    parser.add_argument("--base-size", type=float, default=28.0)
+    args = parser.parse_args()
+
+    results = run_benchmark(args.chars, args.height, args.base_size)
+    print(f"{'fitter':<15}{'probes':>8}{'layouts':>9}{'com_calls':>11}{'height':>9}{'seconds':>10}")
+    for name, r in results.items():
+        print(
+            f"{name:<15}{r['probes']:>8}{r['layouts']:>9}{r['com_calls']:>11}"
+            f"{r['final_height']:>9}{r['seconds']:>10.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+COM call counts for parse_active_slide_objects: per-property walk vs the
+bulk-export macro backend (utils/bulk_export.py), on the fake COM model.
+
+    python -m editppt.benchmarks.bench_bulk_parse --shapes 30
+"""
+import argparse
+import time
+
+from editppt.benchmarks.fake_com import (
+    MSO_PICTURE,
+    MSO_TEXT_BOX,
+    MSO_TRUE,
+    AccessCounter,
+    FakeApplication,
+    FakePresentation,
+    FakeShape,
+    FakeSlide,
+    TextStore,
+)
+from editppt.utils.bulk_export import BulkSlideExporter
+from editppt.utils.utils import parse_active_slide_objects
+
+
+def build_presentation(counter, n_shapes, vba_enabled=True):
+    shapes = []
+    for k in range(n_shapes):
+        store = TextStore.from_runs(counter, [
+            (f"Heading {k}\r", {"Size": 24.0, "Bold": MSO_TRUE}),
+            ("First point with ", {}),
+            ("emphasis", {"Italic": MSO_TRUE, "Color": 0x0000FF}),
+            (" and more text\r", {}),
+            ("Second point\r", {}),
+            ("Closing line", {"Size": 14.0}),
+        ])
+        for index in (1, 2):
+            store.paragraph_format(index).update({"Visible": MSO_TRUE, "Type": 1, "Character": 8226})
+        shapes.append(FakeShape(
+            counter, 100 + k, f"TextBox {k}", MSO_TEXT_BOX,
+            40.0 + k, 60.0 + 2 * k, 300.0, 120.0, text_store=store,
+        ))
+    shapes.append(FakeShape(counter, 999, "Picture", MSO_PICTURE, 500.0, 300.0, 200.0, 150.0,
+                            alternative_text="logo"))
+    app = FakeApplication(counter, vba_enabled=vba_enabled)
+    return FakePresentation(counter, [FakeSlide(counter, shapes)], application=app)
+
+
+def run_benchmark(n_shapes):
+    results = {}
+    reference = None
+    for name, use_bulk, vba_enabled in (
+        ("per_property", False, True),
+        ("bulk_export", True, True),
+        ("bulk_fallback", True, False),
+    ):
+        counter = AccessCounter()
+        prs = build_presentation(counter, n_shapes, vba_enabled)
+        exporter = BulkSlideExporter(prs.Application) if use_bulk else None
+        if exporter is not None:
+            # 매크로 설치는 세션당 1회 → 측정에서 제외
+            exporter.export(prs.Slides(1))
+            counter.reset()
+
+        t0 = time.perf_counter()
+        parsed = parse_active_slide_objects(1, prs, bulk_exporter=exporter)
+        seconds = time.perf_counter() - t0
+
+        if reference is None:
+            reference = parsed
+        results[name] = {
+            "com_calls": counter.total,
+            "identical": parsed == reference,
+            "seconds": seconds,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bulk-export parsing")
+    parser.add_argument("--shapes", type=int, default=30)
+    args = parser.parse_args()
+
+    results = run_benchmark(args.shapes)
+    print(f"{'backend':<15}{'com_calls':>11}{'identical':>11}{'seconds':>10}")
+    for name, r in results.items():
+        print(f"{name:<15}{r['com_calls']:>11}{str(r['identical']):>11}{r['seconds']:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
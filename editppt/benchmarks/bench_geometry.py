@@ -0,0 +1,194 @@
+"""
+Layout tools: per-shape COM reads/writes (previous align_shapes /
+distribute_shapes / align_to_object) vs the NumPy geometry layer
+(tools/geometry.py: one snapshot pass, array ops, changed-only write-back).
+
+Both run through the undo journal on fake COM shapes; COM round-trips, time,
+final geometry and journal undo are compared. arrange_grid / match_size are
+timed on their own (no previous equivalent).
+
+    python -m editppt.benchmarks.bench_geometry --shapes 10 50 200
+"""
+import argparse
+import random
+import time
+
+from editppt.benchmarks.fake_com import AccessCounter, FakePresentation, FakeShape, FakeSlide
+from editppt.tools.journal import EditJournal
+from editppt.tools.tools import (
+    align_shapes, distribute_shapes, align_to_object, arrange_grid, match_size,
+    invalidate_shape_index, _build_shape_index, _find_shape_by_id,
+)
+
+
+GEOMETRY = ("Left", "Top", "Width", "Height")
+
+
+# --- previous implementations (baseline) ---
+
+def legacy_distribute(shapes, direction="horizontal", spacing=None):
+    if direction == "horizontal":
+        shapes.sort(key=lambda s: s.Left)
+        if spacing:
+            for i in range(1, len(shapes)):
+                shapes[i].Left = shapes[i-1].Left + shapes[i-1].Width + spacing
+        else:
+            total_width = sum(s.Width for s in shapes)
+            start = shapes[0].Left
+            end = shapes[-1].Left + shapes[-1].Width
+            gap = (end - start - total_width) / (len(shapes) - 1)
+            current_left = start
+            for shape in shapes:
+                shape.Left = current_left
+                current_left += shape.Width + gap
+    else:
+        shapes.sort(key=lambda s: s.Top)
+        if spacing:
+            for i in range(1, len(shapes)):
+                shapes[i].Top = shapes[i-1].Top + shapes[i-1].Height + spacing
+        else:
+            total_height = sum(s.Height for s in shapes)
+            start = shapes[0].Top
+            end = shapes[-1].Top + shapes[-1].Height
+            gap = (end - start - total_height) / (len(shapes) - 1)
+            current_top = start
+            for shape in shapes:
+                shape.Top = current_top
+                current_top += shape.Height + gap
+
+
+def legacy_align(shapes, align_type="left"):
+    if align_type == "left":
+        left_most = min(s.Left for s in shapes)
+        for shape in shapes:
+            shape.Left = left_most
+    elif align_type == "right":
+        right_most = max(s.Left + s.Width for s in shapes)
+        for shape in shapes:
+            shape.Left = right_most - shape.Width
+    elif align_type == "top":
+        top_most = min(s.Top for s in shapes)
+        for shape in shapes:
+            shape.Top = top_most
+    elif align_type == "bottom":
+        bottom_most = max(s.Top + s.Height for s in shapes)
+        for shape in shapes:
+            shape.Top = bottom_most - shape.Height
+    elif align_type == "center_h":
+        avg_center = sum(s.Left + s.Width / 2 for s in shapes) / len(shapes)
+        for shape in shapes:
+            shape.Left = avg_center - shape.Width / 2
+    elif align_type == "center_v":
+        avg_center = sum(s.Top + s.Height / 2 for s in shapes) / len(shapes)
+        for shape in shapes:
+            shape.Top = avg_center - shape.Height / 2
+
+
+def legacy_align_to_object(target, base, side="right", margin=10):
+    if side == "right":
+        target.Left = base.Left + base.Width + margin
+        target.Top = base.Top
+    elif side == "left":
+        target.Left = base.Left - target.Width - margin
+        target.Top = base.Top
+    elif side == "bottom":
+        target.Left = base.Left
+        target.Top = base.Top + base.Height + margin
+    elif side == "top":
+        target.Left = base.Left
+        target.Top = base.Top - target.Height - margin
+    elif side == "center":
+        target.Left = base.Left + (base.Width - target.Width) / 2
+        target.Top = base.Top + (base.Height - target.Height) / 2
+
+
+# --- cases: (name, legacy(prs, ids), new(prs, ids)) ---
+
+def _shapes(prs, ids):
+    return [_find_shape_by_id(prs, 1, sid) for sid in ids]
+
+
+CASES = [
+    (f"align_{t}", (lambda t: lambda prs, ids: legacy_align(_shapes(prs, ids), t))(t),
+     (lambda t: lambda prs, ids: align_shapes(prs, 1, ids, t))(t))
+    for t in ("left", "right", "center_h", "bottom")
+] + [
+    ("distribute_even", lambda prs, ids: legacy_distribute(_shapes(prs, ids)),
+     lambda prs, ids: distribute_shapes(prs, 1, ids)),
+    ("distribute_spacing", lambda prs, ids: legacy_distribute(_shapes(prs, ids), "vertical", 8),
+     lambda prs, ids: distribute_shapes(prs, 1, ids, "vertical", 8)),
+    ("align_to_object", lambda prs, ids: legacy_align_to_object(*_shapes(prs, ids[:2]), "right", 10),
+     lambda prs, ids: align_to_object(prs, 1, ids[0], ids[1], "right", 10)),
+]
+NEW_ONLY = [
+    ("arrange_grid", lambda prs, ids: arrange_grid(prs, 1, ids, columns=8)),
+    ("match_size", lambda prs, ids: match_size(prs, 1, ids)),
+]
+
+
+def build_presentation(counter, n_shapes, seed=0):
+    rng = random.Random(seed)
+    shapes = [
+        FakeShape(counter, i, f"Shape {i}", 1,
+                  rng.uniform(0, 800), rng.uniform(0, 450), rng.uniform(20, 120), rng.uniform(20, 80))
+        for i in range(1, n_shapes + 1)
+    ]
+    # 일부는 이미 정렬된 상태 (바뀌지 않는 좌표는 기록하지 않는지 확인)
+    for shape in shapes[: n_shapes // 4]:
+        object.__setattr__(shape, "Left", 0.0)
+    return FakePresentation(counter, [FakeSlide(counter, shapes)])
+
+
+def geometry_state(prs):
+    return [tuple(object.__getattribute__(s, a) for a in GEOMETRY) for s in prs.Slides._items[0].Shapes._items]
+
+
+def measure(fn, n_shapes, repeat):
+    counter = AccessCounter()
+    best = None
+    for _ in range(repeat):
+        prs = build_presentation(counter, n_shapes)
+        invalidate_shape_index()
+        _build_shape_index(prs, 1)
+        before = geometry_state(prs)
+        journal = EditJournal()
+        counter.reset()
+        t0 = time.perf_counter()
+        fn(journal.wrap(prs), list(range(1, n_shapes + 1)))
+        seconds = time.perf_counter() - t0
+        best = seconds if best is None else min(best, seconds)
+    after = geometry_state(prs)
+    com_calls = counter.total
+    journal.undo()
+    return {
+        "seconds": best, "com_calls": com_calls, "state": after,
+        "restored": geometry_state(prs) == before,
+    }
+
+
+def _same(a, b, tol=1e-6):
+    return all(abs(x - y) <= tol for ra, rb in zip(a, b) for x, y in zip(ra, rb))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized geometry layer")
+    parser.add_argument("--shapes", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'case':<20}{'shapes':>7}{'old_com':>9}{'new_com':>9}{'old_ms':>9}{'new_ms':>9}{'same':>6}{'undo':>6}")
+    for n in args.shapes:
+        for name, legacy, new in CASES:
+            old = measure(legacy, n, args.repeat)
+            cur = measure(new, n, args.repeat)
+            print(f"{name:<20}{n:>7}{old['com_calls']:>9}{cur['com_calls']:>9}"
+                  f"{old['seconds'] * 1000:>9.3f}{cur['seconds'] * 1000:>9.3f}"
+                  f"{str(_same(old['state'], cur['state'])):>6}{str(old['restored'] and cur['restored']):>6}")
+        for name, new in NEW_ONLY:
+            cur = measure(new, n, args.repeat)
+            print(f"{name:<20}{n:>7}{'-':>9}{cur['com_calls']:>9}{'-':>9}"
+                  f"{cur['seconds'] * 1000:>9.3f}{'-':>6}{str(cur['restored']):>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Counts new TCP connections opened by call_llm against a local HTTP stub.
+
+    python -m editppt.benchmarks.bench_llm_connections --calls 100
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from editppt.utils import llm_client
+
+
+STUB_RESPONSE = {
+    "id": "resp_stub",
+    "object": "response",
+    "created_at": 0,
+    "model": "gpt-4.1",
+    "status": "completed",
+    "output": [
+        {
+            "id": "msg_stub",
+            "type": "message",
+            "role": "assistant",
+            "status": "completed",
+            "content": [{"type": "output_text", "text": "True | stub", "annotations": []}],
+        }
+    ],
+    "parallel_tool_calls": False,
+    "tool_choice": "auto",
+    "tools": [],
+}
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.connections = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def process_request(self, request, client_address):
+        with self._lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+    @property
+    def base_url(self):
+        host, port = self.server_address
+        return f"http://{host}:{port}/v1"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        with self.server._lock:
+            self.server.requests += 1
+        body = json.dumps(STUB_RESPONSE).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _call_uncached(model, messages):
+    """Previous behaviour: a brand-new client (and connection pool) per call."""
+    provider, api_key = llm_client.get_api_key_and_provider(model)
+    client = llm_client._create_client(provider, api_key, llm_client.PROVIDER_BASE_URLS.get(provider))
+    try:
+        return client.responses.create(model=model, input=messages, temperature=0.2)
+    finally:
+        client.close()
+
+
+def run_benchmark(calls, model="gpt-4.1"):
+    server = StubServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    llm_client.OPENAI_API_KEY = llm_client.OPENAI_API_KEY or "stub-key"
+    llm_client.PROVIDER_BASE_URLS["openai"] = server.base_url
+    llm_client.close_clients()
+    messages = [{"role": "user", "content": "ping"}]
+
+    results = {}
+    try:
+        for name, call in (
+            ("client_per_call", lambda: _call_uncached(model, messages)),
+            ("pooled_client", lambda: llm_client.call_llm(model=model, messages=messages)),
+        ):
+            server.connections = 0
+            t0 = time.perf_counter()
+            for _ in range(calls):
+                call()
+            results[name] = {
+                "calls": calls,
+                "tcp_connections": server.connections,
+                "seconds": time.perf_counter() - t0,
+            }
+    finally:
+        llm_client.close_clients()
+        server.shutdown()
+        server.server_close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count TCP connections per LLM call")
+    parser.add_argument("--calls", type=int, default=100)
+    args = parser.parse_args()
+
+    results = run_benchmark(args.calls)
+    print(f"{'mode':<18}{'calls':>7}{'tcp_connections':>17}{'seconds':>10}")
+    for name, r in results.items():
+        print(f"{name:<18}{r['calls']:>7}{r['tcp_connections']:>17}{r['seconds']:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+OOXML file parser (utils/ooxml_parser.py) vs COM parse golden fixtures.
+
+examples/0121_full_parse.json is a COM parse_active_slide_objects() dump of
+sample_ppt/math_simple.pptx (older parser: explicit False font flags, no
+Run_Start_Index / Paragraphs), so runs and fonts are compared after
+normalization. Every sample_ppt/*.pptx is also parsed for timing.
+
+    python -m editppt.benchmarks.bench_ooxml_parse
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+
+from editppt.utils.ooxml_parser import OoxmlPresentation
+
+
+ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_DECK = ROOT / "sample_ppt" / "math_simple.pptx"
+DEFAULT_GOLDEN = ROOT / "editppt" / "examples" / "0121_full_parse.json"
+SHAPE_KEYS = ("Shape_Id", "Name", "Type", "Position_Left", "Position_Top", "Size_Width", "Size_Height")
+SLIDE_KEYS = ("Slide Width", "Slide Height", "Slide_Properties", "Slide_Notes", "Objects_Overview")
+
+
+def _normalize_runs(runs: list) -> list:
+    """False 플래그 제거 + 같은 font의 인접 run 병합 (파서 버전 차이 흡수)"""
+    out = []
+    for run in runs or []:
+        font = {k: v for k, v in (run.get("Font") or {}).items() if v is not False}
+        if out and out[-1]["Font"] == font:
+            out[-1]["Text"] += run.get("Text", "")
+        else:
+            out.append({"Text": run.get("Text", ""), "Font": font})
+    return out
+
+
+def _text_frame(more_detail: dict) -> dict:
+    return ((more_detail or {}).get("Text") or {}).get("TextFrame") or {}
+
+
+def compare_slide(parsed: dict, golden: dict) -> dict:
+    """필드 그룹별 (일치 수, 전체 수)와 불일치 예시"""
+    counts = {}
+    mismatches = []
+
+    def check(group, ok, where):
+        hit, total = counts.get(group, (0, 0))
+        counts[group] = (hit + bool(ok), total + 1)
+        if not ok:
+            mismatches.append(f"{group}: {where}")
+
+    for key in SLIDE_KEYS:
+        check("slide", parsed.get(key) == golden.get(key), key)
+
+    golden_shapes = {s["Shape_Id"]: s for s in golden.get("Objects_Detail", [])}
+    for shape in parsed.get("Objects_Detail", []):
+        sid = shape["Shape_Id"]
+        expected = golden_shapes.pop(sid, None)
+        check("shapes", expected is not None, f"extra shape {sid}")
+        if expected is None:
+            continue
+        for key in SHAPE_KEYS:
+            check("geometry" if key.startswith(("Position", "Size")) else "shapes",
+                  shape.get(key) == expected.get(key), f"shape {sid} {key}")
+
+        frame = _text_frame(shape.get("More_detail"))
+        golden_frame = _text_frame(expected.get("More_detail"))
+        check("text", frame.get("Text") == golden_frame.get("Text"), f"shape {sid} Text")
+        check("runs", _normalize_runs(frame.get("Runs")) == _normalize_runs(golden_frame.get("Runs")),
+              f"shape {sid} Runs")
+        others = {k: v for k, v in (shape.get("More_detail") or {}).items() if k != "Text"}
+        golden_others = {k: v for k, v in (expected.get("More_detail") or {}).items() if k != "Text"}
+        check("details", others == golden_others, f"shape {sid} More_detail")
+    for sid in golden_shapes:
+        check("shapes", False, f"missing shape {sid}")
+    return {"counts": counts, "mismatches": mismatches}
+
+
+def run_golden(deck: Path, golden_path: Path) -> dict:
+    golden = json.loads(Path(golden_path).read_text(encoding="utf-8"))
+    totals = {}
+    mismatches = []
+    with OoxmlPresentation(str(deck)) as prs:
+        for key, expected in golden.items():
+            result = compare_slide(prs.parse_slide(int(key)), expected)
+            for group, (hit, total) in result["counts"].items():
+                h, t = totals.get(group, (0, 0))
+                totals[group] = (h + hit, t + total)
+            mismatches += [f"slide {key} {m}" for m in result["mismatches"]]
+    return {"totals": totals, "mismatches": mismatches}
+
+
+def run_timing(decks: list, repeat: int = 3) -> dict:
+    timings = {}
+    for deck in decks:
+        best = None
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            with OoxmlPresentation(str(deck)) as prs:
+                slides = prs.parse_all()
+            seconds = time.perf_counter() - t0
+            best = seconds if best is None else min(best, seconds)
+        shapes = sum(len(s.get("Objects_Detail", [])) for s in slides.values())
+        timings[deck.name] = {"slides": len(slides), "shapes": shapes, "seconds": best}
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the OOXML parser against COM golden fixtures")
+    parser.add_argument("--deck", type=str, default=str(DEFAULT_DECK))
+    parser.add_argument("--golden", type=str, default=str(DEFAULT_GOLDEN))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--show", type=int, default=10, help="출력할 불일치 예시 수")
+    args = parser.parse_args()
+
+    golden = run_golden(Path(args.deck), Path(args.golden))
+    print(f"{'field group':<12}{'match':>8}{'total':>8}{'rate':>8}")
+    for group, (hit, total) in golden["totals"].items():
+        print(f"{group:<12}{hit:>8}{total:>8}{hit / max(total, 1):>8.2%}")
+    for line in golden["mismatches"][:args.show]:
+        print(f"  - {line}")
+
+    decks = sorted((ROOT / "sample_ppt").glob("*.pptx"))
+    print(f"\n{'deck':<26}{'slides':>8}{'shapes':>8}{'seconds':>10}")
+    for name, r in run_timing(decks, args.repeat).items():
+        print(f"{name:<26}{r['slides']:>8}{r['shapes']:>8}{r['seconds']:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Whole-deck pre-parse (utils/parse_store.py): serial vs process pool, then
+re-open from the on-disk store, then re-open after editing one slide.
+
+A large deck is synthesized by repeating the slides of a sample deck.
+
+    python -m editppt.benchmarks.bench_preparse --slides 200 --workers 4
+"""
+import argparse
+import re
+import tempfile
+import zipfile
+from pathlib import Path
+
+from editppt.utils.parse_store import ParseStore, preparse_deck, _slide_names
+
+
+ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_DECK = ROOT / "sample_ppt" / "math_simple.pptx"
+SLIDE_REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/slide"
+SLIDE_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.slide+xml"
+
+
+def build_deck(src: Path, n_slides: int, out: Path):
+    """src의 슬라이드를 반복해 n_slides장짜리 덱을 만든다."""
+    with zipfile.ZipFile(src) as zin:
+        parts = {name: zin.read(name) for name in zin.namelist()}
+        sources = _slide_names(zin)
+
+    slide_parts = set(sources)
+    pres = parts["ppt/presentation.xml"].decode("utf-8")
+    rels = parts["ppt/_rels/presentation.xml.rels"].decode("utf-8")
+    types = parts["[Content_Types].xml"].decode("utf-8")
+
+    rels = re.sub(rf'<Relationship [^>]*Type="{SLIDE_REL_TYPE}"[^>]*/>', "", rels)
+    types = re.sub(rf'<Override PartName="/ppt/slides/[^"]+" ContentType="{SLIDE_CONTENT_TYPE}"/>', "", types)
+    sld_ids, new_rels, new_types = [], [], []
+    out_parts = {
+        name: data for name, data in parts.items()
+        if name not in slide_parts and not name.startswith("ppt/slides/_rels/")
+    }
+    for i in range(1, n_slides + 1):
+        source = sources[(i - 1) % len(sources)]
+        source_rels = source.replace("slides/", "slides/_rels/") + ".rels"
+        out_parts[f"ppt/slides/slide{i}.xml"] = parts[source]
+        if source_rels in parts:
+            out_parts[f"ppt/slides/_rels/slide{i}.xml.rels"] = parts[source_rels]
+        sld_ids.append(f'<p:sldId id="{1000 + i}" r:id="rIdS{i}"/>')
+        new_rels.append(f'<Relationship Id="rIdS{i}" Type="{SLIDE_REL_TYPE}" Target="slides/slide{i}.xml"/>')
+        new_types.append(f'<Override PartName="/ppt/slides/slide{i}.xml" ContentType="{SLIDE_CONTENT_TYPE}"/>')
+
+    pres = re.sub(r"<p:sldIdLst>.*?</p:sldIdLst>", "<p:sldIdLst>" + "".join(sld_ids) + "</p:sldIdLst>", pres)
+    out_parts["ppt/presentation.xml"] = pres.encode("utf-8")
+    out_parts["ppt/_rels/presentation.xml.rels"] = rels.replace("</Relationships>", "".join(new_rels) + "</Relationships>").encode("utf-8")
+    out_parts["[Content_Types].xml"] = types.replace("</Types>", "".join(new_types) + "</Types>").encode("utf-8")
+    _write_zip(out, out_parts)
+
+
+def edit_slide_text(path: Path, slide_num: int, text: str = "Edited"):
+    """덱 파일에서 한 슬라이드의 첫 텍스트를 바꾼다 (파일 단위 수정 시뮬레이션)."""
+    with zipfile.ZipFile(path) as zin:
+        parts = {name: zin.read(name) for name in zin.namelist()}
+        part = _slide_names(zin)[slide_num - 1]
+    xml = parts[part].decode("utf-8")
+    parts[part] = re.sub(r"<a:t>[^<]*</a:t>", f"<a:t>{text}</a:t>", xml, count=1).encode("utf-8")
+    _write_zip(path, parts)
+
+
+def _write_zip(path: Path, parts: dict):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zout:
+        for name, data in parts.items():
+            zout.writestr(name, data)
+
+
+def run_benchmark(src: Path, n_slides: int, workers: int) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        deck = Path(tmp) / "deck.pptx"
+        build_deck(src, n_slides, deck)
+
+        serial, results["cold_serial"] = preparse_deck(
+            deck, store=ParseStore(Path(tmp) / "store_serial"), max_workers=1)
+        store = ParseStore(Path(tmp) / "store")
+        pooled, results["cold_pool"] = preparse_deck(deck, store=store, max_workers=workers)
+        warm, results["warm_store"] = preparse_deck(deck, store=store, max_workers=workers)
+
+        edit_slide_text(deck, 1)
+        edited, results["one_slide_edited"] = preparse_deck(deck, store=store, max_workers=workers)
+
+        # 수정한 슬라이드 1만 달라져야 한다
+        results["identical"] = (
+            serial == pooled == warm
+            and all(edited[n] == serial[n] for n in serial if n != 1)
+            and edited[1] != serial[1]
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark whole-deck pre-parse")
+    parser.add_argument("--deck", type=str, default=str(DEFAULT_DECK))
+    parser.add_argument("--slides", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    results = run_benchmark(Path(args.deck), args.slides, args.workers)
+    identical = results.pop("identical")
+    print(f"{'run':<18}{'slides':>8}{'stored':>8}{'parsed':>8}{'workers':>9}{'seconds':>10}")
+    for name, r in results.items():
+        print(f"{name:<18}{r['slides']:>8}{r['from_store']:>8}{r['parsed']:>8}{r['workers']:>9}{r['seconds']:>10.3f}")
+    print(f"results identical across runs: {identical}")
+
+
+if __name__ == "__main__":
+    main()
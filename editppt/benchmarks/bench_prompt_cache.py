@@ -0,0 +1,159 @@
+"""
+Provider prompt-cache reuse: legacy prompt layout (slide state / task context
+inside the system prompt, ahead of the fixed instructions) vs the current
+layout (tool schema + fixed instructions first, per-slide state last).
+
+Simulates OpenAI-style automatic prefix caching over one session. For every
+slide of the fixture: edit agent attempt, text validator, edit agent retry with
+feedback, text validator again.
+
+- request text = tool schema + messages, in order
+- a request reuses the longest prefix it shares with any earlier request of the
+  same stage, in blocks of BLOCK_CHARS (~128 tokens); prefixes shorter than
+  MIN_CACHED_TOKENS are not cached
+
+The vision validator is not simulated (its prefix depends on the rendered image).
+
+    python -m editppt.benchmarks.bench_prompt_cache --fixture editppt/examples/parser_json_155.json
+"""
+import argparse
+import hashlib
+import json
+
+from editppt.agent import TOOLS_SCHEMA
+from editppt.benchmarks.bench_prompt_tokens import DEFAULT_FIXTURE, load_slides, simulate_edit
+from editppt.prompts import (
+    create_edit_agent_system_prompt,
+    create_edit_agent_state_prompt,
+    create_edit_agent_user_prompt,
+    create_text_validator_agent_system_prompt,
+    create_text_validator_agent_context_prompt,
+    create_text_validator_agent_user_prompt,
+)
+from editppt.utils.llm_ledger import _estimate_tokens, estimate_cost
+from editppt.utils.parse_diff import diff_parses, summarize_changes
+from editppt.utils.slide_serializer import compact_slide_json, compact_tool_calls, diff_slides_json
+
+
+BLOCK_CHARS = 512
+MIN_CACHED_TOKENS = 1024
+SEPARATOR = "────────────────────────────────"
+
+
+class PrefixCache:
+    """본 적 있는 prefix block hash 집합 (provider 쪽 prompt cache 흉내)"""
+
+    def __init__(self, model: str):
+        self.model = model
+        self.seen = set()
+
+    def request(self, text: str) -> tuple:
+        """Returns: (input_tokens, cached_tokens)"""
+        digest = hashlib.sha1()
+        cached_chars = 0
+        prefixes = []
+        for start in range(0, len(text) - len(text) % BLOCK_CHARS, BLOCK_CHARS):
+            digest.update(text[start:start + BLOCK_CHARS].encode("utf-8"))
+            key = digest.digest()
+            prefixes.append(key)
+            if key in self.seen and cached_chars == start:
+                cached_chars = start + BLOCK_CHARS
+        self.seen.update(prefixes)
+
+        cached = _estimate_tokens(text[:cached_chars], self.model) if cached_chars else 0
+        return _estimate_tokens(text, self.model), cached if cached >= MIN_CACHED_TOKENS else 0
+
+
+def request_text(messages, tools=None) -> str:
+    parts = [json.dumps(tools, ensure_ascii=False)] if tools else []
+    for message in messages:
+        parts.append(f"<{message['role']}>{message['content']}")
+    return "\n".join(parts)
+
+
+# ---- layouts ----
+def edit_messages(layout, state, task, feedback):
+    if layout == "current":
+        return [
+            {"role": "system", "content": create_edit_agent_system_prompt()},
+            {"role": "user", "content": create_edit_agent_state_prompt(state)},
+            {"role": "user", "content": create_edit_agent_user_prompt(*task, feedback)},
+        ]
+    # 이전 형식: Role 바로 뒤에 슬라이드 상태, 그 뒤에 고정 guideline
+    head, tail = create_edit_agent_system_prompt().split("\n## Guidelines", 1)
+    head = head.replace("\nThe current slide state (JSON) is given in the first user message.", "")
+    system = f"{head}\n{create_edit_agent_state_prompt(state)}\n## Guidelines{tail}"
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": create_edit_agent_user_prompt(*task, feedback)},
+    ]
+
+
+def validator_messages(layout, task, diff_prompt):
+    context = create_text_validator_agent_context_prompt(*task)
+    if layout == "current":
+        return [
+            {"role": "system", "content": create_text_validator_agent_system_prompt()},
+            {"role": "user", "content": context + diff_prompt},
+        ]
+    # 이전 형식: 첫 구분선 뒤에 task Context, 그 뒤에 고정 규칙
+    head, tail = create_text_validator_agent_system_prompt().split(SEPARATOR, 1)
+    system = f"{head}{SEPARATOR}\n{context}\n{SEPARATOR}{tail}"
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": diff_prompt},
+    ]
+
+
+def run_session(slides, layout: str, model: str) -> dict:
+    caches = {"edit_agent": PrefixCache(model), "text_validator": PrefixCache(model)}
+    totals = {stage: {"requests": 0, "input_tokens": 0, "cached_tokens": 0} for stage in caches}
+
+    def send(stage, text):
+        input_tokens, cached = caches[stage].request(text)
+        totals[stage]["requests"] += 1
+        totals[stage]["input_tokens"] += input_tokens
+        totals[stage]["cached_tokens"] += cached
+
+    for parse in slides:
+        page = parse.get("Current_Slide_Number", 1)
+        state = compact_slide_json(parse)
+        task = (page, f"Emphasize the key terms on slide {page}", "Make the key terms bold", "bold")
+        new_parse, tool_calls = simulate_edit(parse)
+        target_ids = {tc["arguments"]["shape_id"] for tc in tool_calls}
+        diff_prompt = create_text_validator_agent_user_prompt(
+            diff_slides_json(parse, new_parse, target_ids),
+            summarize_changes(diff_parses(parse, new_parse)),
+            compact_tool_calls(tool_calls),
+        )
+
+        feedback = []
+        for attempt in (1, 2):
+            send("edit_agent", request_text(edit_messages(layout, state, task, feedback), TOOLS_SCHEMA))
+            send("text_validator", request_text(validator_messages(layout, task, diff_prompt)))
+            feedback = [f"Retry {attempt} Text Fail: key terms are not bold | Tools: [set_text_style_preserve_runs]"]
+
+    for stage in totals.values():
+        stage["cost_usd"] = estimate_cost(model, stage["input_tokens"], 0, stage["cached_tokens"])
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate provider prompt-cache reuse per prompt layout")
+    parser.add_argument("--fixture", type=str, default=str(DEFAULT_FIXTURE))
+    parser.add_argument("--model", type=str, default="gpt-4.1")
+    parser.add_argument("--limit", type=int, default=None, help="Use only the first N slides")
+    args = parser.parse_args()
+
+    slides = load_slides(args.fixture)[:args.limit]
+    print(f"slides: {len(slides)} (4 requests each)")
+    print(f"{'stage':<16}{'layout':<9}{'input':>10}{'cached':>10}{'cached %':>10}{'input $':>10}")
+    for layout in ("legacy", "current"):
+        for stage, t in run_session(slides, layout, args.model).items():
+            share = t["cached_tokens"] / max(t["input_tokens"], 1)
+            print(f"{stage:<16}{layout:<9}{t['input_tokens']:>10}{t['cached_tokens']:>10}"
+                  f"{share:>10.1%}{t['cost_usd']:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
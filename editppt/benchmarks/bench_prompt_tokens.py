@@ -0,0 +1,123 @@
+"""
+Prompt token counts: full slide repr vs compact serializer / validator diff.
+
+    python -m editppt.benchmarks.bench_prompt_tokens --fixture editppt/examples/parser_json_155.json
+"""
+import argparse
+import json
+from copy import deepcopy
+from pathlib import Path
+
+from editppt.prompts import (
+    create_edit_agent_state_prompt,
+    create_text_validator_agent_user_prompt,
+)
+from editppt.utils.slide_serializer import compact_slide_json, compact_tool_calls, diff_slides_json
+from editppt.utils.parse_diff import diff_parses, summarize_changes
+from editppt.utils.utils import count_tokens
+
+
+DEFAULT_FIXTURE = Path(__file__).resolve().parents[1] / "examples" / "parser_json_155.json"
+
+
+def load_slides(path):
+    """
+    examples/의 두 형식 지원:
+    - {"1": parse, "2": parse, ...}
+    - 연속된 {"page number": n, "contents": parse} 레코드
+    """
+    text = Path(path).read_text(encoding="utf-8")
+    decoder = json.JSONDecoder()
+    slides = []
+    i = 0
+    while i < len(text):
+        while i < len(text) and text[i].isspace():
+            i += 1
+        if i >= len(text):
+            break
+        obj, i = decoder.raw_decode(text, i)
+        if "contents" in obj:
+            slides.append(obj["contents"])
+        else:
+            slides.extend(v for v in obj.values() if isinstance(v, dict))
+    return [s for s in slides if s.get("Objects_Detail")]
+
+
+def simulate_edit(parse):
+    """첫 text shape의 텍스트를 바꾼 수정 후 parse와 그 tool call."""
+    new_parse = deepcopy(parse)
+    for shape in new_parse["Objects_Detail"]:
+        frame = shape.get("More_detail", {}).get("Text", {}).get("TextFrame")
+        if frame and frame.get("Runs"):
+            frame["Text"] = frame["Runs"][0]["Text"] = "Edited text"
+            frame["Runs"] = frame["Runs"][:1]
+            tool_call = {
+                "name": "replace_shape_text",
+                "arguments": {
+                    "slide_number": parse.get("Current_Slide_Number", 1),
+                    "shape_id": shape["Shape_Id"],
+                    "new_text": "Edited text",
+                    "slide_json": parse,
+                },
+            }
+            return new_parse, [tool_call]
+    return new_parse, []
+
+
+def run_benchmark(slides, model="gpt-4.1"):
+    totals = {
+        "edit_system_full": 0,
+        "edit_system_compact": 0,
+        "validator_full": 0,
+        "validator_diff": 0,
+    }
+    largest = {"full": 0, "compact": 0}
+
+    for parse in slides:
+        full = count_tokens(create_edit_agent_state_prompt(parse), model)
+        compact = count_tokens(create_edit_agent_state_prompt(compact_slide_json(parse)), model)
+        totals["edit_system_full"] += full
+        totals["edit_system_compact"] += compact
+        if full > largest["full"]:
+            largest = {"full": full, "compact": compact}
+
+        new_parse, tool_calls = simulate_edit(parse)
+        # 이전 형식: before/after 전체 repr + slide_json이 주입된 tool call
+        legacy_prompt = (
+            f"[Slide before edit]\n{parse}\n\n[Slide after edit]\n{new_parse}\n\n[Used Tools]\n{tool_calls}"
+        )
+        target_ids = {tc["arguments"]["shape_id"] for tc in tool_calls}
+        diff_prompt = create_text_validator_agent_user_prompt(
+            diff_slides_json(parse, new_parse, target_ids),
+            summarize_changes(diff_parses(parse, new_parse)),
+            compact_tool_calls(tool_calls),
+        )
+        totals["validator_full"] += count_tokens(legacy_prompt, model)
+        totals["validator_diff"] += count_tokens(diff_prompt, model)
+
+    return {"slides": len(slides), "totals": totals, "largest_slide": largest}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count prompt tokens for slide JSON serializations")
+    parser.add_argument("--fixture", type=str, default=str(DEFAULT_FIXTURE))
+    parser.add_argument("--model", type=str, default="gpt-4.1")
+    args = parser.parse_args()
+
+    slides = load_slides(args.fixture)
+    result = run_benchmark(slides, args.model)
+    totals = result["totals"]
+
+    print(f"slides: {result['slides']}")
+    print(f"{'prompt':<22}{'before':>10}{'after':>10}{'ratio':>8}")
+    for name, before, after in (
+        ("edit slide state", totals["edit_system_full"], totals["edit_system_compact"]),
+        ("text validator", totals["validator_full"], totals["validator_diff"]),
+    ):
+        print(f"{name:<22}{before:>10}{after:>10}{after / max(before, 1):>8.2f}")
+    largest = result["largest_slide"]
+    print(f"largest slide (edit slide state): {largest['full']} -> {largest['compact']} tokens")
+
+
+if __name__ == "__main__":
+    main()
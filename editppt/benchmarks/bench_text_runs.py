@@ -0,0 +1,70 @@
+"""
+Run extraction benchmark: per-character walk vs TextRange.Runs().
+
+    python -m editppt.benchmarks.bench_text_runs --chars 2000 --run-length 40
+"""
+import argparse
+import time
+
+from editppt.benchmarks.fake_com import AccessCounter, FakeTextRange, TextStore
+from editppt.utils.utils import extract_runs_from_com_runs, extract_runs_per_character
+
+
+def build_text_range(counter, n_chars, run_length):
+    """Text of n_chars characters whose font alternates every run_length chars."""
+    styles = [
+        {},
+        {"Bold": -1},
+        {"Color": 0x0000FF},
+        {"Size": 24.0, "Italic": -1},
+    ]
+    runs = []
+    written = 0
+    k = 0
+    while written < n_chars:
+        length = min(run_length, n_chars - written)
+        text = "".join("abcdefghij\r"[(written + i) % 11] for i in range(length))
+        runs.append((text, styles[k % len(styles)]))
+        written += length
+        k += 1
+    return FakeTextRange(TextStore.from_runs(counter, runs), whole=True)
+
+
+def run_benchmark(n_chars, run_length):
+    counter = AccessCounter()
+    tr = build_text_range(counter, n_chars, run_length)
+
+    results = {}
+    outputs = {}
+    for name, extractor in (
+        ("per_character", extract_runs_per_character),
+        ("com_runs", extract_runs_from_com_runs),
+    ):
+        counter.reset()
+        t0 = time.perf_counter()
+        outputs[name] = extractor(tr, n_chars)
+        results[name] = {
+            "com_calls": counter.total,
+            "seconds": time.perf_counter() - t0,
+            "runs": len(outputs[name]),
+        }
+
+    if outputs["per_character"] != outputs["com_runs"]:
+        raise AssertionError("Run extractors disagree on the same text range.")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark run extraction COM call counts")
+    parser.add_argument("--chars", type=int, default=2000)
+    parser.add_argument("--run-length", type=int, default=40)
+    args = parser.parse_args()
+
+    results = run_benchmark(args.chars, args.run_length)
+    print(f"{'extractor':<15}{'runs':>8}{'com_calls':>12}{'seconds':>10}")
+    for name, r in results.items():
+        print(f"{name:<15}{r['runs']:>8}{r['com_calls']:>12}{r['seconds']:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Tool execution per LLM turn: one call at a time (previous EditAgent loop) vs
+tools/batch.py run_batches (group by slide, resolve shapes once, merge
+adjust_layout / apply_visual_style calls on the same shape).
+
+Both paths run through the undo journal; final shape state and journal undo
+are checked to be identical.
+
+    python -m editppt.benchmarks.bench_tool_batch --shapes 40 --calls 8 --repeat 200
+"""
+import argparse
+import time
+
+from editppt.benchmarks.fake_com import AccessCounter, FakePresentation, FakeShape, FakeSlide
+from editppt.tools.batch import run_batches
+from editppt.tools.journal import EditJournal
+from editppt.tools.tools import FUNCTION_MAP, invalidate_shape_index, _build_shape_index
+
+
+STATE_ATTRS = ("Left", "Top", "Width", "Height", "Rotation")
+
+
+def build_presentation(counter, n_shapes, n_slides=2):
+    slides = []
+    for s in range(n_slides):
+        shapes = [
+            FakeShape(counter, 100 * s + i, f"Shape {i}", 1, 10.0 * i, 20.0, 80.0, 40.0)
+            for i in range(1, n_shapes + 1)
+        ]
+        slides.append(FakeSlide(counter, shapes))
+    return FakePresentation(counter, slides)
+
+
+def build_tool_calls(n_calls):
+    """한 응답에서 흔한 패턴: 같은 shape에 layout/style 속성을 나눠서 호출"""
+    calls = []
+    templates = [
+        ("adjust_layout", {"left": 120.0}),
+        ("adjust_layout", {"top": 60.0}),
+        ("adjust_layout", {"width": 200.0}),
+        ("apply_visual_style", {"bg_color_hex": "#FFEEDD"}),
+        ("apply_visual_style", {"line_color_hex": "#112233"}),
+        ("apply_visual_style", {"line_weight": 2.0}),
+        ("adjust_layout", {"rotation": 15.0}),
+        # 같은 응답 안에서 앞의 값을 고치는 호출 (합치면 Left는 한 번만 쓴다)
+        ("adjust_layout", {"left": 125.0}),
+    ]
+    for i in range(n_calls):
+        name, args = templates[i % len(templates)]
+        shape_id = 1 + (i // len(templates)) % 3
+        calls.append({"name": name, "arguments": {"slide_number": 1, "shape_id": shape_id, **args}})
+    return calls
+
+
+def snapshot(prs):
+    state = []
+    for slide in prs.Slides._items:
+        for shape in slide.Shapes._items:
+            state.append(tuple(object.__getattribute__(shape, a) for a in STATE_ATTRS) + (
+                shape.Fill.ForeColor.RGB, shape.Line.ForeColor.RGB, shape.Line.Weight, shape.Shadow.Visible,
+            ))
+    return state
+
+
+def run_sequential(prs, calls):
+    journal = EditJournal()
+    for call in calls:
+        FUNCTION_MAP[call["name"]](journal.wrap(prs), **call["arguments"])
+    return journal
+
+
+def run_batched(prs, calls):
+    journal = EditJournal()
+    wrapped = journal.wrap(prs)
+    failure, report = run_batches(
+        wrapped, calls, lambda name, args: FUNCTION_MAP[name](wrapped, **args))
+    if failure:
+        raise failure[1]
+    return journal, report
+
+
+def measure(fn, n_shapes, n_calls, repeat):
+    counter = AccessCounter()
+    calls = build_tool_calls(n_calls)
+    best = None
+    for _ in range(repeat):
+        prs = build_presentation(counter, n_shapes)
+        invalidate_shape_index()
+        # 실제 실행 중에는 shape index가 이미 만들어져 있다
+        _build_shape_index(prs, 1)
+        before = snapshot(prs)
+        counter.reset()
+        t0 = time.perf_counter()
+        result = fn(prs, calls)
+        seconds = time.perf_counter() - t0
+        com_calls = counter.total
+        best = seconds if best is None else min(best, seconds)
+    journal = result[0] if isinstance(result, tuple) else result
+    after = snapshot(prs)
+    journal.undo()
+    restored = snapshot(prs) == before
+    return {"seconds": best, "com_calls": com_calls, "state": after, "restored": restored}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched tool execution")
+    parser.add_argument("--shapes", type=int, default=40)
+    parser.add_argument("--calls", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    sequential = measure(run_sequential, args.shapes, args.calls, args.repeat)
+    batched = measure(run_batched, args.shapes, args.calls, args.repeat)
+
+    print(f"{'executor':<12}{'com_calls':>11}{'ms':>10}{'undo_ok':>9}")
+    for name, r in (("sequential", sequential), ("batched", batched)):
+        print(f"{name:<12}{r['com_calls']:>11}{r['seconds'] * 1000:>10.3f}{str(r['restored']):>9}")
+    print(f"final state identical: {sequential['state'] == batched['state']}")
+
+    counter = AccessCounter()
+    prs = build_presentation(counter, args.shapes)
+    invalidate_shape_index()
+    _, report = run_batched(prs, build_tool_calls(args.calls))
+    for batch in report:
+        print(f"  batch slide={batch['slide']}: {batch['calls']} calls → {batch['executed']} executed, "
+              f"{batch['shapes']} shapes, resolve {batch['resolve_ms']} ms, apply {batch['apply_ms']} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Vision verdict cache (utils/image_hash.py): how often a re-validation can be
+skipped, and whether real edits are ever mistaken for a validated render.
+
+For every text shape of sample_ppt/math_simple.pptx the slide is rendered with
+fake_com's FakeSlide.Export, the render is recorded as validated, and then the
+slide is re-rendered after one edit:
+
+- should skip: identical re-render, edit + restore (retry rolled back)
+- should call: one-character text edit, 2pt move, fill color change
+
+(FakeSlide.Export draws text in one fixed font, so font edits are not covered.)
+
+    python -m editppt.benchmarks.bench_vision_hash --width 1024
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from editppt.benchmarks.bench_vision_image import DEFAULT_DECK, build_slides
+from editppt.utils.image_hash import RenderFingerprint, VerdictCache
+from editppt.utils.slide_image import decode_image, prepare_image
+
+
+def _edit_text(shape):
+    chars = shape._text_store.chars
+    index = next((i for i, c in enumerate(chars) if c.isalnum()), 0)
+    old = chars[index]
+    chars[index] = "x" if old != "x" else "y"
+    return lambda: chars.__setitem__(index, old)
+
+
+def _move(shape, dx=2.0):
+    object.__setattr__(shape, "Left", shape.Left + dx)
+    return lambda: object.__setattr__(shape, "Left", shape.Left - dx)
+
+
+def _fill(shape, rgb=0xCCE5FF):
+    color = shape.Fill.ForeColor
+    old = color.RGB
+    object.__setattr__(color, "RGB", rgb)
+    return lambda: object.__setattr__(color, "RGB", old)
+
+
+def _nothing(shape):
+    return lambda: None
+
+
+def _restored(shape):
+    # 수정 후 journal rollback → 원래와 같은 render
+    for undo in (_edit_text(shape), _move(shape, 5.0)):
+        undo()
+    return lambda: None
+
+
+# (name, edit(shape) → undo, should_skip)
+SCENARIOS = [
+    ("identical", _nothing, True),
+    ("edit_restored", _restored, True),
+    ("text_1char", _edit_text, False),
+    ("move_2pt", _move, False),
+    ("fill_color", _fill, False),
+]
+
+
+def _render(slide, path, width):
+    slide.Export(str(path), "PNG", width, round(width * slide._size[1] / slide._size[0]))
+    return path.read_bytes()
+
+
+def run(deck: Path, width: int, threshold: int, block_tolerance: float):
+    counts = {name: [0, 0] for name, _, _ in SCENARIOS}  # [skipped, total]
+    fingerprint_ms, encode_ms = [], []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "slide.png"
+        for num, slide in build_slides(deck):
+            baseline = RenderFingerprint(decode_image(_render(slide, path, width)))
+            for shape in slide.Shapes._items:
+                if shape._text_store is None or not shape._text_store.chars:
+                    continue
+                for name, edit, _ in SCENARIOS:
+                    cache = VerdictCache(threshold=threshold, block_tolerance=block_tolerance)
+                    cache.add(num, baseline, True)
+                    undo = edit(shape)
+                    png_bytes = _render(slide, path, width)
+                    undo()
+
+                    t0 = time.perf_counter()
+                    fingerprint = RenderFingerprint(decode_image(png_bytes))
+                    hit = cache.lookup(num, fingerprint) is not None
+                    fingerprint_ms.append((time.perf_counter() - t0) * 1000)
+                    counts[name][0] += hit
+                    counts[name][1] += 1
+
+                    t0 = time.perf_counter()
+                    prepare_image(png_bytes, slide._size)
+                    encode_ms.append((time.perf_counter() - t0) * 1000)
+    return counts, fingerprint_ms, encode_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the vision verdict cache")
+    parser.add_argument("--deck", type=str, default=str(DEFAULT_DECK))
+    parser.add_argument("--width", type=int, default=1024)
+    parser.add_argument("--threshold", type=int, default=6)
+    parser.add_argument("--block_tolerance", type=float, default=8.0)
+    args = parser.parse_args()
+
+    counts, fingerprint_ms, encode_ms = run(Path(args.deck), args.width, args.threshold, args.block_tolerance)
+    print(f"{'scenario':<16}{'expected':>10}{'skipped':>10}")
+    wrong = 0
+    for name, _, should_skip in SCENARIOS:
+        skipped, total = counts[name]
+        wrong += (total - skipped) if should_skip else skipped
+        print(f"{name:<16}{'skip' if should_skip else 'call':>10}{f'{skipped}/{total}':>10}")
+    print(f"wrong decisions: {wrong}")
+    print(f"fingerprint + lookup: median {statistics.median(fingerprint_ms):.2f} ms "
+          f"(image prepare for the vision call: median {statistics.median(encode_ms):.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Vision validator image: previous pipeline (full-slide PNG at export default
+resolution, read from disk, base64) vs utils/slide_image.py (target width,
+crop to the modified shape + margin, in-memory lossy re-encode).
+
+Slides come from sample_ppt/math_simple.pptx (fake_com.load_presentation)
+and are rasterized by fake_com's FakeSlide.Export; each shape with text is
+treated as "the modified shape" once.
+
+    python -m editppt.benchmarks.bench_vision_image --width 1024 --format auto
+"""
+import argparse
+import base64
+import io
+import statistics
+import tempfile
+from pathlib import Path
+
+from PIL import Image
+
+from editppt.benchmarks.fake_com import load_presentation
+from editppt.utils.slide_image import prepare_image, estimate_image_tokens
+
+
+ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_DECK = ROOT / "sample_ppt" / "math_simple.pptx"
+
+
+def build_slides(deck: Path):
+    return list(enumerate(load_presentation(deck).Slides._items, start=1))
+
+
+def run(deck: Path, width: int, image_format: str, provider: str, margin: float):
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "slide.png"
+        for num, slide in build_slides(deck):
+            slide_size = slide._size
+            # 이전: 기본 export 해상도 PNG 전체를 base64로
+            slide.Export(str(path), "PNG")
+            legacy_png = path.read_bytes()
+            legacy_b64 = len(base64.b64encode(legacy_png))
+            legacy_tokens = estimate_image_tokens(*Image.open(io.BytesIO(legacy_png)).size, provider)
+
+            slide.Export(str(path), "PNG", width, round(width * slide_size[1] / slide_size[0]))
+            png_bytes = path.read_bytes()
+            for shape in slide.Shapes._items:
+                if shape._text_store is None or not shape._text_store.chars:
+                    continue
+                box = (shape.Left, shape.Top, shape.Width, shape.Height)
+                data, mime, info = prepare_image(png_bytes, slide_size, boxes=[box], provider=provider,
+                                                 image_format=image_format, margin=margin)
+                full, _, full_info = prepare_image(png_bytes, slide_size, provider=provider,
+                                                   image_format=image_format)
+                rows.append({
+                    "slide": num,
+                    "legacy_b64": legacy_b64,
+                    "legacy_tokens": legacy_tokens,
+                    "full_b64": len(base64.b64encode(full)),
+                    "full_tokens": full_info["tokens"],
+                    "crop_b64": len(base64.b64encode(data)),
+                    "crop_tokens": info["tokens"],
+                    "cropped": info["cropped"],
+                    "format": info["format"],
+                })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the vision validator image pipeline")
+    parser.add_argument("--deck", type=str, default=str(DEFAULT_DECK))
+    parser.add_argument("--width", type=int, default=1024)
+    parser.add_argument("--format", type=str, default="auto")
+    parser.add_argument("--provider", type=str, default="gpt", choices=["gpt", "gemini"])
+    parser.add_argument("--margin", type=float, default=36.0)
+    args = parser.parse_args()
+
+    rows = run(Path(args.deck), args.width, args.format, args.provider, args.margin)
+    print(f"{len(rows)} validations, provider={args.provider}, width={args.width}, format={args.format}")
+    print(f"{'pipeline':<28}{'median b64 bytes':>18}{'median tokens':>15}")
+    for label, b64, tokens in (
+        ("previous (PNG, full)", "legacy_b64", "legacy_tokens"),
+        ("resized + re-encoded", "full_b64", "full_tokens"),
+        ("resized + cropped", "crop_b64", "crop_tokens"),
+    ):
+        print(f"{label:<28}{statistics.median(r[b64] for r in rows):>18.0f}"
+              f"{statistics.median(r[tokens] for r in rows):>15.0f}")
+    print(f"cropped: {sum(r['cropped'] for r in rows)}/{len(rows)}, "
+          f"formats: {sorted({r['format'] for r in rows})}")
+
+
+if __name__ == "__main__":
+    main()
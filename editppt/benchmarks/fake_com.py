@@ -0,0 +1,1099 @@
+"""
+In-memory stand-in for the PowerPoint COM objects used by editppt.
+
+Every capitalized attribute read/write goes through AccessCounter, so a benchmark
+can count how many IDispatch round-trips a code path would make against a live
+PowerPoint instance, and optionally pay a simulated latency for each of them.
+
+load_presentation() builds the model from a .pptx (sample_ppt decks) through the
+file parser: slides, shapes, runs / fonts, bullets, groups, tables and notes.
+"""
+import os
+import shutil
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+
+class AccessCounter:
+    """Counts attribute accesses per 'Class.Attribute' key ('Class.Attribute=' for writes)."""
+
+    def __init__(self, latency: float = 0.0, latency_by_key=None):
+        """
+        Args:
+            latency: 호출마다 기다리는 시간 (초, cross-process round-trip 흉내)
+            latency_by_key: {'FakeSlide.Export': 0.05, ...} key별 latency (latency보다 우선)
+        """
+        self.counts = Counter()
+        self.paused = False
+        self.latency = latency
+        self.latency_by_key = dict(latency_by_key or {})
+        self.simulated_seconds = 0.0
+
+    def hit(self, key):
+        if self.paused:
+            return
+        self.counts[key] += 1
+        delay = self.latency_by_key.get(key, self.latency)
+        if delay > 0:
+            # 실제 COM 호출처럼 기다리는 동안 GIL을 놓는다
+            time.sleep(delay)
+            self.simulated_seconds += delay
+
+    @contextmanager
+    def pause(self):
+        """Reads made inside PowerPoint (e.g. by a macro) are not cross-process calls."""
+        previous, self.paused = self.paused, True
+        try:
+            yield
+        finally:
+            self.paused = previous
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    def top(self, n: int = 10):
+        return self.counts.most_common(n)
+
+    def reset(self):
+        self.counts.clear()
+        self.simulated_seconds = 0.0
+
+
+class _ComObject:
+    """Base class: every capitalized attribute access is one counted COM call."""
+
+    # win32com CDispatch처럼 보이도록 (JournaledCOM이 callable 컬렉션을 메서드로 오인하지 않게)
+    _oleobj_ = None
+
+    def __init__(self, counter):
+        object.__setattr__(self, "_counter", counter)
+
+    def __getattribute__(self, name):
+        if name[:1].isupper():
+            counter = object.__getattribute__(self, "_counter")
+            counter.hit(f"{type(self).__name__}.{name}")
+        return object.__getattribute__(self, name)
+
+    def __setattr__(self, name, value):
+        if name[:1].isupper():
+            self._counter.hit(f"{type(self).__name__}.{name}=")
+        object.__setattr__(self, name, value)
+
+
+# ---------------------------------------------------------------------------
+# Text
+# ---------------------------------------------------------------------------
+MSO_TRUE = -1
+MSO_FALSE = 0
+MSO_MIXED = -2
+
+TRISTATE_FONT_PROPS = (
+    "Bold", "Italic", "Underline", "Shadow",
+    "Strikethrough", "Subscript", "Superscript",
+)
+
+DEFAULT_FONT = {
+    "Name": "Arial",
+    "Size": 18.0,
+    "Color": 0,
+    **{prop: MSO_FALSE for prop in TRISTATE_FONT_PROPS},
+}
+
+
+class TextStore:
+    """Character buffer shared by every TextRange of one text frame."""
+
+    def __init__(self, counter, text="", font=None, frame_width=400.0):
+        self.counter = counter
+        self.chars = list(text)
+        base = dict(DEFAULT_FONT, **(font or {}))
+        self.fonts = [dict(base) for _ in self.chars]
+        self.default_font = base
+        self.frame_width = frame_width
+        self.layout_count = 0
+        # paragraph index (0-based) -> {"Visible", "Type", "Style", "Character", "RelativeSize", "IndentLevel"}
+        self.paragraph_formats = {}
+        # TextFrame 속성 (TextFrame 객체는 접근마다 새로 만들어지므로 여기에 둔다)
+        self.frame_props = {"WordWrap": MSO_TRUE, "AutoSize": 0}
+
+    @classmethod
+    def from_runs(cls, counter, runs, frame_width=400.0):
+        """runs: [(text, font_overrides), ...]"""
+        store = cls(counter, frame_width=frame_width)
+        for text, font in runs:
+            style = dict(DEFAULT_FONT, **(font or {}))
+            store.chars.extend(text)
+            store.fonts.extend(dict(style) for _ in text)
+        return store
+
+    def copy(self):
+        store = TextStore(self.counter, frame_width=self.frame_width)
+        store.chars = list(self.chars)
+        store.fonts = [dict(f) for f in self.fonts]
+        store.default_font = dict(self.default_font)
+        store.paragraph_formats = {i: dict(f) for i, f in self.paragraph_formats.items()}
+        store.frame_props = dict(self.frame_props)
+        return store
+
+    @property
+    def text(self):
+        return "".join(self.chars)
+
+    def font_at(self, index):
+        if not self.fonts:
+            return dict(self.default_font)
+        index = max(0, min(index, len(self.fonts) - 1))
+        return dict(self.fonts[index])
+
+    def layout_height(self, start, length):
+        """
+        Synthetic layout model: a character is 0.5 * size wide, a line is
+        1.2 * (largest size on the line) high, lines wrap at frame_width and
+        break at paragraph marks.
+        """
+        self.layout_count += 1
+        height = 0.0
+        line_width = 0.0
+        line_size = 0.0
+        for i in range(start, start + length):
+            size = self.fonts[i]["Size"] or 0.0
+            if self.chars[i] == "\r":
+                height += 1.2 * (line_size or size)
+                line_width, line_size = 0.0, 0.0
+                continue
+            char_width = 0.5 * size
+            if line_width + char_width > self.frame_width and line_width > 0:
+                height += 1.2 * line_size
+                line_width, line_size = 0.0, 0.0
+            line_width += char_width
+            line_size = max(line_size, size)
+        if line_size:
+            height += 1.2 * line_size
+        return height
+
+    def paragraph_spans(self):
+        """[(start, length), ...] — each paragraph includes its trailing \r."""
+        spans = []
+        start = 0
+        for i, ch in enumerate(self.chars):
+            if ch == "\r":
+                spans.append((start, i + 1 - start))
+                start = i + 1
+        if start < len(self.chars) or not spans:
+            spans.append((start, len(self.chars) - start))
+        return spans
+
+    def paragraph_index(self, pos):
+        return sum(1 for ch in self.chars[:pos] if ch == "\r")
+
+    def paragraph_format(self, index):
+        return self.paragraph_formats.setdefault(index, dict(DEFAULT_PARAGRAPH_FORMAT))
+
+    def replace(self, start, length, text, font):
+        self.chars[start:start + length] = list(text)
+        self.fonts[start:start + length] = [dict(font) for _ in text]
+
+
+DEFAULT_PARAGRAPH_FORMAT = {
+    "Visible": MSO_FALSE,
+    "Type": 0,
+    "Style": 1,
+    "Character": 8226,
+    "RelativeSize": 1.0,
+    "StartValue": 1,
+    "IndentLevel": 1,
+    # ParagraphFormat
+    "Alignment": 1,
+    "SpaceBefore": 0.0,
+    "SpaceAfter": 0.0,
+    "SpaceWithin": 1.0,
+    "LineRuleWithin": MSO_TRUE,
+}
+
+
+def _font_prop(name):
+    def getter(self):
+        values = {f[name] for f in self._fonts()}
+        if len(values) == 1:
+            return values.pop()
+        if not values:
+            return self._store.default_font[name]
+        return MSO_MIXED if name in TRISTATE_FONT_PROPS else None
+
+    def setter(self, value):
+        if name in TRISTATE_FONT_PROPS:
+            value = MSO_TRUE if value and value != MSO_MIXED else MSO_FALSE
+        for f in self._fonts():
+            f[name] = value
+
+    return property(getter, setter)
+
+
+class FakeColorFormat(_ComObject):
+    def __init__(self, font):
+        super().__init__(font._counter)
+        object.__setattr__(self, "_font", font)
+
+    @property
+    def RGB(self):
+        return _font_prop("Color").fget(self._font)
+
+    @RGB.setter
+    def RGB(self, value):
+        _font_prop("Color").fset(self._font, value)
+
+
+class FakeFont(_ComObject):
+    def __init__(self, text_range):
+        super().__init__(text_range._counter)
+        object.__setattr__(self, "_store", text_range._store)
+        object.__setattr__(self, "_range", text_range)
+
+    def _fonts(self):
+        start, length = self._range._span()
+        return self._store.fonts[start:start + length]
+
+    Name = _font_prop("Name")
+    Size = _font_prop("Size")
+    Bold = _font_prop("Bold")
+    Italic = _font_prop("Italic")
+    Underline = _font_prop("Underline")
+    Shadow = _font_prop("Shadow")
+    Strikethrough = _font_prop("Strikethrough")
+    Subscript = _font_prop("Subscript")
+    Superscript = _font_prop("Superscript")
+
+    @property
+    def Color(self):
+        return FakeColorFormat(self)
+
+
+class FakeRangeCollection(_ComObject):
+    """Result of Runs() / Paragraphs() without an index."""
+
+    def __init__(self, counter, ranges):
+        super().__init__(counter)
+        object.__setattr__(self, "_ranges", ranges)
+
+    @property
+    def Count(self):
+        return len(self._ranges)
+
+    def Item(self, index):
+        return self._ranges[index - 1]
+
+
+class FakeTextRange(_ComObject):
+    """
+    A [start, start + length) window over a TextStore (0-based internally,
+    1-based like COM externally). A range with whole=True always spans the full
+    text, mirroring TextFrame.TextRange.
+    """
+
+    def __init__(self, store, start=0, length=None, whole=False):
+        super().__init__(store.counter)
+        object.__setattr__(self, "_store", store)
+        object.__setattr__(self, "_start", start)
+        object.__setattr__(self, "_length", len(store.chars) - start if length is None else length)
+        object.__setattr__(self, "_whole", whole)
+
+    def _span(self):
+        if self._whole:
+            return 0, len(self._store.chars)
+        start = min(self._start, len(self._store.chars))
+        return start, max(0, min(self._length, len(self._store.chars) - start))
+
+    def _sub(self, start, length):
+        return FakeTextRange(self._store, start, length)
+
+    # ---- properties ----
+    @property
+    def Text(self):
+        start, length = self._span()
+        return "".join(self._store.chars[start:start + length])
+
+    @Text.setter
+    def Text(self, value):
+        start, length = self._span()
+        font = self._store.font_at(start)
+        self._store.replace(start, length, value or "", font)
+        if not self._whole:
+            object.__setattr__(self, "_length", len(value or ""))
+
+    @property
+    def Start(self):
+        return self._span()[0] + 1
+
+    @property
+    def Length(self):
+        return self._span()[1]
+
+    @property
+    def Font(self):
+        return FakeFont(self)
+
+    @property
+    def BoundHeight(self):
+        return self._store.layout_height(*self._span())
+
+    # ---- methods ----
+    def Characters(self, start=1, length=1):
+        base, total = self._span()
+        offset = max(0, start - 1)
+        return self._sub(base + offset, max(0, min(length, total - offset)))
+
+    def _run_spans(self):
+        start, length = self._span()
+        spans = []
+        for i in range(start, start + length):
+            if spans and self._store.fonts[i] == self._store.fonts[i - 1]:
+                spans[-1][1] += 1
+            else:
+                spans.append([i, 1])
+        return spans
+
+    def Runs(self, index=None, length=None):
+        ranges = [self._sub(s, n) for s, n in self._run_spans()]
+        if index is None:
+            return FakeRangeCollection(self._counter, ranges)
+        return ranges[index - 1]
+
+    def Paragraphs(self, index=None, length=None):
+        start, length_ = self._span()
+        ranges = [
+            self._sub(s, n) for s, n in self._store.paragraph_spans()
+            if s < start + length_ and s + n > start or (length_ == 0 and s == start)
+        ]
+        if index is None:
+            return FakeRangeCollection(self._counter, ranges)
+        return ranges[index - 1]
+
+    @property
+    def ParagraphFormat(self):
+        return FakeParagraphFormat(self)
+
+    @property
+    def IndentLevel(self):
+        index = self._store.paragraph_index(self._span()[0])
+        return self._store.paragraph_format(index)["IndentLevel"]
+
+    @IndentLevel.setter
+    def IndentLevel(self, value):
+        index = self._store.paragraph_index(self._span()[0])
+        self._store.paragraph_format(index)["IndentLevel"] = value
+
+    def InsertAfter(self, text=""):
+        start, length = self._span()
+        end = start + length
+        font = self._store.font_at(end - 1 if length else start)
+        self._store.replace(end, 0, text, font)
+        if not self._whole:
+            object.__setattr__(self, "_length", length)
+        return self._sub(end, len(text))
+
+
+class FakeBulletFont(_ComObject):
+    """Bullet.Font — paragraph format dict의 "Font.<name>" 항목"""
+
+    def __init__(self, counter, fmt):
+        super().__init__(counter)
+        object.__setattr__(self, "_format", fmt)
+
+    @property
+    def Name(self):
+        return self._format.get("Font.Name", DEFAULT_FONT["Name"])
+
+    @Name.setter
+    def Name(self, value):
+        self._format["Font.Name"] = value
+
+
+class FakeBulletFormat(_ComObject):
+    def __init__(self, text_range):
+        super().__init__(text_range._counter)
+        store = text_range._store
+        index = store.paragraph_index(text_range._span()[0])
+        object.__setattr__(self, "_format", store.paragraph_format(index))
+
+    @property
+    def Font(self):
+        return FakeBulletFont(self._counter, self._format)
+
+    def __getattr__(self, name):
+        fmt = object.__getattribute__(self, "_format")
+        if name in fmt:
+            return fmt[name]
+        raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        if name[:1].isupper():
+            self._counter.hit(f"{type(self).__name__}.{name}=")
+            self._format[name] = value
+        else:
+            object.__setattr__(self, name, value)
+
+
+class FakeParagraphFormat(FakeBulletFormat):
+    """Alignment / Space* 는 Bullet과 같은 paragraph format dict에 있다."""
+
+    def __init__(self, text_range):
+        super().__init__(text_range)
+        object.__setattr__(self, "_range", text_range)
+
+    @property
+    def Bullet(self):
+        return FakeBulletFormat(self._range)
+
+
+# ---------------------------------------------------------------------------
+# Shapes / slides / presentation
+# ---------------------------------------------------------------------------
+MSO_AUTO_SHAPE = 1
+MSO_GROUP = 6
+MSO_PICTURE = 13
+MSO_PLACEHOLDER = 14
+MSO_TEXT_BOX = 17
+MSO_TABLE = 19
+
+
+class FakeTextFrame(_ComObject):
+    def __init__(self, store):
+        super().__init__(store.counter)
+        object.__setattr__(self, "_store", store)
+
+    @property
+    def HasText(self):
+        return MSO_TRUE if self._store.chars else MSO_FALSE
+
+    @property
+    def TextRange(self):
+        return FakeTextRange(self._store, whole=True)
+
+    @property
+    def WordWrap(self):
+        return self._store.frame_props["WordWrap"]
+
+    @WordWrap.setter
+    def WordWrap(self, value):
+        self._store.frame_props["WordWrap"] = MSO_TRUE if value else MSO_FALSE
+
+    @property
+    def AutoSize(self):
+        return self._store.frame_props["AutoSize"]
+
+    @AutoSize.setter
+    def AutoSize(self, value):
+        self._store.frame_props["AutoSize"] = value
+
+
+class FakeRGBColor(_ComObject):
+    def __init__(self, counter, rgb=0):
+        super().__init__(counter)
+        object.__setattr__(self, "RGB", rgb)
+
+
+class FakeFillFormat(_ComObject):
+    def __init__(self, counter):
+        super().__init__(counter)
+        object.__setattr__(self, "Visible", MSO_TRUE)
+        object.__setattr__(self, "Transparency", 0.0)
+        object.__setattr__(self, "ForeColor", FakeRGBColor(counter, 0xFFFFFF))
+
+
+class FakeLineFormat(_ComObject):
+    def __init__(self, counter):
+        super().__init__(counter)
+        object.__setattr__(self, "Visible", MSO_FALSE)
+        object.__setattr__(self, "Weight", 0.75)
+        object.__setattr__(self, "DashStyle", 1)
+        object.__setattr__(self, "ForeColor", FakeRGBColor(counter))
+
+
+class FakeShadowFormat(_ComObject):
+    def __init__(self, counter):
+        super().__init__(counter)
+        object.__setattr__(self, "Visible", MSO_FALSE)
+
+
+def _copy_format(fmt):
+    """Fill / Line / Shadow 복제 (ForeColor 포함)"""
+    clone = type(fmt)(fmt._counter)
+    for key, value in vars(fmt).items():
+        if key[:1].isupper():
+            if isinstance(value, FakeRGBColor):
+                value = FakeRGBColor(fmt._counter, vars(value)["RGB"])
+            object.__setattr__(clone, key, value)
+    return clone
+
+
+class FakePlaceholderFormat(_ComObject):
+    def __init__(self, counter, placeholder_type):
+        super().__init__(counter)
+        object.__setattr__(self, "Type", placeholder_type)
+
+
+class FakeShape(_ComObject):
+    def __init__(self, counter, shape_id, name, shape_type, left, top, width, height,
+                 text_store=None, alternative_text="", group_items=None, table=None,
+                 placeholder_type=None):
+        super().__init__(counter)
+        for key, value in (
+            ("Id", shape_id), ("Name", name), ("Type", shape_type),
+            ("Left", left), ("Top", top), ("Width", width), ("Height", height),
+            ("Rotation", 0.0), ("AlternativeText", alternative_text),
+            ("Fill", FakeFillFormat(counter)), ("Line", FakeLineFormat(counter)),
+            ("Shadow", FakeShadowFormat(counter)),
+        ):
+            object.__setattr__(self, key, value)
+        object.__setattr__(self, "_text_store", text_store)
+        object.__setattr__(self, "_group_items", FakeGroupShapes(counter, group_items) if group_items else None)
+        object.__setattr__(self, "_table", table)
+        object.__setattr__(self, "_placeholder_type", placeholder_type)
+        # 이 shape을 가진 FakeShapes (Delete / Duplicate / ZOrder)
+        object.__setattr__(self, "_collection", None)
+
+    @property
+    def HasTextFrame(self):
+        return MSO_TRUE if self._text_store is not None else MSO_FALSE
+
+    @property
+    def TextFrame(self):
+        if self._text_store is None:
+            raise AttributeError("TextFrame")
+        return FakeTextFrame(self._text_store)
+
+    @property
+    def GroupItems(self):
+        if self._group_items is None:
+            raise AttributeError("GroupItems")
+        return self._group_items
+
+    @property
+    def HasTable(self):
+        return MSO_TRUE if self._table is not None else MSO_FALSE
+
+    @property
+    def Table(self):
+        if self._table is None:
+            raise AttributeError("Table")
+        return self._table
+
+    @property
+    def PlaceholderFormat(self):
+        if self._placeholder_type is None:
+            raise AttributeError("PlaceholderFormat")
+        return FakePlaceholderFormat(self._counter, self._placeholder_type)
+
+    def _clone(self, shape_id):
+        attrs = vars(self)
+        clone = FakeShape(
+            self._counter, shape_id, attrs["Name"], attrs["Type"],
+            attrs["Left"], attrs["Top"], attrs["Width"], attrs["Height"],
+            text_store=self._text_store.copy() if self._text_store is not None else None,
+            alternative_text=attrs["AlternativeText"],
+            group_items=[item._clone(vars(item)["Id"]) for item in self._group_items._items] if self._group_items else None,
+            table=self._table._clone() if self._table is not None else None,
+            placeholder_type=self._placeholder_type,
+        )
+        object.__setattr__(clone, "Rotation", attrs["Rotation"])
+        for key in ("Fill", "Line", "Shadow"):
+            object.__setattr__(clone, key, _copy_format(attrs[key]))
+        return clone
+
+    def Delete(self):
+        self._collection._items.remove(self)
+
+    def Duplicate(self):
+        """PowerPoint처럼 바로 뒤에 같은 위치로 복제 (ShapeRange 대신 shape 하나를 반환)"""
+        collection = self._collection
+        clone = self._clone(collection._next_id())
+        collection._insert(collection._items.index(self) + 1, clone)
+        return clone
+
+    def ZOrder(self, command):
+        items = self._collection._items
+        i = items.index(self)
+        items.pop(i)
+        if command == 0:  # msoBringToFront
+            items.append(self)
+        elif command == 1:  # msoSendToBack
+            items.insert(0, self)
+        elif command == 2:  # msoBringForward
+            items.insert(min(i + 1, len(items)), self)
+        else:  # msoSendBackward
+            items.insert(max(i - 1, 0), self)
+
+
+class FakeCollection(_ComObject):
+    """1-based COM collection: Count, Item(i) and collection(i)."""
+
+    def __init__(self, counter, items):
+        super().__init__(counter)
+        object.__setattr__(self, "_items", items)
+
+    @property
+    def Count(self):
+        return len(self._items)
+
+    def Item(self, index):
+        return self._items[index - 1]
+
+    def __call__(self, index):
+        self._counter.hit(f"{type(self).__name__}.Item")
+        return self._items[index - 1]
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        # for shape in slide.Shapes → _NewEnum 한 번 + 항목마다 IEnumVARIANT.Next
+        self._counter.hit(f"{type(self).__name__}._NewEnum")
+        return iter(self._items)
+
+
+class FakeShapes(FakeCollection):
+    def __init__(self, counter, items):
+        super().__init__(counter, items)
+        for shape in items:
+            object.__setattr__(shape, "_collection", self)
+
+    def _next_id(self):
+        return max((vars(s)["Id"] for s in self._items), default=1) + 1
+
+    def _insert(self, index, shape):
+        object.__setattr__(shape, "_collection", self)
+        self._items.insert(index, shape)
+        return shape
+
+    def _add(self, shape_type, name, left, top, width, height, **kwargs):
+        shape_id = self._next_id()
+        shape = FakeShape(self._counter, shape_id, f"{name} {shape_id - 1}", shape_type,
+                          left, top, width, height, **kwargs)
+        return self._insert(len(self._items), shape)
+
+    def AddShape(self, auto_shape_type, left, top, width, height):
+        return self._add(MSO_AUTO_SHAPE, "Rectangle", left, top, width, height,
+                         text_store=TextStore(self._counter, frame_width=width))
+
+    def AddTextbox(self, orientation, left, top, width, height):
+        return self._add(MSO_TEXT_BOX, "TextBox", left, top, width, height,
+                         text_store=TextStore(self._counter, frame_width=width))
+
+    def AddPicture(self, file_name, link_to_file, save_with_document, left, top, width=100.0, height=100.0):
+        return self._add(MSO_PICTURE, "Picture", left, top, width, height)
+
+    def AddTable(self, rows, columns, left, top, width, height):
+        table = FakeTable(self._counter, [[""] * columns for _ in range(rows)], left, top, width, height)
+        return self._add(MSO_TABLE, "Table", left, top, width, height, table=table)
+
+
+class FakeGroupShapes(FakeShapes):
+    pass
+
+
+class FakeCell(_ComObject):
+    def __init__(self, counter, shape):
+        super().__init__(counter)
+        object.__setattr__(self, "Shape", shape)
+
+
+class FakeTable(_ComObject):
+    """Cell(r, c).Shape는 text frame을 가진 shape (좌표는 균등 분할)"""
+
+    def __init__(self, counter, cell_texts, left=0.0, top=0.0, width=400.0, height=100.0):
+        super().__init__(counter)
+        rows = len(cell_texts)
+        columns = max((len(r) for r in cell_texts), default=0)
+        cell_w = width / columns if columns else width
+        cell_h = height / rows if rows else height
+        cells = [
+            [
+                FakeCell(counter, FakeShape(
+                    counter, 0, "", MSO_AUTO_SHAPE,
+                    left + c * cell_w, top + r * cell_h, cell_w, cell_h,
+                    text_store=TextStore(counter, (row[c] if c < len(row) else "").replace("\n", "\r"),
+                                         frame_width=cell_w),
+                ))
+                for c in range(columns)
+            ]
+            for r, row in enumerate(cell_texts)
+        ]
+        object.__setattr__(self, "_cells", cells)
+        object.__setattr__(self, "Rows", FakeCollection(counter, [None] * rows))
+        object.__setattr__(self, "Columns", FakeCollection(counter, [None] * columns))
+        for key in ("FirstRow", "LastRow", "FirstCol", "LastCol"):
+            object.__setattr__(self, key, MSO_TRUE if key == "FirstRow" else MSO_FALSE)
+
+    def Cell(self, row, column):
+        if not (1 <= row <= len(self._cells) and 1 <= column <= len(self._cells[0])):
+            raise IndexError(f"Cell({row}, {column}) out of range")
+        return self._cells[row - 1][column - 1]
+
+    def _clone(self):
+        clone = FakeTable(self._counter, [])
+        cells = [
+            [FakeCell(self._counter, cell.Shape._clone(0)) for cell in row]
+            for row in self._cells
+        ]
+        object.__setattr__(clone, "_cells", cells)
+        object.__setattr__(clone, "Rows", FakeCollection(self._counter, [None] * len(cells)))
+        object.__setattr__(clone, "Columns", FakeCollection(self._counter, [None] * len(cells[0]) if cells else []))
+        return clone
+
+
+class FakeCustomLayout(_ComObject):
+    def __init__(self, counter, name="", index=1):
+        super().__init__(counter)
+        object.__setattr__(self, "Name", name)
+        object.__setattr__(self, "Index", index)
+
+
+class FakeBackground(_ComObject):
+    def __init__(self, counter, fill_type=1):
+        super().__init__(counter)
+        fill = FakeFillFormat(counter)
+        object.__setattr__(fill, "Type", fill_type)
+        object.__setattr__(self, "Fill", fill)
+
+
+class FakeSlideShowTransition(_ComObject):
+    def __init__(self, counter, entry_effect=0, advance_time=0.0, advance_on_click=True, advance_on_time=False):
+        super().__init__(counter)
+        object.__setattr__(self, "EntryEffect", entry_effect)
+        object.__setattr__(self, "AdvanceTime", advance_time)
+        object.__setattr__(self, "AdvanceOnClick", MSO_TRUE if advance_on_click else MSO_FALSE)
+        object.__setattr__(self, "AdvanceOnTime", MSO_TRUE if advance_on_time else MSO_FALSE)
+
+
+class FakeNotesPage(_ComObject):
+    def __init__(self, counter, text, shape_count=3):
+        """본문 placeholder (ppPlaceholderBody) + 슬라이드 이미지 / 번호 placeholder"""
+        super().__init__(counter)
+        shapes = [
+            FakeShape(counter, 1, "Slide Image Placeholder 1", MSO_PLACEHOLDER, 48.0, 72.0, 432.0, 243.0,
+                      placeholder_type=1),
+            FakeShape(counter, 2, "Notes Placeholder 2", MSO_PLACEHOLDER, 48.0, 346.0, 432.0, 283.0,
+                      text_store=TextStore(counter, text), placeholder_type=2),
+        ]
+        for shape_id in range(3, shape_count + 1):
+            shapes.append(FakeShape(counter, shape_id, f"Slide Number Placeholder {shape_id}", MSO_PLACEHOLDER,
+                                    306.0, 684.0, 234.0, 36.0, text_store=TextStore(counter), placeholder_type=13))
+        object.__setattr__(self, "Shapes", FakeShapes(counter, shapes[:shape_count]))
+
+
+FILL_TYPE_CODES = {"Solid": 1, "Pattern": 2, "Gradient": 3, "Texture": 4, "Picture": 5}
+
+
+class FakeSlide(_ComObject):
+    def __init__(self, counter, shapes, width=960.0, height=540.0, properties=None, notes=None,
+                 notes_shapes=3):
+        """
+        Args:
+            properties: parse의 Slide_Properties 형식 (layout / 배경 / 전환)
+            notes: 슬라이드 노트 텍스트 (None이면 노트 페이지 없음)
+            notes_shapes: 노트 페이지의 shape 수
+        """
+        super().__init__(counter)
+        properties = properties or {}
+        object.__setattr__(self, "Shapes", FakeShapes(counter, shapes))
+        object.__setattr__(self, "_size", (width, height))
+        object.__setattr__(self, "_properties", properties)
+        object.__setattr__(self, "_notes", (notes, notes_shapes))
+        object.__setattr__(self, "_collection", None)
+        object.__setattr__(self, "Layout", properties.get("Slide Layout Code", 12))
+        object.__setattr__(self, "CustomLayout", FakeCustomLayout(
+            counter, properties.get("CustomLayout Name", ""), properties.get("CustomLayout Index", 1)))
+        object.__setattr__(self, "Background", FakeBackground(
+            counter, FILL_TYPE_CODES.get(properties.get("Background Fill Type"), 1)))
+        object.__setattr__(self, "SlideShowTransition", FakeSlideShowTransition(
+            counter,
+            properties.get("Transition Effect", 0),
+            properties.get("Advance Time (s)", 0.0),
+            properties.get("Advance On Click", True),
+            properties.get("Advance On Time", False),
+        ))
+        object.__setattr__(self, "HasNotesPage", MSO_TRUE if notes is not None else MSO_FALSE)
+        if notes is not None:
+            object.__setattr__(self, "NotesPage", FakeNotesPage(counter, notes, notes_shapes))
+
+    @property
+    def SlideIndex(self):
+        return self._collection._items.index(self) + 1
+
+    def Delete(self):
+        self._collection._items.remove(self)
+
+    def Duplicate(self):
+        shapes = [shape._clone(vars(shape)["Id"]) for shape in self.Shapes._items]
+        notes, notes_shapes = self._notes
+        clone = FakeSlide(self._counter, shapes, *self._size, properties=self._properties,
+                          notes=notes, notes_shapes=notes_shapes)
+        index = self._collection._items.index(self) + 1
+        self._collection._items.insert(index, clone)
+        object.__setattr__(clone, "_collection", self._collection)
+        return clone
+
+    def Export(self, path, filter_name="PNG", scale_width=None, scale_height=None):
+        """
+        Simple raster of the slide: filled boxes with their text. Not
+        PowerPoint's renderer, but deterministic and sensitive to the same
+        geometry / fill / text changes.
+        """
+        from PIL import Image, ImageDraw
+
+        width, height = self._size
+        px_w = int(scale_width or round(width * 96 / 72))
+        px_h = int(scale_height or round(px_w * height / width))
+        sx, sy = px_w / width, px_h / height
+        image = Image.new("RGB", (px_w, px_h), "white")
+        draw = ImageDraw.Draw(image)
+        with self._counter.pause():
+            for shape in self.Shapes._items:
+                box = (shape.Left * sx, shape.Top * sy,
+                       (shape.Left + shape.Width) * sx, (shape.Top + shape.Height) * sy)
+                bgr = shape.Fill.ForeColor.RGB
+                fill = (bgr & 0xFF, (bgr >> 8) & 0xFF, (bgr >> 16) & 0xFF) if shape.Fill.Visible else None
+                line = (40, 40, 40) if shape.Line.Visible else None
+                draw.rectangle(box, fill=fill, outline=line)
+                store = shape._text_store
+                if store is not None and store.chars:
+                    text = store.text.replace("\r", "\n")
+                    draw.multiline_text((box[0] + 4, box[1] + 4), text, fill=(0, 0, 0))
+        image.save(path, filter_name)
+
+
+class FakeSlides(FakeCollection):
+    def __init__(self, counter, items):
+        super().__init__(counter, items)
+        for slide in items:
+            object.__setattr__(slide, "_collection", self)
+
+
+class FakePageSetup(_ComObject):
+    def __init__(self, counter, width=960.0, height=540.0):
+        super().__init__(counter)
+        object.__setattr__(self, "SlideWidth", width)
+        object.__setattr__(self, "SlideHeight", height)
+
+
+class FakePresentation(_ComObject):
+    def __init__(self, counter, slides, name="fake.pptx", application=None, source_path=None):
+        """
+        Args:
+            source_path: load_presentation()이 읽은 .pptx. SaveAs / SaveCopyAs는 이 파일을
+                복사한다 (수정 내용은 파일로 직렬화하지 않음 — 호출 횟수 / latency 측정용)
+        """
+        super().__init__(counter)
+        width, height = slides[0]._size if slides else (960.0, 540.0)
+        object.__setattr__(self, "Name", name)
+        object.__setattr__(self, "Slides", FakeSlides(counter, slides))
+        object.__setattr__(self, "PageSetup", FakePageSetup(counter, width, height))
+        object.__setattr__(self, "Application", application or FakeApplication(counter))
+        object.__setattr__(self, "_source_path", source_path)
+        object.__setattr__(self, "saved_paths", [])
+
+    def _save(self, path):
+        self.saved_paths.append(path)
+        if self._source_path is not None:
+            shutil.copyfile(self._source_path, path)
+
+    def SaveAs(self, path, *args):
+        self._save(path)
+        object.__setattr__(self, "Name", os.path.basename(path))
+
+    def SaveCopyAs(self, path, *args):
+        self._save(path)
+
+
+class _FakeCodeModule(_ComObject):
+    def AddFromString(self, source):
+        object.__setattr__(self, "source", source)
+
+
+class _FakeVBComponent(_ComObject):
+    def __init__(self, counter):
+        super().__init__(counter)
+        object.__setattr__(self, "Name", "Module1")
+        object.__setattr__(self, "CodeModule", _FakeCodeModule(counter))
+
+
+class _FakeVBComponents(_ComObject):
+    def Add(self, component_type):
+        return _FakeVBComponent(self._counter)
+
+
+class _FakeVBProject(_ComObject):
+    def __init__(self, counter):
+        super().__init__(counter)
+        object.__setattr__(self, "VBComponents", _FakeVBComponents(counter))
+
+
+class _FakeHelperPresentation(_ComObject):
+    def __init__(self, counter, name):
+        super().__init__(counter)
+        object.__setattr__(self, "Name", name)
+        object.__setattr__(self, "VBProject", _FakeVBProject(counter))
+
+    def Close(self):
+        pass
+
+
+class _FakePresentations(_ComObject):
+    def Add(self, with_window=-1):
+        return _FakeHelperPresentation(self._counter, "Presentation1")
+
+
+class FakeApplication(_ComObject):
+    """Application.Run executes the Python twin of the bulk-export macro in-process."""
+
+    def __init__(self, counter, vba_enabled=True):
+        super().__init__(counter)
+        object.__setattr__(self, "Presentations", _FakePresentations(counter))
+        object.__setattr__(self, "_vba_enabled", vba_enabled)
+
+    def Run(self, macro, *args):
+        from editppt.utils.bulk_export import MACRO_NAME, export_slide_payload
+
+        if not self._vba_enabled:
+            raise RuntimeError("Programmatic access to Visual Basic Project is not trusted")
+        if not macro.endswith(MACRO_NAME):
+            raise ValueError(f"Unknown macro: {macro}")
+        with self._counter.pause():
+            return export_slide_payload(*args)
+
+
+# ---------------------------------------------------------------------------
+# Loading from a .pptx
+# ---------------------------------------------------------------------------
+# 텍스트가 없어도 text frame을 가진 shape 종류
+TEXT_FRAME_TYPES = (MSO_AUTO_SHAPE, MSO_PLACEHOLDER, MSO_TEXT_BOX)
+
+
+def _font_overrides(font: dict) -> dict:
+    out = {}
+    for key in ("Name", "Size"):
+        if font.get(key) is not None:
+            out[key] = font[key]
+    for key in TRISTATE_FONT_PROPS:
+        if key in font:
+            out[key] = MSO_TRUE if font[key] else MSO_FALSE
+    color = font.get("Color")
+    if color:
+        out["Color"] = color["R"] | (color["G"] << 8) | (color["B"] << 16)
+    return out
+
+
+def _text_store(counter, frame: dict, frame_width: float) -> TextStore:
+    """parse의 TextFrame (Runs / Paragraphs) → TextStore"""
+    from editppt.utils.msoffice_map import BULLET_STYLE_MAP
+
+    runs = frame.get("Runs") or []
+    if runs:
+        store = TextStore.from_runs(
+            counter, [(run["Text"], _font_overrides(run.get("Font") or {})) for run in runs], frame_width)
+    else:
+        store = TextStore(counter, frame.get("Text") or "", frame_width=frame_width)
+
+    style_codes = {name: code for code, (name, _) in BULLET_STYLE_MAP.items()}
+    for para in frame.get("Paragraphs") or []:
+        fmt = store.paragraph_format(para["ParagraphIndex"])
+        fmt["IndentLevel"] = para.get("IndentLevel", 1)
+        if para.get("HasBullet"):
+            fmt["Visible"] = MSO_TRUE
+            fmt["Type"] = para.get("BulletType", 1)
+            fmt["RelativeSize"] = para.get("BulletRelativeSize", 1.0)
+            if fmt["Type"] == 2:
+                fmt["Style"] = style_codes.get(para.get("BulletCharacter"), 4)
+            elif para.get("ActualLabel"):
+                fmt["Character"] = ord(para["ActualLabel"][0])
+    return store
+
+
+def _shape_from_parse(counter, obj: dict, table_cells: dict) -> FakeShape:
+    """
+    Objects_Detail 항목 (또는 Group Items 항목) → FakeShape.
+    Group 항목은 More_detail 없이 Text / GroupItems / Picture / Table을 바로 가진다.
+    """
+    from editppt.utils.msoffice_map import SHAPE_TYPE_MAP
+
+    type_codes = {name: code for code, name in SHAPE_TYPE_MAP.items()}
+    stype = obj["Type"] if isinstance(obj["Type"], int) else type_codes.get(obj["Type"], MSO_AUTO_SHAPE)
+    detail = obj.get("More_detail", obj) or {}
+    width = obj["Size_Width"]
+
+    frame = ((detail.get("Text") or {}).get("TextFrame")) or None
+    text_store = None
+    if frame is not None:
+        text_store = _text_store(counter, frame, width)
+    elif stype in TEXT_FRAME_TYPES:
+        text_store = TextStore(counter, frame_width=width)
+
+    items = (detail.get("Group") or {}).get("Items") or detail.get("GroupItems")
+    group_items = [_shape_from_parse(counter, item, table_cells) for item in items] if items else None
+
+    table = None
+    if stype == MSO_TABLE:
+        dims = detail.get("Table") or {}
+        cells = table_cells.get(obj["Shape_Id"]) or [[""] * dims.get("Columns", 0) for _ in range(dims.get("Rows", 0))]
+        table = FakeTable(counter, cells, obj["Position_Left"], obj["Position_Top"], width, obj["Size_Height"])
+
+    return FakeShape(
+        counter, obj["Shape_Id"], obj["Name"], stype,
+        obj["Position_Left"], obj["Position_Top"], width, obj["Size_Height"],
+        text_store=text_store,
+        alternative_text=(detail.get("Picture") or {}).get("AlternativeText", ""),
+        group_items=group_items,
+        table=table,
+    )
+
+
+def _table_cells(path: str) -> dict:
+    """{slide_num: {shape_id: [[cell text, ...], ...]}} (parse에는 표 크기만 있다)"""
+    import xml.etree.ElementTree as ET
+    from editppt.utils.ooxml_parser import A, P, OoxmlPresentation
+
+    out = {}
+    with OoxmlPresentation(path) as prs:
+        for num, name in enumerate(prs.slide_parts, start=1):
+            root = ET.fromstring(prs.zip.read(name))
+            for frame in root.iter(P + "graphicFrame"):
+                tbl = frame.find(f"{A}graphic/{A}graphicData/{A}tbl")
+                c_nv_pr = frame.find(f"{P}nvGraphicFramePr/{P}cNvPr")
+                if tbl is None or c_nv_pr is None:
+                    continue
+                out.setdefault(num, {})[int(c_nv_pr.get("id"))] = [
+                    [
+                        "\r".join("".join(t.text or "" for t in p.iter(A + "t")) for p in tc.iter(A + "p"))
+                        for tc in tr.findall(A + "tc")
+                    ]
+                    for tr in tbl.findall(A + "tr")
+                ]
+    return out
+
+
+def load_presentation(path, counter: AccessCounter = None, application=None) -> FakePresentation:
+    """
+    .pptx → FakePresentation (file parser의 geometry / text / run font / bullet / group / table / notes).
+
+    Args:
+        counter: 호출 수 / latency 설정 (None이면 latency 없는 새 AccessCounter)
+    """
+    from editppt.utils.ooxml_parser import parse_pptx
+
+    path = str(path)
+    counter = counter or AccessCounter()
+    cells = _table_cells(path)
+    slides = []
+    for num, parse in parse_pptx(path).items():
+        shapes = [_shape_from_parse(counter, obj, cells.get(num, {})) for obj in parse.get("Objects_Detail", [])]
+        notes = parse.get("Slide_Notes") or {}
+        slides.append(FakeSlide(
+            counter, shapes, parse["Slide Width"], parse["Slide Height"],
+            properties=parse.get("Slide_Properties"),
+            notes=(notes.get("Notes Content") or "") if notes.get("Has Notes Page") else None,
+            notes_shapes=notes.get("Notes Shapes Count", 3),
+        ))
+    return FakePresentation(counter, slides, name=os.path.basename(path),
+                            application=application, source_path=path)
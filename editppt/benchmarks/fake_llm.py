@@ -0,0 +1,146 @@
+"""
+Scripted LLM for offline benchmarks.
+
+A local HTTP server that speaks the OpenAI Responses API and answers from a
+script, so call_llm runs its real code path (pooled client, SDK response
+parsing) without network access or an API key.
+
+    with ScriptedLLM([tool_call_response([...]), text_response("True | ok")]) as llm:
+        agent.run(...)
+    llm.requests  # request payloads, in order
+
+A script entry is a response dict or a callable(payload) -> response dict.
+"""
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from editppt.utils import llm_client, llm_cache
+
+
+_IDS = itertools.count(1)
+
+
+def _response(output: list, model: str = "gpt-4.1") -> dict:
+    return {
+        "id": f"resp_{next(_IDS)}",
+        "object": "response",
+        "created_at": 0,
+        "model": model,
+        "status": "completed",
+        "output": output,
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": [],
+        "usage": {
+            "input_tokens": 0, "output_tokens": 0, "total_tokens": 0,
+            "input_tokens_details": {"cached_tokens": 0},
+            "output_tokens_details": {"reasoning_tokens": 0},
+        },
+    }
+
+
+def text_response(text: str) -> dict:
+    return _response([{
+        "id": f"msg_{next(_IDS)}",
+        "type": "message",
+        "role": "assistant",
+        "status": "completed",
+        "content": [{"type": "output_text", "text": text, "annotations": []}],
+    }])
+
+
+def tool_call_response(calls: list) -> dict:
+    """calls: [(name, arguments dict), ...]"""
+    return _response([
+        {
+            "id": f"fc_{next(_IDS)}",
+            "type": "function_call",
+            "call_id": f"call_{next(_IDS)}",
+            "name": name,
+            "arguments": json.dumps(arguments, ensure_ascii=False),
+            "status": "completed",
+        }
+        for name, arguments in calls
+    ])
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        status, body = self.server.owner._answer(payload)
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ScriptedLLM:
+    def __init__(self, script=(), latency: float = 0.0):
+        """
+        Args:
+            script: 호출 순서대로 응답할 response dict / callable(payload)
+            latency: 응답마다 기다리는 시간 (초, 모델 생성 시간 흉내)
+        """
+        self.script = list(script)
+        self.latency = latency
+        self.requests = []
+        self._lock = threading.Lock()
+        self._server = None
+        self._saved = None
+
+    def extend(self, entries):
+        with self._lock:
+            self.script.extend(entries)
+
+    @property
+    def remaining(self) -> int:
+        return len(self.script)
+
+    def _answer(self, payload: dict):
+        with self._lock:
+            self.requests.append(payload)
+            entry = self.script.pop(0) if self.script else None
+        if entry is None:
+            # 4xx → SDK가 재시도하지 않고 바로 예외
+            return 400, {"error": {"message": "ScriptedLLM: script exhausted", "type": "invalid_request_error"}}
+        if self.latency:
+            time.sleep(self.latency)
+        return 200, entry(payload) if callable(entry) else entry
+
+    # ---- llm_client 연결 ----
+    def __enter__(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self._server.owner = self
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+        host, port = self._server.server_address
+        self._saved = (llm_client.OPENAI_API_KEY, llm_client.PROVIDER_BASE_URLS.get("openai"),
+                       llm_cache.get_response_cache())
+        llm_client.OPENAI_API_KEY = "stub-key"
+        llm_client.PROVIDER_BASE_URLS["openai"] = f"http://{host}:{port}/v1"
+        # 응답 캐시가 켜져 있으면 script를 건너뛰므로 끈다
+        llm_cache.disable_response_cache()
+        llm_client.close_clients()
+        return self
+
+    def __exit__(self, *exc):
+        api_key, base_url, cache = self._saved
+        llm_client.OPENAI_API_KEY = api_key
+        llm_client.PROVIDER_BASE_URLS["openai"] = base_url
+        llm_cache._RESPONSE_CACHE = cache
+        llm_client.close_clients()
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,398 @@
+"""
+Benchmark suite for the hot paths, offline: fake_com decks (load_presentation)
+and a scripted LLM served over HTTP (fake_llm.ScriptedLLM).
+
+Cases:
+- parse/<deck>/slide_<n>   parse_active_slide_objects per slide
+- parse_chars/<n>          one text box of n characters (a run every 40, a paragraph every 200)
+- set_text_style           set_text_style_preserve_runs on the longest text shape
+- replace_shape_text       replace_shape_text on the longest one-paragraph shape (1 LLM call)
+- edit_agent/retries_<n>   EditAgent.run; text validation fails until attempt n
+- planner/retries_<n>      Planner.__call__ after n unparsable responses
+                           (Planner waits 1 s before each retry; that is part of its overhead)
+
+Each case reports median / min wall time over --repeat runs, and the COM calls
+(fake_com AccessCounter) and LLM calls of one run. Results are written as JSON;
+with --baseline the run is compared against an earlier result file and the
+exit status is 1 on a regression (slower than --threshold, or more COM / LLM calls).
+
+    python -m editppt.benchmarks.suite --out bench.json
+    python -m editppt.benchmarks.suite --baseline bench.json --out bench_new.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+from loguru import logger
+
+from editppt.benchmarks.fake_com import (
+    AccessCounter, FakePresentation, FakeShape, FakeSlide, TextStore, MSO_TEXT_BOX, load_presentation,
+)
+from editppt.benchmarks.fake_llm import ScriptedLLM, text_response, tool_call_response
+from editppt.utils.utils import parse_active_slide_objects
+from editppt.tools import tools
+
+
+ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_DECK = ROOT / "sample_ppt" / "math_simple.pptx"
+MODEL = "gpt-4.1"
+
+TIME_METRICS = ("seconds",)
+COUNT_METRICS = ("com_calls", "llm_calls")
+
+
+# ---------------------------------------------------------------------------
+# measurement
+# ---------------------------------------------------------------------------
+def measure(repeat: int, setup, run, llm: ScriptedLLM = None) -> dict:
+    """
+    setup() → state (SimpleNamespace with .counter, 시간 측정 안 함), run(state) 측정.
+    COM / LLM 호출 수는 첫 번째 실행 기준 (결정적).
+    """
+    seconds = []
+    calls = None
+    for _ in range(repeat):
+        state = setup()
+        state.counter.reset()
+        llm_before = len(llm.requests) if llm else 0
+        # tool / agent의 print 출력은 버린다
+        with contextlib.redirect_stdout(io.StringIO()):
+            t0 = time.perf_counter()
+            run(state)
+            seconds.append(time.perf_counter() - t0)
+        if llm is not None and llm.remaining:
+            raise RuntimeError(f"Scripted LLM responses left unused: {llm.remaining}")
+        if calls is None:
+            calls = {
+                "com_calls": state.counter.total,
+                "llm_calls": len(llm.requests) - llm_before if llm else 0,
+            }
+    return {
+        "seconds": statistics.median(seconds),
+        "seconds_min": min(seconds),
+        "repeat": repeat,
+        **calls,
+    }
+
+
+def _counter(args) -> AccessCounter:
+    return AccessCounter(latency=args.com_latency)
+
+
+@contextlib.contextmanager
+def _in_directory(path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def _text_objects(parse: dict):
+    """[(obj, TextFrame dict), ...] (top-level text shapes)"""
+    out = []
+    for obj in parse.get("Objects_Detail", []):
+        frame = ((obj.get("More_detail") or {}).get("Text") or {}).get("TextFrame") or {}
+        if frame.get("Text"):
+            out.append((obj, frame))
+    return out
+
+
+def _pick_text_shape(prs, single_paragraph: bool = False):
+    """덱에서 가장 긴 text shape → (slide_number, shape_id, parse)"""
+    best = None
+    for num in range(1, prs.Slides.Count + 1):
+        parse = parse_active_slide_objects(num, prs)
+        for obj, frame in _text_objects(parse):
+            if single_paragraph and len(frame.get("Paragraphs") or []) != 1:
+                continue
+            if best is None or len(frame["Text"]) > best[0]:
+                best = (len(frame["Text"]), num, obj["Shape_Id"], parse)
+    if best is None:
+        raise ValueError("No text shape in deck")
+    return best[1:]
+
+
+# ---------------------------------------------------------------------------
+# cases: name → metrics
+# ---------------------------------------------------------------------------
+def bench_parse_slides(args) -> dict:
+    counter = _counter(args)
+    prs = load_presentation(args.deck, counter)
+    state = SimpleNamespace(counter=counter, prs=prs)
+    deck = Path(args.deck).stem
+    results = {}
+    for num in range(1, prs.Slides.Count + 1):
+        results[f"parse/{deck}/slide_{num:02d}"] = measure(
+            args.repeat, lambda: state, lambda s, num=num: parse_active_slide_objects(num, s.prs))
+    return results
+
+
+SAMPLE_TEXT = "Vector and matrix notation keeps the derivation short and readable. "
+
+
+def _long_text_presentation(counter, n_chars: int):
+    runs = []
+    text = (SAMPLE_TEXT * (n_chars // len(SAMPLE_TEXT) + 1))[:n_chars]
+    for i in range(0, n_chars, 40):
+        chunk = list(text[i:i + 40])
+        if i and i % 200 == 0:
+            chunk[0] = "\r"
+        runs.append(("".join(chunk), {"Bold": (i // 40) % 2 and -1 or 0, "Size": 14.0 + (i // 40) % 3}))
+    store = TextStore.from_runs(counter, runs, frame_width=800.0)
+    shape = FakeShape(counter, 2, "TextBox 1", MSO_TEXT_BOX, 40.0, 40.0, 800.0, 400.0, text_store=store)
+    return FakePresentation(counter, [FakeSlide(counter, [shape])])
+
+
+def bench_parse_chars(args) -> dict:
+    results = {}
+    for n in args.chars:
+        counter = _counter(args)
+        state = SimpleNamespace(counter=counter, prs=_long_text_presentation(counter, n))
+        results[f"parse_chars/{n}"] = measure(
+            args.repeat, lambda: state, lambda s: parse_active_slide_objects(1, s.prs))
+    return results
+
+
+def bench_text_tools(args, llm: ScriptedLLM) -> dict:
+    def setup_on(single_paragraph):
+        def setup():
+            counter = _counter(args)
+            prs = load_presentation(args.deck, counter)
+            tools.invalidate_shape_index()
+            num, shape_id, parse = _pick_text_shape(prs, single_paragraph)
+            text = next(f["Text"] for o, f in _text_objects(parse) if o["Shape_Id"] == shape_id)
+            return SimpleNamespace(counter=counter, prs=prs, num=num, shape_id=shape_id, parse=parse, text=text)
+        return setup
+
+    def run_style(s):
+        start = len(s.text) // 4
+        tools.set_text_style_preserve_runs(
+            s.prs, s.num, s.shape_id, start, s.text[start:start + len(s.text) // 2], s.parse, bold=True)
+
+    def setup_replace():
+        state = setup_on(True)()
+        frame = next(f for o, f in _text_objects(state.parse) if o["Shape_Id"] == state.shape_id)
+        state.new_text = " ".join(reversed(state.text.split()))
+        runs = [{"Text": state.new_text, "Font": frame["Runs"][0]["Font"]}]
+        llm.extend([text_response(json.dumps(runs, ensure_ascii=False))])
+        return state
+
+    def run_replace(s):
+        tools.replace_shape_text(s.prs, s.num, s.shape_id, s.new_text, s.parse,
+                                 ("Rewrite the text", "replace_text", s.new_text))
+
+    return {
+        "set_text_style": measure(args.repeat, setup_on(False), run_style),
+        "replace_shape_text": measure(args.repeat, setup_replace, run_replace, llm),
+    }
+
+
+class AcceptingVisionValidator:
+    """Vision 검증은 bench_vision_* 에서 따로 측정 — 여기서는 항상 통과 (None이면 성공 처리를 안 함)"""
+
+    def process(self, **kwargs):
+        return True, None
+
+
+def bench_edit_agent(args, llm: ScriptedLLM) -> dict:
+    from editppt.agent import EditAgent
+    from editppt.parser import Parser
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for retries in args.retries:
+            def setup(retries=retries):
+                counter = _counter(args)
+                prs = load_presentation(args.deck, counter)
+                tools.invalidate_shape_index()
+                num, shape_id, parse = _pick_text_shape(prs)
+                text = next(f["Text"] for o, f in _text_objects(parse) if o["Shape_Id"] == shape_id)
+                container = SimpleNamespace(prs=prs)
+                # 백업 파일(<deck>_.pptx)은 현재 디렉터리 기준으로 만들어진다
+                with _in_directory(tmp):
+                    agent = EditAgent(container, MODEL)
+                parser = Parser(container, prs.Slides.Count)
+                call = ("set_text_style_preserve_runs", {
+                    "slide_number": num, "shape_id": shape_id, "char_start_index": 0,
+                    "target_text": text[:20], "bold": True,
+                })
+                for attempt in range(1, retries + 1):
+                    verdict = "True | Text is bold." if attempt == retries else "False | Make the lead-in bold."
+                    llm.extend([tool_call_response([call]), text_response(verdict)])
+                task = {"page number": num, "description": "Emphasize the lead-in",
+                        "action": "bold", "contents": text[:20]}
+                return SimpleNamespace(counter=counter, agent=agent, parser=parser, task=task)
+
+            results[f"edit_agent/retries_{retries}"] = measure(
+                args.repeat, setup, lambda s: s.agent.run(s.task, s.parser, AcceptingVisionValidator()), llm)
+    return results
+
+
+def bench_planner(args, llm: ScriptedLLM) -> dict:
+    from editppt.planner import Planner
+
+    plan = json.dumps({"tasks": [{"page number": 1, "description": "Emphasize the title", "action": "bold"}]})
+    results = {}
+    for retries in args.planner_retries:
+        def setup(retries=retries):
+            llm.extend([text_response("I could not build a plan for that.")] * retries + [text_response(plan)])
+            return SimpleNamespace(counter=AccessCounter(), planner=Planner(MODEL, "deck.pptx", 10))
+
+        results[f"planner/retries_{retries}"] = measure(
+            args.repeat, setup, lambda s: s.planner("Make every title bold"), llm)
+    return results
+
+
+# ---------------------------------------------------------------------------
+# baseline comparison
+# ---------------------------------------------------------------------------
+def compare(baseline: dict, current: dict, threshold: float, min_seconds: float):
+    """
+    Returns:
+        (rows, regressions) — rows: (case, metric, old, new, flag)
+    """
+    rows, regressions = [], []
+    for name, cur in current.items():
+        base = baseline.get(name)
+        if base is None:
+            rows.append((name, "-", None, None, "new"))
+            continue
+        for metric in TIME_METRICS + COUNT_METRICS:
+            if metric not in cur or metric not in base:
+                continue
+            old, new = base[metric], cur[metric]
+            if metric in TIME_METRICS:
+                regressed = new > old * (1 + threshold) and new - old > min_seconds
+                improved = new < old * (1 - threshold) and old - new > min_seconds
+            else:
+                regressed, improved = new > old, new < old
+            flag = "REGRESSION" if regressed else "improved" if improved else ""
+            rows.append((name, metric, old, new, flag))
+            if regressed:
+                regressions.append((name, metric, old, new))
+    for name in baseline:
+        if name not in current:
+            rows.append((name, "-", None, None, "missing"))
+    return rows, regressions
+
+
+def _fmt(metric, value):
+    if value is None:
+        return "-"
+    return f"{value * 1000:.3f} ms" if metric in TIME_METRICS else str(value)
+
+
+def print_results(results: dict):
+    print(f"{'case':<32}{'median ms':>12}{'min ms':>10}{'com_calls':>11}{'llm_calls':>11}")
+    for name, r in results.items():
+        print(f"{name:<32}{r['seconds'] * 1000:>12.3f}{r['seconds_min'] * 1000:>10.3f}"
+              f"{r['com_calls']:>11}{r['llm_calls']:>11}")
+
+
+def print_comparison(rows):
+    print(f"{'case':<32}{'metric':<11}{'baseline':>14}{'current':>14}{'change':>9}  flag")
+    for name, metric, old, new, flag in rows:
+        change = f"{(new - old) / old:+.0%}" if old and new is not None else "-"
+        print(f"{name:<32}{metric:<11}{_fmt(metric, old):>14}{_fmt(metric, new):>14}{change:>9}  {flag}")
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+GROUPS = ("parse", "parse_chars", "text_tools", "edit_agent", "planner")
+
+
+def run_suite(args) -> dict:
+    results = {}
+    selected = set(args.only or GROUPS)
+    if "parse" in selected:
+        results.update(bench_parse_slides(args))
+    if "parse_chars" in selected:
+        results.update(bench_parse_chars(args))
+    with ScriptedLLM(latency=args.llm_latency) as llm:
+        if "text_tools" in selected:
+            results.update(bench_text_tools(args, llm))
+        if "edit_agent" in selected:
+            results.update(bench_edit_agent(args, llm))
+        if "planner" in selected:
+            results.update(bench_planner(args, llm))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark suite (fake COM + scripted LLM)")
+    parser.add_argument("--deck", type=str, default=str(DEFAULT_DECK))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", type=str, nargs="+", choices=GROUPS)
+    parser.add_argument("--chars", type=int, nargs="+", default=[200, 2000, 10000])
+    parser.add_argument("--retries", type=int, nargs="+", default=[1, 3],
+                        help="EditAgent.run attempts until text validation passes (max 5)")
+    parser.add_argument("--planner_retries", type=int, nargs="+", default=[0, 1],
+                        help="Unparsable planner responses before a valid one (max 2)")
+    parser.add_argument("--com_latency", type=float, default=0.0, help="Simulated seconds per COM call")
+    parser.add_argument("--llm_latency", type=float, default=0.0, help="Simulated seconds per LLM response")
+    parser.add_argument("--out", type=str, help="Write results JSON here")
+    parser.add_argument("--baseline", type=str, help="Compare against this results JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative slowdown")
+    parser.add_argument("--min_seconds", type=float, default=0.0005,
+                        help="Ignore time differences smaller than this (seconds)")
+    args = parser.parse_args()
+
+    if any(r < 1 or r > 5 for r in args.retries):
+        parser.error("--retries must be between 1 and 5")
+    if any(r < 0 or r > 2 for r in args.planner_retries):
+        parser.error("--planner_retries must be between 0 and 2")
+
+    # agent / parser 로그는 결과 표를 가리지 않도록 끈다
+    logger.disable("editppt")
+    results = run_suite(args)
+    print_results(results)
+
+    if args.out:
+        document = {
+            "meta": {
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "commit": _git_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "args": {k: v for k, v in vars(args).items() if k not in ("out", "baseline")},
+            },
+            "results": results,
+        }
+        Path(args.out).write_text(json.dumps(document, indent=2), encoding="utf-8")
+        print(f"\nResults written to {args.out}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        base_results = baseline.get("results", {})
+        if args.only:
+            # 실행하지 않은 그룹은 missing으로 표시하지 않는다
+            base_results = {k: v for k, v in base_results.items() if k in results}
+        rows, regressions = compare(base_results, results, args.threshold, args.min_seconds)
+        print(f"\nBaseline: {args.baseline} (commit {baseline.get('meta', {}).get('commit')})")
+        print_comparison(rows)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s)")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
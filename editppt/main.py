@@ -15,6 +15,8 @@ from editppt.utils.utils import *
 from editppt.agent import *
 from editppt.parser import Parser
 from editppt.planner import Planner
+from editppt.scheduler import run_plan
+from editppt.utils.llm_ledger import get_ledger
 
 
 logger = init_logger()
@@ -64,6 +66,51 @@ def parse_args():
         required=True,
         help="Path to the PPTX file (absolute or relative)"
     )
+    parser.add_argument(
+        "--bulk_export",
+        action="store_true",
+        help="Parse slides with one VBA macro call (needs Trust access to the VBA project object model)"
+    )
+    parser.add_argument(
+        "--preparse",
+        action="store_true",
+        help="Pre-parse every slide from the .pptx file in worker processes (cached in logfiles/parse_store)"
+    )
+    parser.add_argument(
+        "--preparse_workers",
+        type=int,
+        default=None,
+        help="Worker processes for --preparse (default: CPU count)"
+    )
+    parser.add_argument(
+        "--vision_width",
+        type=int,
+        default=1024,
+        help="Pixel width of the slide image sent to the vision validator"
+    )
+    parser.add_argument(
+        "--vision_format",
+        type=str,
+        default="auto",
+        choices=["auto", "webp", "jpeg", "png"],
+        help="Vision image encoding (auto: smallest lossy format the provider accepts)"
+    )
+    parser.add_argument(
+        "--no_vision_crop",
+        action="store_true",
+        help="Send the whole slide instead of cropping to the modified shapes"
+    )
+    parser.add_argument(
+        "--no_vision_cache",
+        action="store_true",
+        help="Always call the vision model, even for a render that already passed on that slide"
+    )
+    parser.add_argument(
+        "--max_concurrency",
+        type=int,
+        default=1,
+        help="Number of slides edited concurrently (LLM waits overlap, COM stays on one thread)"
+    )
     return parser.parse_args()
 
 def main():
@@ -98,17 +145,15 @@ def main():
     parser = Parser(
         container=container,
         total_slides=len(container.prs.Slides),
+        bulk_export=args.bulk_export,
+        preparse=args.preparse,
+        preparse_workers=args.preparse_workers,
     )
     logger.info("Parser initialized")
 
     log_root = Path("logfiles") / TIMESTAMP
     log_root.mkdir(parents=True, exist_ok=True)
 
-    (log_root / "parser_Database.json").write_text(
-        json.dumps(parser.database, ensure_ascii=False, indent=4),
-        encoding="utf-8",
-    )
-
     edit_agent = EditAgent(
         container=container,
         model=CURRENT_MODEL_NAME,
@@ -118,37 +163,60 @@ def main():
         activate_valid=True,
         container=container,
         model=CURRENT_MODEL_NAME,
+        image_width=args.vision_width,
+        image_format=args.vision_format,
+        crop=not args.no_vision_crop,
+        verdict_cache=not args.no_vision_cache,
     )
     logger.info("Agents initialized")
 
     print(f"\n[System] Agent is ready using model: {edit_agent.model}")
 
     # Agent loop
-    while True:
-        user_input = input("\n[User]: ").strip()
-        if not user_input:
-            continue
-
-        if user_input == "eee":
-            kill_powerpoint_processes()
-            time.sleep(1)
-            sys.exit(0)
-
-        plan_json = planner(user_input)
-        logger.info(f"Planner output received")
-
-        (log_root / "planner.json").write_text(
-            json.dumps(plan_json, ensure_ascii=False, indent=4),
-            encoding="utf-8",
-        )
+    try:
+        while True:
+            user_input = input("\n[User]: ").strip()
+            if not user_input:
+                continue
+
+            if user_input == "eee":
+                break
+
+            plan_json = planner(user_input)
+            logger.info(f"Planner output received")
 
-        for task in plan_json.get("tasks", []):
-            edit_agent.run(
-                task=task,
-                parser=parser,
-                vision_validator_agent=vision_validator_agent,
+            (log_root / "planner.json").write_text(
+                json.dumps(plan_json, ensure_ascii=False, indent=4),
+                encoding="utf-8",
             )
 
+            if args.max_concurrency > 1:
+                # 서로 다른 page의 task는 동시에 진행, COM 작업은 이 thread에서 직렬 실행
+                run_plan(
+                    plan_json,
+                    edit_agent=edit_agent,
+                    parser=parser,
+                    vision_validator_agent=vision_validator_agent,
+                    max_concurrency=args.max_concurrency,
+                )
+            else:
+                for task in plan_json.get("tasks", []):
+                    edit_agent.run(
+                        task=task,
+                        parser=parser,
+                        vision_validator_agent=vision_validator_agent,
+                    )
+
+            # 세션 누적 token / 비용 (stage별)
+            print(get_ledger().format_summary())
+
+    finally:
+        # --bulk_export의 숨겨진 helper presentation (macro 보관용)
+        parser.close()
+
+    kill_powerpoint_processes()
+    time.sleep(1)
+    sys.exit(0)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
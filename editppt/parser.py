@@ -1,40 +1,265 @@
 from editppt.utils.utils import parse_active_slide_objects
 import json
+import zipfile
 from copy import deepcopy
 import re
 
 from editppt.utils.logger_manual import log_path
 from editppt.utils.llm_client import call_llm
+from editppt.scheduler import com_call
+from editppt.utils.slide_serializer import diff_slides_json, compact_tool_calls
+from editppt.utils.bulk_export import BulkSlideExporter
+from editppt.utils.parse_store import preparse_deck
+from editppt.utils.jsonl_log import get_writer
+from editppt.utils.log_sink import get_sink
+from editppt.utils.parse_diff import (
+    diff_parses, has_changes, changed_shape_ids, summarize_changes, group_owner_ids,
+)
+from editppt.utils.tracer import traced
 from editppt.prompts import *
 
 
+SHAPE_ID_ARG_KEYS = ("shape_id", "target_id", "base_id", "source_id", "group_id", "table_id")
+SHAPE_IDS_ARG_KEYS = ("shape_ids", "target_ids")
+SLIDE_LEVEL_TOOLS = ("add_slide", "delete_slide", "duplicate_slide")
+# 파서가 결과를 기록하지 않는 속성(fill/line)만 바꾸는 tool → diff로 실패 판단 불가
+UNPARSED_EFFECT_TOOLS = ("apply_visual_style", "apply_gradient_fill")
+# 파서가 기록하지 않는 인자: Rotation, table cell text (container="table")
+LAYOUT_PARSED_ARGS = ("left", "top", "width", "height")
+TABLE_TEXT_TOOLS = ("set_text_style_preserve_runs", "replace_shape_text")
+
+
+def has_unparsed_effect(tool: dict) -> bool:
+    """diff_parses()로 결과를 볼 수 없는 tool call인지"""
+    name = tool.get("name")
+    args = tool.get("arguments") or {}
+    if name in SLIDE_LEVEL_TOOLS + UNPARSED_EFFECT_TOOLS:
+        return True
+    if name == "adjust_layout":
+        # rotation만 바꾸는 호출
+        return args.get("rotation") is not None and all(args.get(key) is None for key in LAYOUT_PARSED_ARGS)
+    if name in TABLE_TEXT_TOOLS:
+        return args.get("container") == "table"
+    return False
+
+
+def tool_target_shape_ids(args: dict) -> set:
+    """Tool call 인자에서 수정 대상 Shape_Id 추출 (없으면 빈 set)."""
+    shape_ids = set()
+    for key in SHAPE_ID_ARG_KEYS:
+        if args.get(key) is not None:
+            shape_ids.add(args[key])
+    for key in SHAPE_IDS_ARG_KEYS:
+        shape_ids.update(args.get(key) or [])
+    return shape_ids
+
+
+def obvious_edit_failure(changes: dict, page_number: int, used_tools: list, group_owners: dict = None):
+    """
+    LLM validator 호출 전에 걸러낼 수 있는 명백한 실패.
+    Returns: 실패 사유 (str) 또는 None (판단 불가 → validator로)
+
+    - tool 없이 변화 없음: 이미 목표 상태일 수 있으므로 validator가 판단 (Goal-State Rule)
+    - tool 사용 + 변화 없음: 실패
+    - 대상 shape은 그대로인데 다른 shape만 바뀜: 실패
+      (group 안의 shape을 대상으로 하면 diff에는 group의 Shape_Id로 나오므로
+       group_owners (group_owner_ids())로 top-level id로 바꿔 비교)
+    """
+    group_owners = group_owners or {}
+    if not used_tools:
+        return None
+
+    target_ids = set()
+    for tool in used_tools:
+        args = tool.get("arguments") or {}
+        # 다른 슬라이드/슬라이드 단위 tool, 파서가 기록하지 않는 속성만 바꾸는 tool은
+        # 이 페이지 diff로 판단할 수 없다
+        if has_unparsed_effect(tool):
+            return None
+        if args.get("slide_number", page_number) != page_number:
+            return None
+        shape_ids = tool_target_shape_ids(args)
+        if not shape_ids:
+            target_ids = None
+        elif target_ids is not None:
+            target_ids |= {group_owners.get(sid, sid) for sid in shape_ids}
+
+    if not has_changes(changes):
+        tools = ", ".join(tool.get("name", "") for tool in used_tools)
+        return (
+            f"Tool used ({tools}), but no differences on slide {page_number}. "
+            "Check the target slide number or shape id carefully. "
+            "If the request is already satisfied, call no tool."
+        )
+
+    if target_ids:
+        # 새로 생긴 shape (duplicate, group 등)은 제외하고 기존 shape의 변경만 본다
+        changed = changed_shape_ids(changes) - set(changes.get("added", []))
+        if changed and not (changed & target_ids):
+            return (
+                f"Changes were applied to shape(s) {sorted(changed, key=str)} "
+                f"instead of the requested target shape(s) {sorted(target_ids, key=str)}."
+            )
+    return None
+
+
+class ShapeParseCache:
+    """
+    Shape 단위 파싱 결과 캐시.
+    (slide, Shape_Id) -> (fingerprint, More_detail)
+    fingerprint가 바뀐 shape만 text/run/bullet을 다시 파싱한다.
+    """
+    def __init__(self):
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, slide_number: int, shape_id: int, fingerprint):
+        entry = self.entries.get((slide_number, shape_id))
+        if fingerprint is None or entry is None or entry[0] != fingerprint:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return deepcopy(entry[1])
+
+    def put(self, slide_number: int, shape_id: int, fingerprint, more_detail: dict):
+        if fingerprint is None:
+            return
+        self.entries[(slide_number, shape_id)] = (fingerprint, deepcopy(more_detail))
+
+    def invalidate(self, slide_number: int = None, shape_ids=None):
+        """
+        slide_number=None → 전체 삭제
+        shape_ids=None → 해당 슬라이드 전체 삭제
+        """
+        if slide_number is None:
+            self.entries.clear()
+            return
+        for key in list(self.entries):
+            if key[0] != slide_number:
+                continue
+            if shape_ids is None or key[1] in shape_ids:
+                del self.entries[key]
+
+    def invalidate_for_tools(self, page_number: int, used_tools: list):
+        """Tool call 인자에서 수정 대상 shape을 찾아 해당 캐시만 삭제."""
+        for tool in used_tools or []:
+            if tool.get("name") in SLIDE_LEVEL_TOOLS:
+                self.invalidate()
+                return
+
+            args = tool.get("arguments") or {}
+            slide_number = args.get("slide_number", page_number)
+            shape_ids = tool_target_shape_ids(args)
+
+            # 대상 shape을 알 수 없는 tool (add_textbox 등) → 슬라이드 전체
+            self.invalidate(slide_number, shape_ids or None)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self.entries),
+        }
+
+
 class Parser:
-    def __init__(self, container: object, total_slides: int):
+    def __init__(self, container: object, total_slides: int, bulk_export: bool = False,
+                 preparse: bool = False, preparse_workers: int = None):
         """
         Args:
             container (object): PPTContainer instance containing the prs.
             total_slides (int): Total number of slides.
+            bulk_export (bool): VBA 매크로 1회로 슬라이드를 읽는 backend 사용 (실패 시 자동 fallback).
+            preparse (bool): 시작 시 .pptx 파일에서 전체 슬라이드를 미리 파싱 (COM 사용 없음).
+            preparse_workers (int): pre-parse worker process 수 (None → CPU 수).
         """
         self.database = {}
         self.edit_history = {}
         self.container = container  
         self.total_slides = total_slides
+        self.shape_cache = ShapeParseCache()
+        self.bulk_exporter = BulkSlideExporter(container.prs.Application) if bulk_export else None
+        # parse_after_edit()가 만든 수정 후 snapshot (검증 통과 시 commit_after_edit()로 반영)
+        self.pending_parse = {}
+        # 파일에서 미리 파싱했고 아직 COM으로 다시 읽지 않은 슬라이드
+        # (prompt용으로만 쓰고, 수정 전 기준은 com_baseline()으로 다시 읽는다)
+        self.preparsed = set()
+        # database / edit_history 변경분만 append (rebuild_state()로 최신 상태 복원)
+        self.database_log = get_writer("parser_Database.jsonl", flush_interval=2.0)
+        self.history_log = get_writer("parser_Edithistory.jsonl", flush_interval=2.0)
 
-        # for page_num in range(1, min(10, total_slides + 1)):
-        #     self.database[page_num] = parse_active_slide_objects(page_num, self.container.prs)
-        #     print(f"Parsed slide {page_num}/{total_slides}")
+        if preparse:
+            self.preparse(preparse_workers)
 
+    def close(self):
+        """세션 종료 시: bulk export용 숨겨진 helper presentation을 닫는다."""
+        if self.bulk_exporter is not None:
+            com_call(self.bulk_exporter.close)
 
+    def preparse(self, max_workers: int = None):
+        """
+        덱 파일 전체를 process pool로 파싱해 database를 채운다 (parse_store에 저장/재사용).
+        열려 있는 덱과 파일이 같은 시작 시점에만 유효하다.
+        """
+        path = getattr(self.container.prs, "FullName", None)
+        if not path:
+            print("Pre-parse skipped: presentation has no file path")
+            return
+        try:
+            database, stats = preparse_deck(path, max_workers=max_workers)
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+            print(f"Pre-parse skipped ({path}): {e}")
+            return
+        self.database.update(database)
+        self.preparsed = set(database)
+        for page_number, parse in database.items():
+            self.database_log.put(page_number, parse)
+        print(f"Pre-parsed {stats['slides']} slides: {stats}")
+
+
+    @traced("parse")
     def process(self, page_number: int):
-        # if page_number not in self.database:
+        # COM 파싱 + database 갱신은 COM thread에서 (scheduler 사용 시)
+        return com_call(self._process, page_number)
+
+    def _process(self, page_number: int):
+        if page_number in self.preparsed:
+            # 미리 파싱한 결과는 prompt에만 쓴다 (edit agent의 LLM 호출 전에 COM 파싱을 기다리지 않도록)
+            print(f'Using pre-parsed Page {page_number}')
+            return self.database[page_number]
+        return self._parse_com(page_number)
+
+    def com_baseline(self, page_number: int):
+        """
+        수정 직전 상태의 COM 파싱 (tool 실행 전에 호출).
+        OOXML pre-parse는 run 병합 기준과 상속 theme/placeholder font 해석이 COM과 달라,
+        그대로 diff 기준(old_parse)이나 tool의 slide_json으로 쓰면 없는 변경이 보이거나
+        Run_Start_Index가 어긋난다. pre-parse된 슬라이드면 여기서 COM으로 다시 읽는다.
+        """
+        return com_call(self._com_baseline, page_number)
+
+    def _com_baseline(self, page_number: int):
+        if page_number in self.preparsed:
+            self.preparsed.discard(page_number)
+            return self._parse_com(page_number)
+        return self.database[page_number]
+
+    def _parse_com(self, page_number: int):
         print(f'Parsing Page {page_number}...')
         print('='*40)
-        self.database[page_number] = parse_active_slide_objects(page_number, self.container.prs)
-        with open(log_path("parser_Database.json"), "w", encoding="utf-8") as f:
-            json.dump(self.database, f, ensure_ascii=False, indent=4)
+        self.database[page_number] = parse_active_slide_objects(
+            page_number, self.container.prs, shape_cache=self.shape_cache,
+            bulk_exporter=self.bulk_exporter,
+        )
+        print(f"Shape cache: {self.shape_cache.stats()}")
+        self.database_log.put(page_number, self.database[page_number])
 
         return self.database[page_number]
 
+    @traced("update_after_edit")
     def update_after_edit(self,
                         text_validation: bool,
                         model: str,
@@ -47,65 +272,123 @@ class Parser:
         LLM, VLM Validates revision completion.
         True = fulfilled, False = retry with feedback.
         """
+        self.parse_after_edit(page_number, used_tools)
+        if not text_validation:
+            self.commit_after_edit(page_number)
+            return True, None
+        return self.validate_edit(model, page_number, description, action, detailed_contents, used_tools)
 
-        old_parse = self.database.get(page_number, None)
-        if old_parse is None:
+    def parse_after_edit(self, page_number: int, used_tools: list) -> dict:
+        """
+        수정 후 슬라이드를 COM으로 다시 파싱해 pending_parse에 둔다 (deck을 읽는 부분).
+        validate_edit()은 deck을 읽지 않으므로 수정 구간 밖에서 실행할 수 있다.
+        """
+        if page_number not in self.database:
             raise RuntimeError("Slide not parsed by parser.process()")
-        new_parse = parse_active_slide_objects(page_number, self.container.prs)
-
-        # 수정 전 데이터 기록 (Append 모드)
-        with open(log_path(f"oldparse_{page_number}.txt"), "a", encoding="utf-8") as f:
-            f.write(f"\n{'='*50}\n")
-            f.write(json.dumps(old_parse, ensure_ascii=False, indent=4))
-            f.write("\n")
-
-        # 수정 후 데이터 기록 (Append 모드)
-        with open(log_path(f"newparse_{page_number}.txt"), "a", encoding="utf-8") as f:
-            f.write(f"\n{'='*50}\n")
-            f.write(json.dumps(new_parse, ensure_ascii=False, indent=4))
-            f.write("\n")
-
-        # Text Validation 
-        if text_validation:
-            # LLM 검증
-            messages = [
-                {"role": "system",
-                "content": create_text_validator_agent_system_prompt(
-                    page_number, description, action, detailed_contents)},
-                {"role": "user",
-                "content": create_text_validator_agent_user_prompt(old_parse, new_parse, used_tools)}
-            ]
-            response = call_llm(model=model, messages=messages)
-            response_text = (response.output_text or "").strip()
-
-            if response_text.lower().startswith("true"):
-                if "|" in response_text:
-                    reason = response_text.split("|")[1].strip()
-                else:
-                    reason = response_text.replace("True", "").strip(": ").strip()
-                reason = re.sub(r"^(true|yes)[:.\s]*", "", response_text, flags=re.IGNORECASE).strip()
-                return True, reason
-            else:
-                if "|" in response_text:
-                    reason = response_text.split("|")[1].strip()
-                else:
-                    reason = response_text.replace("False", "").strip(": ").strip()
-                reason = re.sub(r"^(false|no)[:.\s]*", "", response_text, flags=re.IGNORECASE).strip()
-                return False, reason
+        return com_call(self._parse_after_edit, page_number, used_tools)
+
+    @traced("validate_edit")
+    def validate_edit(self, model: str, page_number: int, description: str, action: str,
+                      detailed_contents: str, used_tools: list):
+        """
+        parse_after_edit()의 결과를 database의 수정 전 상태와 비교해 검증한다.
+        Returns: (valid, reason)
+        """
+        old_parse = self.database[page_number]
+        new_parse = self.pending_parse.get(page_number)
+        if new_parse is None:
+            raise RuntimeError("No post-edit snapshot. Call parse_after_edit() first.")
+
+        # 수정 전/후 데이터 기록 (Append 모드, log sink worker thread에서 직렬화)
+        # 둘 다 database에서 통째로 교체될 뿐 제자리 수정되지 않으므로 참조만 넘긴다
+        log_sink = get_sink()
+        separator = f"\n{'='*50}\n"
+        log_sink.write_json(log_path(f"oldparse_{page_number}.txt"), old_parse,
+                            mode="a", kind="parse_dump", prefix=separator, suffix="\n")
+        log_sink.write_json(log_path(f"newparse_{page_number}.txt"), new_parse,
+                            mode="a", kind="parse_dump", prefix=separator, suffix="\n")
 
+        # 구조 diff로 명백한 실패는 LLM 호출 없이 반환
+        changes = diff_parses(old_parse, new_parse)
+        group_owners = {**group_owner_ids(old_parse), **group_owner_ids(new_parse)}
+        failure = obvious_edit_failure(changes, page_number, used_tools, group_owners)
+        if failure:
+            return False, failure
+
+        # LLM 검증
+        # 변경된 shape(+ tool 대상 shape)만 보내는 compact diff
+        target_ids = set()
+        for tool in used_tools or []:
+            target_ids |= tool_target_shape_ids(tool.get("arguments") or {})
+        slide_diff = diff_slides_json(old_parse, new_parse, target_ids)
+
+        # 고정 지시문이 앞, task context / diff는 user message에 (provider prompt cache)
+        messages = [
+            {"role": "system",
+            "content": create_text_validator_agent_system_prompt()},
+            {"role": "user",
+            "content": create_text_validator_agent_context_prompt(
+                page_number, description, action, detailed_contents)
+            + create_text_validator_agent_user_prompt(
+                slide_diff, summarize_changes(changes), compact_tool_calls(used_tools))}
+        ]
+        response = call_llm(model=model, messages=messages, stage="text_validator")
+        response_text = (response.output_text or "").strip()
+
+        if response_text.lower().startswith("true"):
+            if "|" in response_text:
+                reason = response_text.split("|")[1].strip()
+            else:
+                reason = response_text.replace("True", "").strip(": ").strip()
+            reason = re.sub(r"^(true|yes)[:.\s]*", "", response_text, flags=re.IGNORECASE).strip()
+            return True, reason
         else:
-            self.edit_history.setdefault(page_number, []).append(deepcopy(old_parse))
-            self.database[page_number] = new_parse
-            return True, None
+            if "|" in response_text:
+                reason = response_text.split("|")[1].strip()
+            else:
+                reason = response_text.replace("False", "").strip(": ").strip()
+            reason = re.sub(r"^(false|no)[:.\s]*", "", response_text, flags=re.IGNORECASE).strip()
+            return False, reason
+
+
+
+    @traced("reparse")
+    def _parse_after_edit(self, page_number: int, used_tools: list) -> dict:
+        # 수정된 shape은 캐시를 무시하고 새로 파싱한 뒤, 다시 비워둔다.
+        # (style만 바뀐 경우 fingerprint가 같으므로 rollback 후 stale 결과가 남지 않도록)
+        self.shape_cache.invalidate_for_tools(page_number, used_tools)
+        for tool in used_tools or []:
+            if tool.get("name") in SLIDE_LEVEL_TOOLS:
+                # 슬라이드 추가/삭제로 번호가 밀리면 파일 기준 pre-parse는 더 이상 맞지 않는다
+                self.preparsed.clear()
+                break
+            # 다른 페이지를 수정한 tool → 그 페이지의 pre-parse도 수정 전 상태
+            self.preparsed.discard((tool.get("arguments") or {}).get("slide_number", page_number))
+        new_parse = parse_active_slide_objects(
+            page_number, self.container.prs, shape_cache=self.shape_cache,
+            bulk_exporter=self.bulk_exporter,
+        )
+        self.shape_cache.invalidate_for_tools(page_number, used_tools)
+        self.pending_parse[page_number] = new_parse
+        return new_parse
+
+    def commit_after_edit(self, page_number: int) -> dict:
+        """
+        검증을 통과한 수정 후 snapshot을 database에 반영하고, 이전 상태는 edit_history에 쌓는다.
+        parse_after_edit()에서 이미 파싱한 결과를 재사용하므로 COM 재파싱이 없다.
+        """
+        # database는 COM thread의 _process()도 쓰므로 같은 thread에서 갱신
+        return com_call(self._commit_after_edit, page_number)
+
+    def _commit_after_edit(self, page_number: int) -> dict:
+        new_parse = self.pending_parse.pop(page_number, None)
+        if new_parse is None:
+            raise RuntimeError("No post-edit snapshot. Call parse_after_edit() first.")
 
+        old_parse = deepcopy(self.database.get(page_number, None))
+        self.edit_history.setdefault(page_number, []).append(old_parse)
+        self.database[page_number] = new_parse
+        self.history_log.push(page_number, old_parse)
+        self.database_log.put(page_number, new_parse)
+        return new_parse
 
-       # Removed. Command may be mis-ordered to edit an already accomplish task, so the result could be identical to the original.
-        # #validation 1
-        # if new_parse == old_parse:
-        #     if used_tools:
-        #         return False, "Tool used, but no differences. Check the target slide number or shape id carefully."
-        #     else:
-        #         return False, "Unknown Error."
-        # else:
-        #     if text_validation:
-        #         ...
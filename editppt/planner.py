@@ -5,6 +5,7 @@ from editppt.utils.llm_client import call_llm
 from editppt.prompts import *
 from editppt.utils.utils import parse_llm_response
 from editppt.utils.logger_manual import TIMESTAMP, log_path
+from editppt.utils.tracer import span, traced, annotate
 
 
 class Planner:
@@ -12,12 +13,15 @@ class Planner:
         self.slide_name = slide_name
         self.total_slide_numbers = total_slide_numbers
 
-        self.system_prompt = create_plan_prompt(
+        # 고정 system prompt가 앞, 바뀌는 내용(ppt 상태 → 요청 → 오류 feedback)은 뒤 (provider prompt cache)
+        self.system_prompt = create_plan_prompt()
+        self.state_prompt = create_plan_state_prompt(
             self.slide_name,
             self.total_slide_numbers,
         )
         self.model = model
 
+    @traced("planner", report=True)
     def __call__(self, user_input: str):
         last_error_feedback = ""
         MAX_RETRIES = 3
@@ -29,6 +33,7 @@ class Planner:
             logs.append(text + "\n")
 
         for attempt in range(1, MAX_RETRIES + 1):
+            annotate(attempts=attempt)
             try:
                 call_llm_response = call_llm(
                     model=self.model,
@@ -36,11 +41,13 @@ class Planner:
                         {"role": "system", "content": self.system_prompt},
                         {
                             "role": "user",
-                            "content": last_error_feedback
+                            "content": self.state_prompt
                             + "\nNow, please create a plan for the following request:\n"
-                            + user_input,
+                            + user_input
+                            + last_error_feedback,
                         },
                     ],
+                    stage="planner",
                 )
 
                 response = call_llm_response.output_text
@@ -101,7 +108,8 @@ Do NOT include comments, explanations, or placeholders.
 """
 
                 print(f"[Attempt {attempt}/{MAX_RETRIES}] Parsing failed. Retrying...")
-                time.sleep(1)
+                with span("retry_wait"):
+                    time.sleep(1)
 
             except Exception as e:
                 had_error = True
@@ -113,7 +121,8 @@ Do NOT include comments, explanations, or placeholders.
                 )
 
                 print(f"[Attempt {attempt}/{MAX_RETRIES}] Exception during LLM call: {e}")
-                time.sleep(1)
+                with span("retry_wait"):
+                    time.sleep(1)
 
         if had_error:
             log_file_path = log_path(
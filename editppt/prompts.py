@@ -79,13 +79,14 @@
 
 #     return PLAN_PROMPT
 
-def create_plan_prompt(slide_name, total_slide_numbers):
+def create_plan_prompt():
     """
     PLAN_PROMPT 문자열을 생성하여 반환합니다.
+    (고정 문자열 — provider prompt cache가 재사용하도록 ppt 상태는 create_plan_state_prompt()로 user message에)
     """
     PLAN_PROMPT = f"""You are a planning assistant for PowerPoint modifications.
 Your job is to create a detailed, specific, step-by-step plan for modifying a PowerPoint presentation based on the user's request.
-present ppt state: [Slide Name: {slide_name}, Total Slide Numbers: {total_slide_numbers}]
+The present ppt state (slide name, total slide numbers) is given at the start of the user message.
 Now, Break down complex requests into highly specific actionable tasks that can be executed by a PowerPoint automation system.
 Focus on identifying:
 1. Specific slides to modify (by page number, starting from 1, must be integer.)
@@ -153,6 +154,10 @@ Response ONLY JSON.
     return PLAN_PROMPT
 
 
+def create_plan_state_prompt(slide_name, total_slide_numbers):
+    return f"present ppt state: [Slide Name: {slide_name}, Total Slide Numbers: {total_slide_numbers}]\n"
+
+
 ############################################################
 ###################### 2. Edit Agent #######################
 ############################################################
@@ -228,12 +233,14 @@ Response ONLY JSON.
 #     return prompt
 
 
-def create_edit_agent_system_prompt(current_ppt_json:str) -> str:
+def create_edit_agent_system_prompt() -> str:
+    """
+    고정 지시문만 (tool schema와 함께 호출마다 같은 prefix).
+    슬라이드 상태는 create_edit_agent_state_prompt()로 그 뒤 user message에 넣는다.
+    """
     prompt= f"""## Role
 You are a 'Presentation Editing Agent'. Your goal is to fulfill the user's editing requests by orchestrating the available tools based on the current slide state.
-
-## Current Slide State (JSON)
-{current_ppt_json}
+The current slide state (JSON) is given in the first user message.
 
 ## Guidelines for Vague Requests
 If the user's request is ambiguous, apply the following logic to infer coordinates (x, y):
@@ -248,6 +255,14 @@ If the user's request is ambiguous, apply the following logic to infer coordinat
     return prompt
 
 
+def create_edit_agent_state_prompt(current_ppt_json: str) -> str:
+    prompt = f"""## Current Slide State (JSON)
+Runs reference fonts in "Styles" by "S"; omitted fields are false / empty.
+{current_ppt_json}
+"""
+    return prompt
+
+
 def create_edit_agent_user_prompt(page_number, description, action, contents, feedback=None):
     prompt = f"""
 Slide information:
@@ -282,19 +297,14 @@ The following issues were identified in previous trials. You must adjust your st
 ############################################################
 ################## 3. Text Validator Agent #################
 ############################################################
-def create_text_validator_agent_system_prompt(page_number, description, action, detailed_contents):
+def create_text_validator_agent_system_prompt():
+    """고정 지시문만 — 검증할 task의 Context는 create_text_validator_agent_context_prompt()로 user message에"""
     prompt = f"""
 You are a PPT edit validation agent.
 
 Your ONLY job is to decide whether the explicitly requested goal is satisfied on the explicitly specified target.
 Do NOT judge quality or suggest improvements.
-
-────────────────────────────────
-### Context
-- Page: {page_number}
-- Task: {description}
-- Action: {action}
-- Target: {detailed_contents}
+The task Context (page, task, action, target) is given at the start of the user message.
 
 ────────────────────────────────
 ### Validation Rules (STRICT)
@@ -354,16 +364,29 @@ Directions are executable tool instructions, NOT advice.
 """
     return prompt
 
-def create_text_validator_agent_user_prompt(old_parse, new_parse, used_tools):
+def create_text_validator_agent_context_prompt(page_number, description, action, detailed_contents):
+    prompt = f"""### Context
+- Page: {page_number}
+- Task: {description}
+- Action: {action}
+- Target: {detailed_contents}
+"""
+    return prompt
+
+
+def create_text_validator_agent_user_prompt(slide_diff, change_summary, used_tools):
     
     prompt = f"""
-Please compare the following two states:
+Please compare the following two states.
+Only changed shapes are listed ("Before" / "After"); tool targets that did not change are in "Unchanged_Targets",
+and every other shape is identical before and after ("Unchanged_Shape_Ids").
+Runs reference fonts in "Styles" by "S"; omitted fields are false / empty.
 
-[Slide before edit]
-{old_parse}
+[Detected Changes]
+{change_summary}
 
-[Slide after edit]
-{new_parse}
+[Slide diff (JSON)]
+{slide_diff}
 
 [Used Tools]
 {used_tools}
@@ -502,7 +525,11 @@ Question:
 ################ 4. Vision Validator Agent #################
 ############################################################
 
-def create_vision_validator_agent_system_prompt(agent_request: str, parsed_contents: str, used_tools):
+def create_vision_validator_agent_system_prompt():
+    """
+    고정 지시문만 (slide image 앞에 둔다).
+    수정 요청 / 사용한 tool / 슬라이드 JSON은 create_vision_validator_agent_context_prompt()로 image 뒤에.
+    """
     prompt = f"""You are a professional PPT Quality Assurance (QA) specialist.
 
 Your role is NOT to review the entire slide.
@@ -519,13 +546,7 @@ even if they would normally qualify as critical issues.
 
 ### Agent Modification Context (SOURCE OF SCOPE)
 
-The following request describes WHAT was modified and WHERE:
-
-{agent_request}
-
-Used Tools:
-{used_tools}
-
+The agent request and used tools given after the slide image describe WHAT was modified and WHERE.
 This request DEFINES your inspection boundary.
 Anything outside the logical or spatial impact of this request
 MUST be ignored.
@@ -628,13 +649,17 @@ you MUST return:
 {{
   "HasCriticalIssues": "No"
 }}
+"""
+    return prompt
 
----
-### Agent request
+
+def create_vision_validator_agent_context_prompt(agent_request: str, parsed_contents: str, used_tools):
+    prompt = f"""### Agent request
 {agent_request}
+### Used Tools
+{used_tools}
 ### Slide Contents JSON 
 {parsed_contents}
-
 """
     return prompt
 
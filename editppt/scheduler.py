@@ -0,0 +1,258 @@
+"""
+Concurrent task execution across independent slides.
+
+PowerPoint COM objects live in the apartment of the thread that opened the
+presentation, so every COM call must run on that one thread. The scheduler
+runs its asyncio loop on that thread and uses it as the COM thread:
+
+- each task runs EditAgent.run in a worker thread (LLM waits overlap there)
+- every COM section (parse, tool execution, export, rollback) is sent back
+  to the loop thread through com_call() and runs serialized
+- tasks on the same page number run in plan order, different pages overlap
+- DeckLock keeps file-based rollback / backup refresh exclusive, since
+  reopening the deck would discard edits of concurrently running tasks
+- add/delete/duplicate_slide renumber pages under the other tasks, so plans
+  that change the slide structure run serially: detected from the plan text,
+  or when a task's tool calls contain a slide-level tool (SlideStructureChange),
+  after which the remaining tasks run one by one in plan order
+"""
+import re
+import asyncio
+import threading
+import contextvars
+import time
+import concurrent.futures
+from contextlib import contextmanager
+
+from loguru import logger
+
+
+class ComDispatcher:
+    """Runs callables on the thread that owns the PowerPoint COM objects."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.thread_id = threading.get_ident()
+
+    def call(self, fn, *args, **kwargs):
+        if threading.get_ident() == self.thread_id:
+            return fn(*args, **kwargs)
+
+        future = concurrent.futures.Future()
+        # 호출한 thread의 context(현재 trace span 등)에서 실행
+        context = contextvars.copy_context()
+
+        def job():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(context.run(fn, *args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+        self.loop.call_soon_threadsafe(job)
+        return future.result()
+
+
+_ACTIVE_DISPATCHER = None
+# 다른 page의 task와 동시에 실행 중인지 (run_page가 설정, asyncio.to_thread로 전달)
+_CONCURRENT = contextvars.ContextVar("editppt_concurrent_task", default=False)
+
+# "add a new slide", "delete slide 3", "duplicate the slide" ...
+SLIDE_STRUCTURE_PATTERN = re.compile(
+    r"\b(add|insert|create|delete|remove|duplicate|copy|clone)\s+"
+    r"((a|an|the|new|one|another|blank)\s+)*slides?\b",
+    re.IGNORECASE,
+)
+
+
+class SlideStructureChange(Exception):
+    """Slide-level tool calls while other tasks run; the task is re-run after them, serially."""
+
+
+def in_concurrent_run() -> bool:
+    return _CONCURRENT.get()
+
+
+def plan_changes_slide_structure(tasks: list) -> bool:
+    """plan에 슬라이드 추가/삭제/복제로 보이는 task가 있는지"""
+    for task in tasks:
+        text = " ".join(str(task.get(key, "")) for key in ("description", "target", "action"))
+        if SLIDE_STRUCTURE_PATTERN.search(text):
+            return True
+    return False
+
+
+def com_call(fn, *args, **kwargs):
+    """
+    COM을 사용하는 코드는 이 함수를 통해 실행한다.
+    scheduler가 없으면(순차 실행) 그대로 호출한다.
+    """
+    dispatcher = _ACTIVE_DISPATCHER
+    if dispatcher is None:
+        return fn(*args, **kwargs)
+    return dispatcher.call(fn, *args, **kwargs)
+
+
+class DeckLock:
+    """
+    Readers-writer lock over the whole deck.
+    shared: edits that the undo journal can invert (slide-local)
+    exclusive: edits that may need the file-based rollback / backup refresh
+    pending: journaled edits that are applied but not yet validated. Validators run
+             outside any section; exclusive sections still wait for them so the
+             file backup never captures (and a reopen never restores) unvalidated edits.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._shared = 0
+        self._exclusive = False
+        self._waiting_exclusive = 0
+        self._pending = 0
+
+    @contextmanager
+    def section(self, exclusive: bool = False, resume: bool = False):
+        """
+        resume: pending() 안에서 다시 들어가는 shared section (rollback).
+                대기 중인 exclusive가 이 pending이 끝나기를 기다리므로 그 뒤에 줄 서지 않는다.
+        """
+        with self._cond:
+            if exclusive:
+                self._waiting_exclusive += 1
+                self._cond.wait_for(lambda: not self._exclusive and self._shared == 0 and self._pending == 0)
+                self._waiting_exclusive -= 1
+                self._exclusive = True
+            else:
+                self._cond.wait_for(lambda: not self._exclusive and (resume or self._waiting_exclusive == 0))
+                self._shared += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                if exclusive:
+                    self._exclusive = False
+                else:
+                    self._shared -= 1
+                self._cond.notify_all()
+
+    @contextmanager
+    def pending(self):
+        """수정 → 검증 → (rollback) 동안 유지. 안에서 section(resume=True)로 deck을 다시 잡는다."""
+        with self._cond:
+            self._pending += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._pending -= 1
+                self._cond.notify_all()
+
+
+def group_tasks_by_page(tasks: list) -> dict:
+    """page number -> [(plan index, task), ...] (plan order 유지)"""
+    groups = {}
+    for index, task in enumerate(tasks):
+        groups.setdefault(task.get("page number"), []).append((index, task))
+    return groups
+
+
+async def run_tasks_concurrently(tasks: list, edit_agent, parser, vision_validator_agent,
+                                 max_concurrency: int = 4) -> list:
+    """
+    Runs plan tasks with LLM waits overlapped across pages.
+    Must be awaited on the thread that opened the presentation.
+
+    Returns:
+        [{"page number", "description", "seconds"}, ...] in completion order
+    """
+    global _ACTIVE_DISPATCHER
+
+    loop = asyncio.get_running_loop()
+    previous = _ACTIVE_DISPATCHER
+    _ACTIVE_DISPATCHER = ComDispatcher(loop)
+    if edit_agent.deck_lock is None:
+        edit_agent.deck_lock = DeckLock()
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    timings = []
+
+    async def run_task(task):
+        t0 = time.perf_counter()
+        await asyncio.to_thread(
+            edit_agent.run,
+            task=task,
+            parser=parser,
+            vision_validator_agent=vision_validator_agent,
+        )
+        timings.append({
+            "page number": task.get("page number"),
+            "description": task.get("description", ""),
+            "seconds": time.perf_counter() - t0,
+        })
+
+    # 직렬로 실행할 (plan index, task)
+    deferred = []
+    restructured = asyncio.Event()
+
+    async def run_page(page_tasks, concurrent):
+        async with semaphore:
+            _CONCURRENT.set(concurrent)
+            for i, (index, task) in enumerate(page_tasks):
+                if restructured.is_set():
+                    deferred.extend(page_tasks[i:])
+                    return
+                try:
+                    await run_task(task)
+                except SlideStructureChange as e:
+                    logger.info(f"{e} — page {task.get('page number')} and the tasks not yet started run serially")
+                    restructured.set()
+                    deferred.extend(page_tasks[i:])
+                    return
+
+    try:
+        if plan_changes_slide_structure(tasks):
+            logger.info("Plan adds, deletes or duplicates slides: running its tasks serially")
+            deferred.extend(enumerate(tasks))
+        else:
+            groups = group_tasks_by_page(tasks)
+            results = await asyncio.gather(
+                *(run_page(page_tasks, len(groups) > 1) for page_tasks in groups.values()),
+                return_exceptions=True,
+            )
+            for page, result in zip(groups, results):
+                if isinstance(result, BaseException):
+                    logger.error(f"Task on page {page} failed: {result}")
+
+        # 이 context에서는 _CONCURRENT가 False → slide-level tool도 실행된다
+        for index, task in sorted(deferred, key=lambda item: item[0]):
+            try:
+                await run_task(task)
+            except Exception as e:
+                logger.error(f"Task on page {task.get('page number')} failed: {e}")
+    finally:
+        _ACTIVE_DISPATCHER = previous
+
+    return timings
+
+
+def run_plan(plan_json: dict, edit_agent, parser, vision_validator_agent,
+             max_concurrency: int = 4) -> list:
+    """Synchronous entry point for main(). Call from the thread that opened the deck."""
+    t0 = time.perf_counter()
+    timings = asyncio.run(
+        run_tasks_concurrently(
+            plan_json.get("tasks", []),
+            edit_agent,
+            parser,
+            vision_validator_agent,
+            max_concurrency=max_concurrency,
+        )
+    )
+    total = time.perf_counter() - t0
+    slowest = max((t["seconds"] for t in timings), default=0.0)
+    logger.info(
+        f"Plan finished: {len(timings)} tasks in {total:.1f}s "
+        f"(slowest task {slowest:.1f}s, sum {sum(t['seconds'] for t in timings):.1f}s)"
+    )
+    return timings
@@ -0,0 +1,151 @@
+"""
+Batched execution of the tool calls from one LLM response (COM thread only).
+
+- calls are grouped by slide_number (stable order inside a slide). If a
+  slide-level tool (add/delete/duplicate_slide) renumbers slides, the original
+  order is kept and only consecutive calls on the same slide form a batch
+- every Shape_Id referenced by a batch is resolved once up front and reused by
+  each tool through tools.resolve_shapes()
+- adjust_layout / apply_visual_style calls on the same shape are merged into
+  one call, so each property is written once (later args win). Calls in
+  between may only touch other shapes or the other tool's properties
+  (geometry vs fill/line/shadow)
+- per-batch timing (resolve / apply) is logged and returned as a report
+"""
+import time
+import logging
+
+from editppt.parser import SLIDE_LEVEL_TOOLS, tool_target_shape_ids
+from editppt.tools.tools import resolve_shapes, release_resolved_shapes
+
+logger = logging.getLogger(__name__)
+
+
+MERGEABLE_TOOLS = ("adjust_layout", "apply_visual_style")
+
+
+def plan_batches(tool_calls: list) -> list:
+    """
+    Returns:
+        [(slide_number, [tool_call, ...]), ...]  (slide_number None: slide-level tool)
+    """
+    reorder = not any(tc["name"] in SLIDE_LEVEL_TOOLS for tc in tool_calls)
+    batches = []
+    by_slide = {}
+    for tc in tool_calls:
+        slide = (tc.get("arguments") or {}).get("slide_number")
+        if tc["name"] in SLIDE_LEVEL_TOOLS:
+            slide = None
+        if reorder and slide in by_slide:
+            by_slide[slide].append(tc)
+        elif not reorder and batches and batches[-1][0] == slide and slide is not None:
+            batches[-1][1].append(tc)
+        else:
+            batches.append((slide, [tc]))
+            by_slide[slide] = batches[-1][1]
+    return batches
+
+
+def _can_merge(prev: dict, call: dict) -> bool:
+    if prev["name"] != call["name"] or call["name"] not in MERGEABLE_TOOLS:
+        return False
+    prev_args, args = prev["arguments"], call["arguments"]
+    if prev_args.get("slide_number") != args.get("slide_number"):
+        return False
+    if prev_args.get("shape_id") is None or prev_args.get("shape_id") != args.get("shape_id"):
+        return False
+    # adjust_layout은 Width → Height 순서로 쓴다. LockAspectRatio가 켜진 shape은
+    # Height 다음 Width를 쓴 결과와 달라질 수 있으므로 그 순서는 합치지 않는다
+    if call["name"] == "adjust_layout" and prev_args.get("height") is not None and args.get("width") is not None:
+        return False
+    return True
+
+
+def _merge_target(merged: list, call: dict):
+    """
+    call을 합칠 수 있는 앞선 call. 사이에 있는 call이 다른 shape만 건드리거나
+    같은 shape의 다른 속성 그룹(MERGEABLE_TOOLS의 다른 tool)이면 건너뛰고 찾는다.
+    """
+    if call["name"] not in MERGEABLE_TOOLS:
+        return None
+    shape_id = call["arguments"].get("shape_id")
+    for prev in reversed(merged):
+        if _can_merge(prev, call):
+            return prev
+        if prev["name"] in MERGEABLE_TOOLS and prev["name"] != call["name"]:
+            continue
+        shape_ids = tool_target_shape_ids(prev["arguments"])
+        if shape_ids and shape_id not in shape_ids:
+            continue
+        # 같은 shape을 읽거나 쓰는 다른 tool, shape을 만드는 tool → 순서 유지
+        return None
+    return None
+
+
+def merge_calls(calls: list) -> list:
+    """같은 shape에 대한 MERGEABLE_TOOLS 호출을 하나로 합친다 (원본 dict는 그대로 둔다)."""
+    merged = []
+    for call in calls:
+        target = _merge_target(merged, call)
+        if target is not None:
+            target["arguments"].update({k: v for k, v in call["arguments"].items() if v is not None})
+            target["merged"].append(call)
+            continue
+        merged.append({**call, "arguments": dict(call.get("arguments") or {}), "merged": [call]})
+    return merged
+
+
+def run_batches(prs, tool_calls: list, execute) -> tuple:
+    """
+    Args:
+        prs: tool에 넘길 Presentation (journal.wrap(prs))
+        tool_calls: [{"name", "arguments", ...}, ...]
+        execute: execute(name, args) → tool 결과. 예외가 나면 그 call에서 멈춘다
+                 (실패를 예외로 알려야 한다. 반환값은 보지 않는다)
+
+    Returns:
+        ((failed_call, error) 또는 None, report)
+        failed_call은 합쳐진 call이면 합친 인자를 가진다
+        report = [{"slide", "calls", "executed", "shapes", "resolve_ms", "apply_ms"}, ...]
+    """
+    report = []
+    failure = None
+    for slide, calls in plan_batches(tool_calls):
+        t0 = time.perf_counter()
+        shape_ids = set()
+        if slide is not None:
+            for call in calls:
+                shape_ids |= tool_target_shape_ids(call.get("arguments") or {})
+            resolve_shapes(prs, slide, sorted(shape_ids, key=str))
+        t1 = time.perf_counter()
+
+        merged = merge_calls(calls)
+        try:
+            for call in merged:
+                try:
+                    execute(call["name"], call["arguments"])
+                except Exception as e:
+                    failure = (call, e)
+                    break
+        finally:
+            release_resolved_shapes()
+        t2 = time.perf_counter()
+
+        report.append({
+            "slide": slide,
+            "calls": len(calls),
+            "executed": len(merged),
+            "shapes": len(shape_ids),
+            "resolve_ms": round((t1 - t0) * 1000, 3),
+            "apply_ms": round((t2 - t1) * 1000, 3),
+        })
+        if failure:
+            break
+
+    for batch in report:
+        logger.info(
+            f"Tool batch slide={batch['slide']}: {batch['calls']} calls → {batch['executed']} executed, "
+            f"{batch['shapes']} shapes, resolve {batch['resolve_ms']} ms, apply {batch['apply_ms']} ms"
+        )
+    return failure, report
+
@@ -0,0 +1,180 @@
+"""
+Vectorized shape geometry for the layout tools.
+
+BoxSet reads Left/Top/Width/Height of every involved shape in one pass into an
+(n, 4) float array. Only the columns an operation needs are read; columns that
+are not read stay NaN. The layout functions below are pure array operations
+on those boxes. commit() then writes back only the coordinates that changed.
+The undo journal receives the snapshot value as the old value, so a write
+costs one COM call instead of a read plus a write.
+"""
+import numpy as np
+
+
+FIELDS = ("Left", "Top", "Width", "Height")
+L, T, W, H = range(4)
+# PowerPoint은 좌표를 Single로 저장 → 이보다 작은 차이는 같은 값으로 본다 (pt)
+TOLERANCE = 1e-3
+
+ALIGN_FIELDS = {
+    "left": ("Left",),
+    "right": ("Left", "Width"),
+    "top": ("Top",),
+    "bottom": ("Top", "Height"),
+    "center_h": ("Left", "Width"),
+    "center_v": ("Top", "Height"),
+}
+# align_to_object: side → (base에서 읽을 필드, target에서 읽을 필드)
+SIDE_FIELDS = {
+    "right": (("Left", "Top", "Width"), ("Left", "Top")),
+    "left": (("Left", "Top"), ("Left", "Top", "Width")),
+    "bottom": (("Left", "Top", "Height"), ("Left", "Top")),
+    "top": (("Left", "Top"), ("Left", "Top", "Height")),
+    "center": (FIELDS, FIELDS),
+}
+
+
+class BoxSet:
+    def __init__(self, shapes, fields=FIELDS):
+        """
+        Args:
+            shapes: COM shape 리스트 (journal proxy 가능)
+            fields: 읽을 좌표 (FIELDS의 부분집합)
+        """
+        self.shapes = list(shapes)
+        columns = [FIELDS.index(f) for f in fields]
+        boxes = np.full((len(self.shapes), 4), np.nan)
+        for i, shape in enumerate(self.shapes):
+            for c in columns:
+                boxes[i, c] = getattr(shape, FIELDS[c])
+        self.original = boxes
+        self.boxes = boxes.copy()
+
+    def __len__(self):
+        return len(self.shapes)
+
+    def commit(self, tolerance: float = TOLERANCE) -> int:
+        """
+        바뀐 좌표만 기록 (shape마다 Left → Top → Width → Height 순서).
+
+        Returns:
+            기록한 좌표 수
+        """
+        from editppt.tools.journal import set_known
+
+        known = ~np.isnan(self.original)
+        target = ~np.isnan(self.boxes)
+        changed = target & (~known | (np.abs(self.boxes - self.original) > tolerance))
+        for i, c in zip(*np.nonzero(changed)):
+            value = float(self.boxes[i, c])
+            if known[i, c]:
+                set_known(self.shapes[i], FIELDS[c], value, float(self.original[i, c]))
+            else:
+                setattr(self.shapes[i], FIELDS[c], value)
+        self.original = np.where(changed, self.boxes, self.original)
+        return int(changed.sum())
+
+
+# --- layout operations: (n, 4) array → new (n, 4) array ---
+
+def align(boxes: np.ndarray, align_type: str) -> np.ndarray:
+    """align_shapes 기준: 가장 바깥 변 또는 중심 평균에 맞춘다 (알 수 없는 align_type은 그대로)."""
+    out = boxes.copy()
+    if align_type == "left":
+        out[:, L] = boxes[:, L].min()
+    elif align_type == "right":
+        out[:, L] = (boxes[:, L] + boxes[:, W]).max() - boxes[:, W]
+    elif align_type == "top":
+        out[:, T] = boxes[:, T].min()
+    elif align_type == "bottom":
+        out[:, T] = (boxes[:, T] + boxes[:, H]).max() - boxes[:, H]
+    elif align_type == "center_h":
+        out[:, L] = (boxes[:, L] + boxes[:, W] / 2).mean() - boxes[:, W] / 2
+    elif align_type == "center_v":
+        out[:, T] = (boxes[:, T] + boxes[:, H] / 2).mean() - boxes[:, H] / 2
+    return out
+
+
+def distribute(boxes: np.ndarray, direction: str = "horizontal", spacing: float = None) -> np.ndarray:
+    """
+    위치 순으로 정렬한 뒤 첫 shape은 두고 나머지를 이어 붙인다.
+    spacing이 없으면(0 포함) 첫 shape 시작 ~ 마지막 shape 끝 사이를 같은 간격으로 나눈다.
+    """
+    pos, size = (L, W) if direction == "horizontal" else (T, H)
+    out = boxes.copy()
+    n = len(boxes)
+    if n < 2:
+        return out
+    order = np.argsort(boxes[:, pos], kind="stable")
+    start = boxes[order[0], pos]
+    sizes = boxes[order, size]
+    if spacing:
+        gap = spacing
+    else:
+        end = boxes[order[-1], pos] + boxes[order[-1], size]
+        gap = (end - start - sizes.sum()) / (n - 1)
+    offsets = np.concatenate(([0.0], np.cumsum(sizes[:-1] + gap)))
+    out[order, pos] = start + offsets
+    return out
+
+
+def place_relative(target: np.ndarray, base: np.ndarray, side: str = "right", margin: float = 10) -> np.ndarray:
+    """align_to_object 기준: base 박스 옆/위/아래/가운데에 target 박스를 놓는다."""
+    out = target.copy()
+    if side == "right":
+        out[L] = base[L] + base[W] + margin
+        out[T] = base[T]
+    elif side == "left":
+        out[L] = base[L] - target[W] - margin
+        out[T] = base[T]
+    elif side == "bottom":
+        out[L] = base[L]
+        out[T] = base[T] + base[H] + margin
+    elif side == "top":
+        out[L] = base[L]
+        out[T] = base[T] - target[H] - margin
+    elif side == "center":
+        out[L] = base[L] + (base[W] - target[W]) / 2
+        out[T] = base[T] + (base[H] - target[H]) / 2
+    return out
+
+
+def grid(boxes: np.ndarray, columns: int, left: float = None, top: float = None,
+         h_gap: float = 10, v_gap: float = 10) -> np.ndarray:
+    """
+    주어진 순서대로 columns열 격자에 배치. 칸 크기는 가장 큰 width/height,
+    각 shape은 칸 가운데. 원점을 생략하면 현재 박스들의 왼쪽 위.
+    """
+    if columns < 1:
+        raise ValueError("columns must be at least 1.")
+    out = boxes.copy()
+    index = np.arange(len(boxes))
+    cell_w = boxes[:, W].max()
+    cell_h = boxes[:, H].max()
+    origin_x = boxes[:, L].min() if left is None else left
+    origin_y = boxes[:, T].min() if top is None else top
+    out[:, L] = origin_x + (index % columns) * (cell_w + h_gap) + (cell_w - boxes[:, W]) / 2
+    out[:, T] = origin_y + (index // columns) * (cell_h + v_gap) + (cell_h - boxes[:, H]) / 2
+    return out
+
+
+def same_size(boxes: np.ndarray, dimension: str = "both", reference: str = "largest") -> np.ndarray:
+    """
+    Args:
+        dimension: 'width' | 'height' | 'both'
+        reference: 'largest' | 'smallest' | 'first' (shape_ids의 첫 shape)
+    """
+    if reference not in ("largest", "smallest", "first"):
+        raise ValueError(f"Unknown reference: {reference}")
+    out = boxes.copy()
+    columns = {"width": [W], "height": [H], "both": [W, H]}.get(dimension)
+    if columns is None:
+        raise ValueError(f"Unknown dimension: {dimension}")
+    for c in columns:
+        if reference == "largest":
+            out[:, c] = boxes[:, c].max()
+        elif reference == "smallest":
+            out[:, c] = boxes[:, c].min()
+        else:
+            out[:, c] = boxes[0, c]
+    return out
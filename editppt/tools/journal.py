@@ -0,0 +1,324 @@
+"""
+In-memory undo journal for FUNCTION_MAP tools.
+
+Tools receive a JournaledCOM proxy instead of the raw Presentation. Every
+property write is recorded with its prior value, and every text mutation
+snapshots the owning TextFrame (text + runs + paragraph formats) once, so a
+failed attempt can be rolled back in memory instead of closing and reopening
+the backup file.
+
+Operations that cannot be inverted (slide/shape creation and deletion,
+grouping, z-order, ...) mark the journal as non-invertible; the caller then
+falls back to the file-based rollback.
+"""
+import logging
+
+from editppt.tools.tools import FUNCTION_MAP, _apply_font_snapshot
+from editppt.utils.utils import extract_runs_from_com_runs, extract_runs_per_character
+
+logger = logging.getLogger(__name__)
+
+
+# FUNCTION_MAP tools that only set properties / replace text → undo journal is enough
+INVERTIBLE_TOOLS = frozenset({
+    "set_text_style_preserve_runs",
+    "replace_shape_text",
+    "set_paragraph_alignment",
+    "manage_bullet_points",
+    "adjust_layout",
+    "distribute_shapes",
+    "align_shapes",
+    "arrange_grid",
+    "match_size",
+    "apply_visual_style",
+})
+
+# EditAgent decides the DeckLock mode / backup refresh from this set, so it must name real tools
+if not INVERTIBLE_TOOLS <= FUNCTION_MAP.keys():
+    raise ValueError(f"INVERTIBLE_TOOLS not in FUNCTION_MAP: {sorted(INVERTIBLE_TOOLS - FUNCTION_MAP.keys())}")
+
+# Methods that only return another object (no side effect)
+READONLY_METHODS = {
+    "Item", "Characters", "Paragraphs", "Runs", "Lines", "Words", "Sentences",
+    "Cell", "Range", "ActionSettings", "Slides", "Shapes",
+}
+
+# TextRange methods that change text → covered by the text snapshot
+TEXT_MUTATING_METHODS = {"InsertAfter", "InsertBefore", "Delete", "Replace"}
+
+# Children of a TextRange whose writes are covered by the text snapshot
+PARAGRAPH_FORMAT_PROPS = (
+    "Alignment", "SpaceBefore", "SpaceAfter", "SpaceWithin", "LineRuleWithin",
+)
+BULLET_PROPS = ("Visible", "Type", "Character", "Style", "RelativeSize", "StartValue")
+FONT_PROPS = ("Name", "Size", "Bold", "Italic", "Underline", "Strikethrough", "Subscript", "Superscript")
+
+# attribute path from the TextRange → properties _TextSnapshot.undo() restores.
+# Writes to anything else under a TextRange (Font.Shadow, Bullet.Font.Name, ...)
+# are recorded as plain property writes as well.
+TEXT_SNAPSHOT_PROPS = {
+    (): {"Text", "IndentLevel"},
+    ("Font",): set(FONT_PROPS),
+    ("Font", "Color"): {"RGB"},
+    ("ParagraphFormat",): set(PARAGRAPH_FORMAT_PROPS),
+    ("ParagraphFormat", "Bullet"): set(BULLET_PROPS),
+}
+
+PRIMITIVE_TYPES = (int, float, str, bool, bytes, tuple, type(None))
+
+
+class NotInvertibleError(RuntimeError):
+    pass
+
+
+class ClosedJournalError(RuntimeError):
+    """A proxy of an attempt that already ended (cleared / undone) was used to modify the deck."""
+
+
+def _read_paragraph_formats(text_range):
+    paragraphs = []
+    count = text_range.Paragraphs().Count
+    for i in range(1, count + 1):
+        para = text_range.Paragraphs(i)
+        pf = para.ParagraphFormat
+        bullet = pf.Bullet
+        paragraphs.append({
+            "IndentLevel": para.IndentLevel,
+            "ParagraphFormat": {p: getattr(pf, p) for p in PARAGRAPH_FORMAT_PROPS},
+            "Bullet": {p: getattr(bullet, p) for p in BULLET_PROPS},
+        })
+    return paragraphs
+
+
+class _PropertyWrite:
+    def __init__(self, obj, attr, old_value):
+        self.obj = obj
+        self.attr = attr
+        self.old_value = old_value
+
+    def undo(self):
+        setattr(self.obj, self.attr, self.old_value)
+
+
+class _TextSnapshot:
+    """Full state of one TextFrame's text before its first mutation."""
+
+    def __init__(self, text_frame):
+        # TextRange는 매번 TextFrame에서 새로 얻는다 (텍스트 변경 후에도 전체 범위를 가리키도록)
+        self.text_frame = text_frame
+        text_range = text_frame.TextRange
+        self.text = text_range.Text or ""
+        n = len(self.text)
+        self.runs = []
+        if n:
+            self.runs = extract_runs_from_com_runs(text_range, n)
+            if self.runs is None:
+                self.runs = extract_runs_per_character(text_range, n)
+        self.paragraphs = _read_paragraph_formats(text_range) if n else []
+
+    def undo(self):
+        tr = self.text_frame.TextRange
+        if (tr.Text or "") != self.text:
+            tr.Text = self.text
+            tr = self.text_frame.TextRange
+
+        for run in self.runs:
+            length = len(run.get("Text", ""))
+            if length and run.get("Font"):
+                _apply_font_snapshot(
+                    tr.Characters(run["Run_Start_Index"] + 1, length).Font,
+                    run["Font"],
+                )
+
+        for i, para in enumerate(self.paragraphs, start=1):
+            current = tr.Paragraphs(i)
+            current.IndentLevel = para["IndentLevel"]
+            pf = current.ParagraphFormat
+            for prop, value in para["ParagraphFormat"].items():
+                setattr(pf, prop, value)
+            bullet = pf.Bullet
+            bullet.Visible = para["Bullet"]["Visible"]
+            if not para["Bullet"]["Visible"]:
+                continue
+            for prop, value in para["Bullet"].items():
+                if prop == "Visible":
+                    continue
+                try:
+                    setattr(bullet, prop, value)
+                except Exception:
+                    # Character/Style는 Bullet.Type에 따라 쓸 수 없는 경우가 있음
+                    pass
+
+
+class EditJournal:
+    """
+    Records inverse operations for one attempt of EditAgent.run.
+
+    begin() → tools run against wrap(prs) → undo() or clear()
+    undo()/clear() close the journal: its proxies can no longer modify the deck,
+    so a shape wrapper cached past its attempt fails instead of recording into
+    a journal nobody will undo.
+    """
+
+    def __init__(self):
+        self.begin()
+
+    def begin(self):
+        self.entries = []
+        self.invertible = True
+        self._snapshotted = []
+        self.closed = False
+
+    def clear(self):
+        self.begin()
+        self.closed = True
+
+    def check_open(self):
+        if self.closed:
+            raise ClosedJournalError("Deck modified through a proxy of a finished attempt.")
+
+    def wrap(self, com_object):
+        return JournaledCOM(com_object, self)
+
+    def can_undo(self) -> bool:
+        return self.invertible
+
+    def record_write(self, obj, attr):
+        try:
+            old_value = getattr(obj, attr)
+        except Exception as e:
+            self.mark_not_invertible(f"cannot read {attr} before write: {e}")
+            return
+        self.entries.append(_PropertyWrite(obj, attr, old_value))
+
+    def record_known(self, obj, attr, old_value):
+        """record_write() for a value the caller has already read (no read-before-write COM call)."""
+        self.entries.append(_PropertyWrite(obj, attr, old_value))
+
+    def record_text(self, text_frame):
+        # win32com은 접근할 때마다 새 wrapper를 돌려주므로 id()가 아니라 밑의 COM 객체로 비교한다
+        # (PyIDispatch의 ==는 같은 COM 객체인지 본다)
+        key = getattr(text_frame, "_oleobj_", None) or text_frame
+        if key in self._snapshotted:
+            return
+        try:
+            snapshot = _TextSnapshot(text_frame)
+        except Exception as e:
+            self.mark_not_invertible(f"cannot snapshot text: {e}")
+            return
+        self._snapshotted.append(key)
+        self.entries.append(snapshot)
+
+    def mark_not_invertible(self, reason: str):
+        if self.invertible:
+            logger.info(f"Undo journal disabled for this attempt: {reason}")
+        self.invertible = False
+
+    def undo(self):
+        """Replay inverse operations newest-first. Raises NotInvertibleError if not possible."""
+        if not self.invertible:
+            raise NotInvertibleError("Journal contains operations that cannot be inverted.")
+        for entry in reversed(self.entries):
+            entry.undo()
+        self.clear()
+
+
+def set_known(obj, attr, value, old_value):
+    """
+    Writes obj.attr = value when the caller already holds the current value
+    (e.g. tools/geometry.py snapshots). Journaled objects record old_value
+    directly instead of reading it back through COM.
+    """
+    if isinstance(obj, JournaledCOM) and obj._text_root is None:
+        raw = object.__getattribute__(obj, "_obj")
+        obj._journal.check_open()
+        obj._journal.record_known(raw, attr, old_value)
+        setattr(raw, attr, _unwrap(value))
+    else:
+        setattr(obj, attr, value)
+
+
+def _unwrap(value):
+    if isinstance(value, JournaledCOM):
+        return object.__getattribute__(value, "_obj")
+    if isinstance(value, list):
+        return [_unwrap(v) for v in value]
+    return value
+
+
+class JournaledCOM:
+    """
+    Transparent proxy over a COM object. Reads pass through; writes and
+    mutating method calls are recorded in the EditJournal first.
+    text_root: the TextFrame whose TextRange this object was derived from, if any.
+    text_path: attribute names from that TextRange to this object (("ParagraphFormat", "Bullet"), ...)
+    """
+
+    def __init__(self, obj, journal, text_root=None, text_path=()):
+        object.__setattr__(self, "_obj", obj)
+        object.__setattr__(self, "_journal", journal)
+        object.__setattr__(self, "_text_root", text_root)
+        object.__setattr__(self, "_text_path", text_path)
+
+    def _wrap_child(self, value, name=None):
+        if isinstance(value, PRIMITIVE_TYPES):
+            return value
+        text_root = self._text_root
+        if text_root is None:
+            if name == "TextRange":
+                text_root = self._obj
+            return JournaledCOM(value, self._journal, text_root)
+        # 메서드/컬렉션 호출 결과(Characters(), Paragraphs(i), InsertAfter() ...)는 다시 TextRange
+        text_path = self._text_path + (name,) if name else ()
+        return JournaledCOM(value, self._journal, text_root, text_path)
+
+    def __getattr__(self, name):
+        value = getattr(self._obj, name)
+        if callable(value) and not hasattr(value, "_oleobj_"):
+            return self._wrap_method(name, value)
+        return self._wrap_child(value, name)
+
+    def __setattr__(self, name, value):
+        journal = self._journal
+        journal.check_open()
+        if self._text_root is not None:
+            journal.record_text(self._text_root)
+            if name not in TEXT_SNAPSHOT_PROPS.get(self._text_path, ()):
+                # text snapshot이 되돌리지 않는 속성
+                journal.record_write(self._obj, name)
+        else:
+            journal.record_write(self._obj, name)
+        setattr(self._obj, name, _unwrap(value))
+
+    def _wrap_method(self, name, method):
+        def call(*args, **kwargs):
+            journal = self._journal
+            if name not in READONLY_METHODS:
+                journal.check_open()
+            if name in TEXT_MUTATING_METHODS and self._text_root is not None:
+                journal.record_text(self._text_root)
+            elif name not in READONLY_METHODS:
+                journal.mark_not_invertible(f"{name}() has no inverse")
+            result = method(*_unwrap(list(args)), **{k: _unwrap(v) for k, v in kwargs.items()})
+            return self._wrap_child(result)
+        return call
+
+    def __call__(self, *args):
+        # COM 컬렉션 기본 메서드 (Slides(1), Paragraphs(2) 등) → 읽기 전용
+        return self._wrap_child(self._obj(*_unwrap(list(args))))
+
+    def __iter__(self):
+        for item in self._obj:
+            yield self._wrap_child(item)
+
+    def __len__(self):
+        return len(self._obj)
+
+    def __bool__(self):
+        return True
+
+    def __eq__(self, other):
+        return self._obj == _unwrap(other)
+
+    def __hash__(self):
+        return hash(self._obj)
@@ -3,6 +3,9 @@ import re
 import time
 import os
 
+from editppt.tools import geometry
+from editppt.tools.geometry import BoxSet
+
 import logging
 logger = logging.getLogger(__name__)
 
@@ -20,18 +23,86 @@ def _hex_to_rgb_int(hex_str):
     return (b << 16) | (g << 8) | r
 
 
-def _find_shape_by_id(prs, slide_number, shape_id):
-    """Finds a specific Shape object by its unique ID on a given slide."""
+# --- Shape-ID Index ---
+# slide_number -> {Shape_Id: shape}. 한 번의 slide.Shapes 순회로 만들고,
+# shape을 추가/삭제/그룹/그룹해제하는 tool과 파일 rollback 시 무효화한다.
+# index에는 undo journal proxy를 벗긴 COM 객체를 두고, 찾을 때 호출한 prs의
+# journal에 다시 묶는다 (index가 만들어진 시도의 journal에 기록되지 않도록).
+_SHAPE_INDEX = {}
+# tools/batch.py가 배치 실행 동안 채우는 (slide_number, Shape_Id) -> 이미 찾은 shape
+_RESOLVED = {}
+
+
+def invalidate_shape_index(slide_number=None):
+    """Drops the cached index of one slide, or of every slide if slide_number is None."""
+    if slide_number is None:
+        _SHAPE_INDEX.clear()
+        _RESOLVED.clear()
+    else:
+        _SHAPE_INDEX.pop(slide_number, None)
+        for key in [k for k in _RESOLVED if k[0] == slide_number]:
+            del _RESOLVED[key]
+
+
+def _com_object(obj):
+    from editppt.tools.journal import _unwrap
+    return _unwrap(obj)
+
+
+def _bind_to(prs, obj):
+    """prs가 JournaledCOM이면 obj도 같은 journal로 감싼다."""
+    from editppt.tools.journal import JournaledCOM
+    if isinstance(prs, JournaledCOM):
+        return prs._wrap_child(obj)
+    return obj
+
+
+def _build_shape_index(prs, slide_number):
     try:
         slide = prs.Slides(slide_number)
-        for shape in slide.Shapes:
-            if shape.Id == shape_id:
-                return shape
+        index = {shape.Id: _com_object(shape) for shape in slide.Shapes}
     except Exception as e:
         raise ValueError(f"Error accessing slide {slide_number}: {e}")
+    _SHAPE_INDEX[slide_number] = index
+    return index
+
+
+def _find_shape_by_id(prs, slide_number, shape_id):
+    """Finds a specific Shape object by its unique ID on a given slide."""
+    resolved = _RESOLVED.get((slide_number, shape_id))
+    if resolved is not None:
+        return _bind_to(prs, _com_object(resolved))
+    index = _SHAPE_INDEX.get(slide_number)
+    if index is None or shape_id not in index:
+        # 캐시가 없거나 외부에서 shape이 추가된 경우 → 한 번만 재구성
+        index = _build_shape_index(prs, slide_number)
+    if shape_id in index:
+        return _bind_to(prs, index[shape_id])
     raise ValueError(f"Shape with ID {shape_id} not found on slide {slide_number}.")
 
 
+def resolve_shapes(prs, slide_number, shape_ids) -> dict:
+    """
+    배치 실행 전에 shape들을 한 번에 찾아 둔다 (release_resolved_shapes()까지 재사용).
+    없는 Shape_Id는 건너뛴다 (해당 tool이 실행될 때 오류로 보고).
+
+    Returns:
+        {Shape_Id: shape}
+    """
+    found = {}
+    for shape_id in shape_ids:
+        try:
+            found[shape_id] = _find_shape_by_id(prs, slide_number, shape_id)
+        except ValueError:
+            continue
+        _RESOLVED[(slide_number, shape_id)] = found[shape_id]
+    return found
+
+
+def release_resolved_shapes():
+    _RESOLVED.clear()
+
+
 
 
 def _get_text_runs_from_shape(shape):
@@ -274,7 +345,7 @@ def set_text_style_preserve_runs(
 
 #This tool uses Additional LLM
 from editppt.utils.llm_client import call_llm
-from editppt.utils.logger_manual import log_path
+from editppt.utils.jsonl_log import get_writer
 from editppt.utils.utils import parse_llm_response, build_paragraph_ir_from_textframe
 from editppt.prompts import FLATTEXT_STYLE_MAPPING_PROMPT, PARAGRAPH_STYLE_MAPPING_PROMPT
 from editppt.utils.msoffice_map import BULLET_CHAR_MAP, BULLET_STYLE_MAP
@@ -282,27 +353,79 @@ from editppt.utils.msoffice_map import BULLET_CHAR_MAP, BULLET_STYLE_MAP
 REVERSE_CHAR_MAP = {v[0]: k for k, v in BULLET_CHAR_MAP.items()}
 REVERSE_STYLE_MAP = {v[0]: k for k, v in BULLET_STYLE_MAP.items()}
 
-def replace_shape_text(
-    prs,
-    slide_number,
-    shape_id,
-    new_text,
-    slide_json,
-    agent_request,
-    *,
-    container="shape",
-    row_index=None,
-    col_index=None,
-):
+def fit_text_to_height(tr, max_height, *, max_size=None, min_size=9.0, tolerance=0.5):
     """
-    Replace the text of a PowerPoint shape while preserving run-level styles.
-    Supports paragraph-aware bullet preservation.
-    If text overflows after replacement, shrink font sizes proportionally.
+    Shrinks text so that tr.BoundHeight <= max_height, keeping run-level size ratios.
+
+    Bisects the size of the largest run over [min_size, upper] down to
+    `tolerance` pt. Each layout probe applies the proportional scale per run
+    (not per character) and reads BoundHeight once.
+
+    Args:
+        max_size: upper bound for the largest run size (e.g. original base size)
+    Returns:
+        {"font_scale", "font_size", "probes"}
+    """
+    result = {"font_scale": 1.0, "font_size": None, "probes": 0}
+    if not tr.Length:
+        return result
+
+    # run 단위 (Font, size) 1회 수집
+    runs = []
+    run_count = tr.Runs().Count
+    for k in range(1, run_count + 1):
+        font = tr.Runs(k).Font
+        size = font.Size
+        if size and size > 0:
+            runs.append((font, size))
+    if not runs:
+        return result
+
+    largest = max(size for _, size in runs)
+    upper = min(largest, max_size) if max_size else largest
+    applied = largest
+
+    def apply(target):
+        nonlocal applied
+        if target != applied:
+            for font, size in runs:
+                font.Size = round(size * target / largest, 1)
+            applied = target
+
+    def fits(target):
+        result["probes"] += 1
+        apply(target)
+        return tr.BoundHeight <= max_height
+
+    if upper <= min_size or fits(upper):
+        best = upper
+    elif not fits(min_size):
+        best = min_size
+    else:
+        lo, hi = min_size, upper
+        while hi - lo > tolerance:
+            mid = (lo + hi) / 2
+            if fits(mid):
+                lo = mid
+            else:
+                hi = mid
+        best = lo
+
+    apply(best)
+    result.update({"font_scale": best / largest, "font_size": round(best, 1)})
+    return result
+
+
+def request_style_mapping(slide_json, shape_id, new_text, agent_request):
+    """
+    Style-mapping LLM call of replace_shape_text (new text → runs / paragraphs with fonts).
+    Reads only slide_json, no COM, so EditAgent runs it before the COM section
+    and passes the result as replace_shape_text(style_mapping=...).
     """
     if new_text and isinstance(new_text, str):
             new_text = new_text.replace('\n', '\r')
     # ------------------------------------------------------------------
-    # 1. Load old info from JSON
+    # Load old info from JSON
     # ------------------------------------------------------------------
     old_runs = _get_detail_from_json(
         slide_json, shape_id, ["More_detail", "Text", "TextFrame", "Runs"]
@@ -347,36 +470,7 @@ def replace_shape_text(
         
 
     # ------------------------------------------------------------------
-    # 2. Extract base font size (upper bound for shrink)
-    # ------------------------------------------------------------------
-    sizes = [
-        run.get("Font", {}).get("Size")
-        for run in old_runs
-        if run.get("Font", {}).get("Size")
-    ]
-    old_base_font_size = max(sizes) if sizes else None
-    
-
-    # ------------------------------------------------------------------
-    # 3. Resolve slide / shape / TextRange
-    # ------------------------------------------------------------------
-    slide = prs.Slides(slide_number)
-    shape = next((s for s in slide.Shapes if s.Id == shape_id), None)
-    if not shape:
-        raise ValueError(f"Shape {shape_id} not found in slide {slide_number}")
-
-    tr = (
-        shape.TextFrame.TextRange
-        if container == "shape"
-        else shape.Table.Cell(row_index, col_index).Shape.TextFrame.TextRange
-    )
-    # ------------------------------------------------------------------
-    # +Extract shape height (upper bound for shrink)
-    # ------------------------------------------------------------------
-    original_height = shape.Height
-
-    # ------------------------------------------------------------------
-    # 4. LLM call (mode split)
+    # LLM call (mode split)
     # ------------------------------------------------------------------
     task_description, action_type, slide_contents = agent_request
     is_paragraph_mode = len(paragraph_ir) > 1
@@ -420,37 +514,89 @@ def replace_shape_text(
             },
         ]
 
-    raw_response = call_llm(model="gpt-4.1", messages=llm_prompt)
+    raw_response = call_llm(model="gpt-4.1", messages=llm_prompt, stage="style_mapping")
     response_text = raw_response.output[0].content[0].text
     parsed = parse_llm_response(response_text)
     if isinstance(parsed, tuple):
         parsed = parsed[0]
     
-    # 로그 누적
-    log_file = log_path("style_mapping_llm_prompt.json")
-
-    if os.path.exists(log_file):
-        with open(log_file, "r", encoding="utf-8") as f:
-            try:
-                logs = json.load(f)
-            except json.JSONDecodeError:
-                logs = []
-    else:
-        logs = []
-
-    # 새 로그 항목
-    new_log = {
+    # 로그 누적 (append-only, 기존 로그를 다시 읽지 않음)
+    get_writer("style_mapping_llm_prompt.jsonl").append({
         "llm_prompt": llm_prompt,
         "is_paragraph_mode": is_paragraph_mode,
         "paragraph_ir_len": len(paragraph_ir),
         "response_text": response_text,
         "parsed": parsed
-    }
+    })
+
+    return parsed
+
+
+def replace_shape_text(
+    prs,
+    slide_number,
+    shape_id,
+    new_text,
+    slide_json,
+    agent_request,
+    *,
+    container="shape",
+    row_index=None,
+    col_index=None,
+    style_mapping=None,
+):
+    """
+    Replace the text of a PowerPoint shape while preserving run-level styles.
+    Supports paragraph-aware bullet preservation.
+    If text overflows after replacement, shrink font sizes proportionally.
+    """
+    if new_text and isinstance(new_text, str):
+            new_text = new_text.replace('\n', '\r')
+    # ------------------------------------------------------------------
+    # 1. Load old info from JSON
+    # ------------------------------------------------------------------
+    old_runs = _get_detail_from_json(
+        slide_json, shape_id, ["More_detail", "Text", "TextFrame", "Runs"]
+    )
+    old_paragraphs = _get_detail_from_json(
+        slide_json, shape_id, ["More_detail", "Text", "TextFrame", "Paragraphs"]
+    )
+    paragraph_ir = build_paragraph_ir_from_textframe(old_runs, old_paragraphs)
 
-    logs.append(new_log)
+    # ------------------------------------------------------------------
+    # 2. Extract base font size (upper bound for shrink)
+    # ------------------------------------------------------------------
+    sizes = [
+        run.get("Font", {}).get("Size")
+        for run in old_runs
+        if run.get("Font", {}).get("Size")
+    ]
+    old_base_font_size = max(sizes) if sizes else None
+    
 
-    with open(log_file, "w", encoding="utf-8") as f:
-        json.dump(logs, f, ensure_ascii=False, indent=2)
+    # ------------------------------------------------------------------
+    # 3. Resolve slide / shape / TextRange
+    # ------------------------------------------------------------------
+    shape = _find_shape_by_id(prs, slide_number, shape_id)
+
+    tr = (
+        shape.TextFrame.TextRange
+        if container == "shape"
+        else shape.Table.Cell(row_index, col_index).Shape.TextFrame.TextRange
+    )
+    # ------------------------------------------------------------------
+    # +Extract shape height (upper bound for shrink)
+    # ------------------------------------------------------------------
+    original_height = shape.Height
+
+    # ------------------------------------------------------------------
+    # 4. Style mapping (EditAgent가 COM 구간 밖에서 미리 받아 두면 그 결과 사용)
+    # ------------------------------------------------------------------
+    is_paragraph_mode = len(paragraph_ir) > 1
+    if style_mapping is not None:
+        parsed = style_mapping
+    else:
+        parsed = request_style_mapping(slide_json, shape_id, new_text, agent_request)
 
     new_runs = parsed        
     if is_paragraph_mode:
@@ -619,28 +765,15 @@ def replace_shape_text(
                 pf.Bullet.Type = 0     # msoBulletNone
 
     new_tr = tf.TextRange
-    current_size = new_tr.Font.Size
+    autofit = fit_text_to_height(new_tr, original_height, max_size=old_base_font_size)
 
-    if old_base_font_size:
-        current_size = min(current_size, old_base_font_size)
-                
-    while new_tr.BoundHeight > original_height and current_size > 9.0:
-        current_size -= 0.5
-        new_tr.Font.Size = current_size
-    
-    scale = current_size / new_tr.Font.Size if new_tr.Font.Size else 1.0
-    if new_tr.Length > 0:
-        for i in range(1, new_tr.Length + 1):
-            ch = new_tr.Characters(i, 1)
-            if ch.Font.Size:
-                ch.Font.Size *= scale
-            
-        return {
-            "operation": "replace_shape_text",
-            "slide": slide_number,
-            "shape_id": shape_id,
-            "paragraph_mode": is_paragraph_mode,
-        }
+    return {
+        "operation": "replace_shape_text",
+        "slide": slide_number,
+        "shape_id": shape_id,
+        "paragraph_mode": is_paragraph_mode,
+        "autofit": autofit,
+    }
 
     
     # ###13241341243
@@ -866,38 +999,9 @@ def distribute_shapes(prs, slide_number, shape_ids, direction="horizontal",
     if len(shapes) < 2:
         return "Need at least 2 shapes to distribute."
     
-    if direction == "horizontal":
-        shapes.sort(key=lambda s: s.Left)
-        if spacing:
-            for i in range(1, len(shapes)):
-                shapes[i].Left = shapes[i-1].Left + shapes[i-1].Width + spacing
-        else:
-            total_width = sum(s.Width for s in shapes)
-            start = shapes[0].Left
-            end = shapes[-1].Left + shapes[-1].Width
-            available = end - start - total_width
-            gap = available / (len(shapes) - 1) if len(shapes) > 1 else 0
-            
-            current_left = start
-            for shape in shapes:
-                shape.Left = current_left
-                current_left += shape.Width + gap
-    else:  # vertical
-        shapes.sort(key=lambda s: s.Top)
-        if spacing:
-            for i in range(1, len(shapes)):
-                shapes[i].Top = shapes[i-1].Top + shapes[i-1].Height + spacing
-        else:
-            total_height = sum(s.Height for s in shapes)
-            start = shapes[0].Top
-            end = shapes[-1].Top + shapes[-1].Height
-            available = end - start - total_height
-            gap = available / (len(shapes) - 1) if len(shapes) > 1 else 0
-            
-            current_top = start
-            for shape in shapes:
-                shape.Top = current_top
-                current_top += shape.Height + gap
+    box_set = BoxSet(shapes, ("Left", "Width") if direction == "horizontal" else ("Top", "Height"))
+    box_set.boxes = geometry.distribute(box_set.boxes, direction, spacing)
+    box_set.commit()
     
     return f"Distributed {len(shapes)} shapes {direction}ly."
 
@@ -914,34 +1018,57 @@ def align_shapes(prs, slide_number, shape_ids, align_type="left"):
     if len(shapes) < 2:
         return "Need at least 2 shapes to align."
     
-    if align_type == "left":
-        left_most = min(s.Left for s in shapes)
-        for shape in shapes:
-            shape.Left = left_most
-    elif align_type == "right":
-        right_most = max(s.Left + s.Width for s in shapes)
-        for shape in shapes:
-            shape.Left = right_most - shape.Width
-    elif align_type == "top":
-        top_most = min(s.Top for s in shapes)
-        for shape in shapes:
-            shape.Top = top_most
-    elif align_type == "bottom":
-        bottom_most = max(s.Top + s.Height for s in shapes)
-        for shape in shapes:
-            shape.Top = bottom_most - shape.Height
-    elif align_type == "center_h":
-        avg_center = sum(s.Left + s.Width / 2 for s in shapes) / len(shapes)
-        for shape in shapes:
-            shape.Left = avg_center - shape.Width / 2
-    elif align_type == "center_v":
-        avg_center = sum(s.Top + s.Height / 2 for s in shapes) / len(shapes)
-        for shape in shapes:
-            shape.Top = avg_center - shape.Height / 2
+    if align_type in geometry.ALIGN_FIELDS:
+        box_set = BoxSet(shapes, geometry.ALIGN_FIELDS[align_type])
+        box_set.boxes = geometry.align(box_set.boxes, align_type)
+        box_set.commit()
     
     return f"Aligned {len(shapes)} shapes by {align_type}."
 
 
+def arrange_grid(prs, slide_number, shape_ids, columns, left=None, top=None,
+                 h_gap=10, v_gap=10):
+    """
+    Arranges shapes in a grid (in the given order, row by row).
+    Each cell is as large as the largest shape; shapes are centered in their cell.
+    
+    Args:
+        left, top: grid origin (default: top-left of the current shapes)
+        h_gap, v_gap: spacing between cells
+    """
+    shapes = [_find_shape_by_id(prs, slide_number, sid) for sid in shape_ids]
+    if not shapes:
+        return "No shapes to arrange."
+    
+    box_set = BoxSet(shapes)
+    box_set.boxes = geometry.grid(box_set.boxes, columns, left, top, h_gap, v_gap)
+    box_set.commit()
+    
+    rows = -(-len(shapes) // columns)
+    return f"Arranged {len(shapes)} shapes in a {rows}x{min(columns, len(shapes))} grid."
+
+
+def match_size(prs, slide_number, shape_ids, dimension="both", reference="largest"):
+    """
+    Makes shapes the same width and/or height (top-left corners stay in place).
+    
+    Args:
+        dimension: 'width', 'height' or 'both'
+        reference: 'largest', 'smallest' or 'first' (first shape in shape_ids)
+    """
+    shapes = [_find_shape_by_id(prs, slide_number, sid) for sid in shape_ids]
+    
+    if len(shapes) < 2:
+        return "Need at least 2 shapes to match size."
+    
+    fields = {"width": ("Width",), "height": ("Height",)}.get(dimension, ("Width", "Height"))
+    box_set = BoxSet(shapes, fields)
+    box_set.boxes = geometry.same_size(box_set.boxes, dimension, reference)
+    box_set.commit()
+    
+    return f"Matched {dimension} of {len(shapes)} shapes to the {reference}."
+
+
 # --- [D] Enhanced Object Lifecycle ---
 
 def manage_object(prs, slide_number, action, shape_id=None, shape_type=1, 
@@ -951,17 +1078,20 @@ def manage_object(prs, slide_number, action, shape_id=None, shape_type=1,
     
     if action == "add":
         new_shape = slide.Shapes.AddShape(shape_type, left, top, width, height)
+        invalidate_shape_index(slide_number)
         if text and new_shape.HasTextFrame:
             new_shape.TextFrame.TextRange.Text = text
         return f"Shape created successfully (ID: {new_shape.Id})."
     
     elif action == "delete" and shape_id:
         _find_shape_by_id(prs, slide_number, shape_id).Delete()
+        invalidate_shape_index(slide_number)
         return f"Shape {shape_id} deleted successfully."
     
     elif action == "duplicate" and shape_id:
         original = _find_shape_by_id(prs, slide_number, shape_id)
         duplicate = original.Duplicate()
+        invalidate_shape_index(slide_number)
         duplicate.Left += 20  # Offset slightly
         duplicate.Top += 20
         return f"Shape {shape_id} duplicated (New ID: {duplicate.Id})."
@@ -973,6 +1103,7 @@ def add_textbox(prs, slide_number, left, top, width, height, text=""):
     """Creates a new textbox with specified text."""
     slide = prs.Slides(slide_number)
     textbox = slide.Shapes.AddTextbox(1, left, top, width, height)  # msoTextOrientationHorizontal
+    invalidate_shape_index(slide_number)
     if text:
         textbox.TextFrame.TextRange.Text = text
     return f"Textbox created (ID: {textbox.Id})."
@@ -986,6 +1117,7 @@ def add_image(prs, slide_number, image_path, left, top, width=None, height=None)
         picture = slide.Shapes.AddPicture(image_path, False, True, left, top, width, height)
     else:
         picture = slide.Shapes.AddPicture(image_path, False, True, left, top)
+    invalidate_shape_index(slide_number)
     
     return f"Image inserted (ID: {picture.Id})."
 
@@ -998,6 +1130,7 @@ def group_shapes(prs, slide_number, shape_ids):
     # Create shape range
     shape_range = slide.Shapes.Range([s.Id for s in shapes])
     grouped = shape_range.Group()
+    invalidate_shape_index(slide_number)
     
     return f"Grouped {len(shape_ids)} shapes (Group ID: {grouped.Id})."
 
@@ -1006,6 +1139,7 @@ def ungroup_shapes(prs, slide_number, group_id):
     """Ungroups a grouped shape."""
     group = _find_shape_by_id(prs, slide_number, group_id)
     ungrouped = group.Ungroup()
+    invalidate_shape_index(slide_number)
     
     return f"Ungrouped shape {group_id} into {ungrouped.Count} shapes."
 
@@ -1119,21 +1253,12 @@ def align_to_object(prs, slide_number, target_id, base_id, side="right", margin=
     target = _find_shape_by_id(prs, slide_number, target_id)
     base = _find_shape_by_id(prs, slide_number, base_id)
     
-    if side == "right":
-        target.Left = base.Left + base.Width + margin
-        target.Top = base.Top
-    elif side == "left":
-        target.Left = base.Left - target.Width - margin
-        target.Top = base.Top
-    elif side == "bottom":
-        target.Left = base.Left
-        target.Top = base.Top + base.Height + margin
-    elif side == "top":
-        target.Left = base.Left
-        target.Top = base.Top - target.Height - margin
-    elif side == "center":
-        target.Left = base.Left + (base.Width - target.Width) / 2
-        target.Top = base.Top + (base.Height - target.Height) / 2
+    if side in geometry.SIDE_FIELDS:
+        base_fields, target_fields = geometry.SIDE_FIELDS[side]
+        base_box = BoxSet([base], base_fields).boxes[0]
+        box_set = BoxSet([target], target_fields)
+        box_set.boxes[0] = geometry.place_relative(box_set.boxes[0], base_box, side, margin)
+        box_set.commit()
         
     return f"Aligned {target_id} to the {side} of {base_id}."
 
@@ -1204,6 +1329,7 @@ def add_slide(prs, layout_index=1, position=None):
         new_slide = prs.Slides.AddSlide(position, layout)
     else:
         new_slide = prs.Slides.Add(prs.Slides.Count + 1, layout)
+    invalidate_shape_index()
     
     return f"Slide added at position {new_slide.SlideIndex}."
 
@@ -1211,6 +1337,7 @@ def add_slide(prs, layout_index=1, position=None):
 def delete_slide(prs, slide_number):
     """Deletes a specific slide."""
     prs.Slides(slide_number).Delete()
+    invalidate_shape_index()
     return f"Slide {slide_number} deleted."
 
 
@@ -1218,6 +1345,7 @@ def duplicate_slide(prs, slide_number):
     """Duplicates a specific slide."""
     original = prs.Slides(slide_number)
     duplicate = original.Duplicate()
+    invalidate_shape_index()
     return f"Slide {slide_number} duplicated to position {duplicate.SlideIndex}."
 
 
@@ -1227,6 +1355,7 @@ def add_table(prs, slide_number, rows, cols, left, top, width, height):
     """Creates a table on the slide."""
     slide = prs.Slides(slide_number)
     table = slide.Shapes.AddTable(rows, cols, left, top, width, height)
+    invalidate_shape_index(slide_number)
     return f"Table created (ID: {table.Id}, {rows}x{cols})."
 
 
@@ -1329,6 +1458,8 @@ FUNCTION_MAP = {
     "adjust_layout": adjust_layout,
     "distribute_shapes": distribute_shapes,
     "align_shapes": align_shapes,
+    "arrange_grid": arrange_grid,
+    "match_size": match_size,
     "manage_object": manage_object,
     "add_textbox": add_textbox,
     "apply_visual_style": apply_visual_style,
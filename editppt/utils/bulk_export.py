@@ -0,0 +1,482 @@
+# bulk_export.py
+"""
+Optional bulk-export parse backend.
+
+parse_active_slide_objects()는 shape마다 Id/Name/Type/Left/... 와 text run을
+속성 단위로 읽는다 (속성 1개 = cross-process IDispatch 호출 1회).
+이 backend는 숨겨진 helper presentation에 VBA 모듈을 넣고
+Application.Run 한 번으로 슬라이드 전체(geometry + text + run + 문단)를
+문자열 payload로 받아 Python에서 decode한다.
+
+- VBA 프로젝트 접근 권한 필요 (prompts.ACCESS_TO_VBA_PROJECT 참고)
+- 설치/실행 실패 시 available=False → 기존 속성 단위 파싱으로 fallback
+- Group / Picture / Chart / Table 상세 정보와 run 경계가 어긋난 text frame은
+  shape 단위로 기존 방식을 사용한다
+
+Payload format (control characters never appear in slide text in practice):
+    shapes     : RS (chr 30) separated
+    shape      : FS (chr 31) separated
+                 Id, Name, Type, Left, Top, Width, Height,
+                 HasTextFrame, HasText, Text, Hyperlink, runs, paragraphs
+    runs       : SS (chr 29) separated, fields US (chr 28) separated
+                 Start, Length, Font.Name, Font.Size, Bold, Italic, Underline,
+                 Subscript, Superscript, Font.Color.RGB, Hyperlink
+    paragraphs : SS separated, fields US separated
+                 Text, Bullet.Visible, Bullet.Type, Bullet.Style,
+                 Bullet.Character, Bullet.RelativeSize, IndentLevel,
+                 ListFormat.ListString (numbered label as rendered; empty → format fallback)
+"""
+from loguru import logger
+
+from editppt.utils.msoffice_map import BULLET_STYLE_MAP, BULLET_CHAR_MAP
+
+
+RS, FS, SS, US = chr(30), chr(31), chr(29), chr(28)
+
+SHAPE_FIELDS = 13
+RUN_FIELDS = 11
+PARAGRAPH_FIELDS = 8
+
+MACRO_MODULE = "EditPPTBulkExport"
+MACRO_NAME = "ExportSlide"
+
+BULK_EXPORT_VBA = r'''
+Private Function Num(v As Variant) As String
+    If IsNull(v) Or IsEmpty(v) Then
+        Num = ""
+    Else
+        Num = Trim(Str(CDbl(v)))
+    End If
+End Function
+
+Public Function ExportSlide(sld As Object) As String
+    Dim n As Long, i As Long
+    n = sld.Shapes.Count
+    If n = 0 Then
+        ExportSlide = ""
+        Exit Function
+    End If
+    Dim out() As String
+    ReDim out(1 To n)
+    For i = 1 To n
+        out(i) = ExportShape(sld.Shapes(i))
+    Next i
+    ExportSlide = Join(out, Chr(30))
+End Function
+
+Private Function ExportShape(shp As Object) As String
+    On Error Resume Next
+    Dim f(0 To 12) As String
+    Dim hasTf As Boolean, hasText As Boolean
+    Dim tr As Object
+    f(0) = Num(shp.Id): f(1) = shp.Name: f(2) = Num(shp.Type)
+    f(3) = Num(shp.Left): f(4) = Num(shp.Top): f(5) = Num(shp.Width): f(6) = Num(shp.Height)
+    f(7) = "0": f(8) = "0"
+    hasTf = False: hasTf = shp.HasTextFrame
+    If hasTf Then
+        f(7) = "1"
+        hasText = False: hasText = shp.TextFrame.HasText
+        If hasText Then
+            f(8) = "1"
+            Set tr = shp.TextFrame.TextRange
+            f(9) = tr.Text
+            f(10) = tr.ActionSettings(1).Hyperlink.Address
+            f(11) = ExportRuns(tr)
+            f(12) = ExportParagraphs(tr)
+        End If
+    End If
+    ExportShape = Join(f, Chr(31))
+End Function
+
+Private Function ExportRuns(tr As Object) As String
+    On Error Resume Next
+    Dim n As Long, k As Long, r As Object, fnt As Object
+    n = 0: n = tr.Runs.Count
+    If n = 0 Then Exit Function
+    Dim out() As String, g(0 To 10) As String
+    ReDim out(1 To n)
+    For k = 1 To n
+        Erase g
+        Set r = Nothing: Set r = tr.Runs(k)
+        Set fnt = Nothing: Set fnt = r.Font
+        g(0) = Num(r.Start): g(1) = Num(r.Length)
+        g(2) = fnt.Name: g(3) = Num(fnt.Size)
+        g(4) = Num(fnt.Bold): g(5) = Num(fnt.Italic): g(6) = Num(fnt.Underline)
+        g(7) = Num(fnt.Subscript): g(8) = Num(fnt.Superscript)
+        g(9) = Num(fnt.Color.RGB)
+        g(10) = r.ActionSettings(1).Hyperlink.Address
+        out(k) = Join(g, Chr(28))
+    Next k
+    ExportRuns = Join(out, Chr(29))
+End Function
+
+Private Function ExportParagraphs(tr As Object) As String
+    On Error Resume Next
+    Dim n As Long, i As Long, p As Object, b As Object
+    n = 0: n = tr.Paragraphs.Count
+    If n = 0 Then Exit Function
+    Dim out() As String, g(0 To 7) As String
+    ReDim out(1 To n)
+    For i = 1 To n
+        Erase g
+        Set p = Nothing: Set p = tr.Paragraphs(i)
+        Set b = Nothing: Set b = p.ParagraphFormat.Bullet
+        g(0) = p.Text
+        g(1) = Num(b.Visible): g(2) = Num(b.Type): g(3) = Num(b.Style)
+        g(4) = Num(b.Character): g(5) = Num(b.RelativeSize): g(6) = Num(p.IndentLevel)
+        If b.Type = 2 Then g(7) = p.ListFormat.ListString
+        out(i) = Join(g, Chr(28))
+    Next i
+    ExportParagraphs = Join(out, Chr(29))
+End Function
+'''
+
+
+# ---------------------------------------------------------------------------
+# Python twin of the macro (fake COM model / 동작 확인용)
+# ---------------------------------------------------------------------------
+def _num(getter) -> str:
+    try:
+        value = getter()
+    except Exception:
+        return ""
+    if value is None:
+        return ""
+    return repr(float(value))
+
+
+def _text(getter) -> str:
+    try:
+        return getter() or ""
+    except Exception:
+        return ""
+
+
+def _export_runs(tr) -> str:
+    try:
+        n = tr.Runs().Count
+    except Exception:
+        return ""
+    out = []
+    for k in range(1, n + 1):
+        r = tr.Runs(k)
+        font = r.Font
+        out.append(US.join([
+            _num(lambda: r.Start), _num(lambda: r.Length),
+            _text(lambda: font.Name), _num(lambda: font.Size),
+            _num(lambda: font.Bold), _num(lambda: font.Italic), _num(lambda: font.Underline),
+            _num(lambda: font.Subscript), _num(lambda: font.Superscript),
+            _num(lambda: font.Color.RGB),
+            _text(lambda: r.ActionSettings(1).Hyperlink.Address),
+        ]))
+    return SS.join(out)
+
+
+def _export_paragraphs(tr) -> str:
+    try:
+        n = tr.Paragraphs().Count
+    except Exception:
+        return ""
+    out = []
+    for i in range(1, n + 1):
+        p = tr.Paragraphs(i)
+        try:
+            bullet = p.ParagraphFormat.Bullet
+        except Exception:
+            bullet = None
+        b_type = _num(lambda: bullet.Type)
+        out.append(US.join([
+            _text(lambda: p.Text),
+            _num(lambda: bullet.Visible), b_type, _num(lambda: bullet.Style),
+            _num(lambda: bullet.Character), _num(lambda: bullet.RelativeSize),
+            _num(lambda: p.IndentLevel),
+            _text(lambda: p.ListFormat.ListString) if b_type == repr(2.0) else "",
+        ]))
+    return SS.join(out)
+
+
+def export_slide_payload(slide) -> str:
+    """BULK_EXPORT_VBA의 ExportSlide와 같은 payload를 만든다."""
+    shapes = slide.Shapes
+    out = []
+    for i in range(1, shapes.Count + 1):
+        shp = shapes(i)
+        f = [
+            _num(lambda: shp.Id), _text(lambda: shp.Name), _num(lambda: shp.Type),
+            _num(lambda: shp.Left), _num(lambda: shp.Top), _num(lambda: shp.Width), _num(lambda: shp.Height),
+            "0", "0", "", "", "", "",
+        ]
+        if shp.HasTextFrame:
+            f[7] = "1"
+            if shp.TextFrame.HasText:
+                f[8] = "1"
+                tr = shp.TextFrame.TextRange
+                f[9] = _text(lambda: tr.Text)
+                f[10] = _text(lambda: tr.ActionSettings(1).Hyperlink.Address)
+                f[11] = _export_runs(tr)
+                f[12] = _export_paragraphs(tr)
+        out.append(FS.join(f))
+    return RS.join(out)
+
+
+# ---------------------------------------------------------------------------
+# decode
+# ---------------------------------------------------------------------------
+def _to_float(value: str):
+    return float(value) if value != "" else None
+
+
+def _to_int(value: str):
+    return int(float(value)) if value != "" else None
+
+
+def decode_slide_payload(payload: str) -> list:
+    """
+    Returns:
+        [{"Id", "Name", "Type", "Left", "Top", "Width", "Height",
+          "HasTextFrame", "HasText", "Text", "Hyperlink", "Runs", "Paragraphs"}, ...]
+    Raises:
+        ValueError: payload 형식이 맞지 않을 때
+    """
+    if not payload:
+        return []
+    shapes = []
+    for record in payload.split(RS):
+        f = record.split(FS)
+        if len(f) != SHAPE_FIELDS:
+            raise ValueError(f"Bulk export: expected {SHAPE_FIELDS} shape fields, got {len(f)}")
+
+        runs = []
+        for run in f[11].split(SS) if f[11] else []:
+            g = run.split(US)
+            if len(g) != RUN_FIELDS:
+                raise ValueError(f"Bulk export: expected {RUN_FIELDS} run fields, got {len(g)}")
+            runs.append({
+                "Start": _to_int(g[0]), "Length": _to_int(g[1]),
+                "Name": g[2] or None, "Size": _to_float(g[3]),
+                "Bold": _to_int(g[4]), "Italic": _to_int(g[5]), "Underline": _to_int(g[6]),
+                "Subscript": _to_int(g[7]), "Superscript": _to_int(g[8]),
+                "RGB": _to_int(g[9]), "Hyperlink": g[10] or None,
+            })
+
+        paragraphs = []
+        for para in f[12].split(SS) if f[12] else []:
+            g = para.split(US)
+            if len(g) != PARAGRAPH_FIELDS:
+                raise ValueError(f"Bulk export: expected {PARAGRAPH_FIELDS} paragraph fields, got {len(g)}")
+            paragraphs.append({
+                "Text": g[0], "Visible": _to_int(g[1]), "Type": _to_int(g[2]), "Style": _to_int(g[3]),
+                "Character": _to_int(g[4]), "RelativeSize": _to_float(g[5]), "IndentLevel": _to_int(g[6]),
+                "ListString": g[7],
+            })
+
+        shapes.append({
+            "Id": _to_int(f[0]), "Name": f[1], "Type": _to_int(f[2]),
+            "Left": _to_float(f[3]), "Top": _to_float(f[4]),
+            "Width": _to_float(f[5]), "Height": _to_float(f[6]),
+            "HasTextFrame": f[7] == "1", "HasText": f[8] == "1",
+            "Text": f[9], "Hyperlink": f[10] or None,
+            "Runs": runs, "Paragraphs": paragraphs,
+        })
+    return shapes
+
+
+# ---------------------------------------------------------------------------
+# record → parse_active_slide_objects() schema
+# ---------------------------------------------------------------------------
+def _run_snap(run: dict) -> tuple:
+    """utils.snap()과 같은 비교 기준"""
+    return (
+        run["Name"],
+        round(run["Size"] or 0.0, 1),
+        bool(run["Bold"]), bool(run["Italic"]), bool(run["Underline"]),
+        run["RGB"],
+        False, bool(run["Subscript"]), bool(run["Superscript"]),
+    )
+
+
+def _run_dict(text: str, run: dict) -> dict:
+    """utils.make_run_dict()와 같은 구조"""
+    out = {"Text": text}
+    font = {}
+    if run["Name"] is not None:
+        font["Name"] = run["Name"]
+    if run["Size"] is not None:
+        font["Size"] = run["Size"]
+    for key in ("Bold", "Italic", "Underline", "Subscript", "Superscript"):
+        if run[key]:
+            font[key] = True
+    if run["RGB"] is not None:
+        rgb = run["RGB"]
+        font["Color"] = {"R": rgb & 0xFF, "G": (rgb >> 8) & 0xFF, "B": (rgb >> 16) & 0xFF}
+    if font:
+        out["Font"] = font
+    if run["Hyperlink"]:
+        out["Hyperlink"] = run["Hyperlink"]
+    return out
+
+
+def build_runs(record: dict):
+    """
+    Run 목록 (인접한 같은 서식 run은 병합, Run_Start_Index 포함).
+    run 경계가 전체 텍스트와 맞지 않으면 None → 호출 측에서 shape 단위 fallback.
+    """
+    full = record["Text"]
+    if not record["Runs"]:
+        return None
+
+    segments = []  # [start(1-based), length, run]
+    expected_start = 1
+    for run in record["Runs"]:
+        start, length = run["Start"], run["Length"]
+        if start != expected_start or not length or length <= 0:
+            return None
+        if segments and _run_snap(segments[-1][2]) == _run_snap(run):
+            segments[-1][1] += length
+        else:
+            segments.append([start, length, run])
+        expected_start = start + length
+
+    if expected_start - 1 != len(full):
+        return None
+
+    runs = []
+    for start, length, run in segments:
+        item = _run_dict(full[start - 1:start - 1 + length], run)
+        item["Run_Start_Index"] = start - 1
+        runs.append(item)
+    return runs
+
+
+def build_paragraphs(record: dict) -> list:
+    """utils.parse_paragraph_bullets()와 같은 구조"""
+    result = []
+    style_counters = {}
+    for i, para in enumerate(record["Paragraphs"], start=1):
+        p_text = para["Text"]
+        if not p_text.strip() and i > 1:
+            continue
+        # Bullet 자체를 읽지 못한 문단은 기존 방식처럼 건너뛴다
+        if para["Visible"] is None:
+            continue
+
+        is_visible = para["Visible"] != 0
+        b_type = para["Type"] if is_visible else 0
+        para_info = {
+            "ParagraphIndex": i - 1,
+            "Text": p_text,
+            "HasBullet": is_visible and b_type != 0,
+            "IndentLevel": para["IndentLevel"] if para["IndentLevel"] is not None else 1,
+        }
+
+        if para_info["HasBullet"]:
+            actual_label = ""
+            style_code = para["Style"]
+            style_info = BULLET_STYLE_MAP.get(style_code, ["Standard", "1."])
+
+            if b_type == 2:  # Numbered
+                c = style_counters.get(style_code, 0) + 1
+                style_counters[style_code] = c
+                # 실제 렌더링된 라벨 (ListString), 없으면 캐싱된 포맷으로 생성
+                actual_label = para["ListString"]
+                if not actual_label:
+                    fmt = style_info[1]
+                    if "1" in fmt: actual_label = fmt.replace("1", str(c))
+                    elif "a" in fmt: actual_label = fmt.replace("a", chr(96 + (c % 26 or 26)))
+                    elif "A" in fmt: actual_label = fmt.replace("A", chr(64 + (c % 26 or 26)))
+                    else: actual_label = fmt
+
+            elif b_type == 1:  # Symbol
+                char_info = BULLET_CHAR_MAP.get(para["Character"], [None, "•"])
+                actual_label = char_info[1]
+
+            para_info.update({
+                "BulletType": b_type,
+                "ActualLabel": actual_label,
+                "BulletCharacter": style_info[0] if b_type == 2 else "Symbol",
+                "BulletDescription": f"Bullet: {actual_label}",
+                "BulletRelativeSize": para["RelativeSize"] if para["RelativeSize"] is not None else 100,
+            })
+
+        result.append(para_info)
+    return result
+
+
+def build_text_detail(record: dict):
+    """
+    extract_text_from_shape() 결과와 같은 {"TextFrame": {...}}.
+    text가 없으면 None, run 경계가 맞지 않으면 False (shape 단위 fallback).
+    """
+    if not (record["HasTextFrame"] and record["HasText"]):
+        return None
+
+    full = record["Text"]
+    frame = {"Has Text": True, "Text": full, "Runs": []}
+    if not full:
+        frame["Paragraphs"] = []
+    else:
+        runs = build_runs(record)
+        if runs is None:
+            return False
+        frame["Runs"] = runs
+        frame["Paragraphs"] = build_paragraphs(record)
+
+    if record["Hyperlink"]:
+        frame["Hyperlink"] = record["Hyperlink"]
+    return {"TextFrame": frame}
+
+
+# ---------------------------------------------------------------------------
+# exporter
+# ---------------------------------------------------------------------------
+class BulkSlideExporter:
+    """
+    Hidden helper presentation holding the export macro.
+    export(slide) → decoded shape records, or None when the backend is unavailable.
+    The helper stays open between exports; Parser.close() closes it at session end.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.helper = None
+        self.available = True
+        self.macro = None
+
+    def _install(self):
+        # msoFalse = 0: 창 없이 생성, vbext_ct_StdModule = 1
+        self.helper = self.app.Presentations.Add(0)
+        module = self.helper.VBProject.VBComponents.Add(1)
+        module.Name = MACRO_MODULE
+        module.CodeModule.AddFromString(BULK_EXPORT_VBA)
+        self.macro = f"'{self.helper.Name}'!{MACRO_MODULE}.{MACRO_NAME}"
+
+    def export(self, slide):
+        if not self.available:
+            return None
+        try:
+            if self.macro is None:
+                self._install()
+            payload = self.app.Run(self.macro, slide)
+        except Exception as e:
+            # 권한 없음 (Trust access to the VBA project object model) 등 → 이후 속성 단위 파싱만 사용
+            # _install() 도중 실패해도 이미 만든 helper presentation은 close()로 닫힌다
+            self.available = False
+            logger.warning(f"Bulk export disabled, falling back to per-property parsing: {e}")
+            self.close()
+            return None
+
+        try:
+            return decode_slide_payload(payload)
+        except ValueError as e:
+            # 이 슬라이드만 fallback
+            logger.warning(f"{e}")
+            return None
+
+    def close(self):
+        if self.helper is not None:
+            try:
+                self.helper.Close()
+            except Exception:
+                pass
+            self.helper = None
+            self.macro = None
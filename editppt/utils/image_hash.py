@@ -0,0 +1,136 @@
+# image_hash.py
+"""
+Perceptual fingerprints of slide renders and a per-slide cache of vision
+verdicts (VisionValidatorAgent skips the vision call on a known-good render).
+
+- pHash: DCT of a 64x64 grayscale image, 16x16 low frequencies vs median (256 bit)
+- dHash: horizontal gradient sign of a 17x16 grayscale image (256 bit)
+- both hashes must be within `threshold` bits. A one-character text edit or a
+  2pt move can leave 16x16 hashes unchanged, so a match is confirmed on the
+  export-resolution render reduced to 4x4 block means: no block may differ by
+  more than `block_tolerance` gray levels (absorbs anti-aliasing noise only)
+"""
+import math
+import threading
+
+import numpy as np
+from PIL import Image
+
+
+HASH_SIZE = 16
+BLOCK = 4
+
+
+def _gray(image: Image.Image, size: tuple) -> np.ndarray:
+    return np.asarray(image.convert("L").resize(size, Image.Resampling.BILINEAR), dtype=np.float64)
+
+
+def dhash(image: Image.Image, hash_size: int = HASH_SIZE) -> np.ndarray:
+    px = _gray(image, (hash_size + 1, hash_size))
+    return px[:, 1:] > px[:, :-1]
+
+
+_DCT = {}
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    if n not in _DCT:
+        k = np.arange(n)[:, None]
+        i = np.arange(n)[None, :]
+        m = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * math.sqrt(2 / n)
+        m[0] /= math.sqrt(2)
+        _DCT[n] = m
+    return _DCT[n]
+
+
+def phash(image: Image.Image, hash_size: int = HASH_SIZE, factor: int = 4) -> np.ndarray:
+    n = hash_size * factor
+    d = _dct_matrix(n)
+    coeffs = d @ _gray(image, (n, n)) @ d.T
+    low = coeffs[:hash_size, :hash_size]
+    # DC 성분은 밝기 평균이라 median 계산에서 제외
+    return low > np.median(low.ravel()[1:])
+
+
+def hamming(a: np.ndarray, b: np.ndarray) -> int:
+    return int(np.count_nonzero(a != b))
+
+
+def block_means(image: Image.Image, block: int = BLOCK) -> np.ndarray:
+    """BLOCK x BLOCK 픽셀 평균 밝기 (uint8, 1024px export 기준 약 37k 값)"""
+    size = (max(1, image.width // block), max(1, image.height // block))
+    return np.asarray(image.convert("L").resize(size, Image.Resampling.BOX))
+
+
+def max_block_diff(a: np.ndarray, b: np.ndarray) -> float:
+    """두 block_means의 최대 차이 (크기가 다르면 inf)"""
+    if a.shape != b.shape:
+        return math.inf
+    return float(np.abs(a.astype(np.int16) - b.astype(np.int16)).max())
+
+
+class RenderFingerprint:
+    def __init__(self, image: Image.Image):
+        self.phash = phash(image)
+        self.dhash = dhash(image)
+        self.blocks = block_means(image)
+
+    def distance(self, other: "RenderFingerprint") -> tuple:
+        """(pHash bits, dHash bits, max block diff)"""
+        return (
+            hamming(self.phash, other.phash),
+            hamming(self.dhash, other.dhash),
+            max_block_diff(self.blocks, other.blocks),
+        )
+
+
+class VerdictCache:
+    """page_number → [(fingerprint, valid, reason), ...] (최근 max_per_slide개)"""
+
+    def __init__(self, threshold: int = 6, block_tolerance: float = 8.0, max_per_slide: int = 8):
+        self.threshold = threshold
+        self.block_tolerance = block_tolerance
+        self.max_per_slide = max_per_slide
+        self.entries = {}
+        self.lookups = 0
+        self.skipped = 0
+        # scheduler로 여러 슬라이드를 동시에 검증할 수 있다
+        self._lock = threading.Lock()
+
+    def lookup(self, page_number, fingerprint: RenderFingerprint):
+        """
+        같은 슬라이드에서 통과 판정을 받은 render와 일치하면 그 항목, 아니면 None.
+        """
+        with self._lock:
+            self.lookups += 1
+            entries = list(self.entries.get(page_number, []))
+        for entry in reversed(entries):
+            known, valid, _ = entry
+            if not valid:
+                continue
+            p, d, block = fingerprint.distance(known)
+            if p <= self.threshold and d <= self.threshold and block <= self.block_tolerance:
+                with self._lock:
+                    self.skipped += 1
+                return entry
+        return None
+
+    def add(self, page_number, fingerprint: RenderFingerprint, valid: bool, reason: str = None):
+        with self._lock:
+            entries = self.entries.setdefault(page_number, [])
+            entries.append((fingerprint, valid, reason))
+            del entries[:-self.max_per_slide]
+
+    def clear(self, page_number=None):
+        with self._lock:
+            if page_number is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(page_number, None)
+
+    @property
+    def skip_rate(self) -> float:
+        return self.skipped / self.lookups if self.lookups else 0.0
+
+    def report(self) -> str:
+        return f"vision calls skipped {self.skipped}/{self.lookups} ({self.skip_rate:.0%})"
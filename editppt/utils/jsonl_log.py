@@ -0,0 +1,171 @@
+# jsonl_log.py
+"""
+Append-only JSONL logs (replaces whole-file json.dump rewrites).
+
+- JsonlWriter: one JSON line per append. Records are serialized at append()
+  time (later mutation of the dict does not change the log) and written in
+  batches: every `flush_every` records, on flush()/close(), and optionally
+  every `flush_interval` seconds from a background thread
+- state logs use {"op": "put" | "append" | "delete", "key", "value"} records;
+  rebuild_state() replays them into the latest dict (what the old
+  parser_Database.json / parser_Edithistory.json files contained)
+
+    python -m editppt.utils.jsonl_log logfiles/<ts>/parser_Database.jsonl --out state.json
+"""
+import json
+import time
+import atexit
+import argparse
+import threading
+from pathlib import Path
+
+from editppt.utils.logger_manual import log_path
+
+
+class JsonlWriter:
+    def __init__(self, path, flush_every: int = 20, flush_interval: float = None):
+        """
+        Args:
+            path: .jsonl 경로 (append 모드)
+            flush_every: 이 개수만큼 쌓이면 호출한 thread에서 바로 기록
+            flush_interval: 지정하면 background thread가 주기적으로 기록
+                (None이면 flush_every / flush() / close() 때만 기록)
+        """
+        self.path = Path(path)
+        self.flush_every = max(1, flush_every)
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._closed = threading.Event()
+        self.records = 0
+        self.flushes = 0
+
+        self._thread = None
+        if flush_interval:
+            self._thread = threading.Thread(target=self._flush_loop, name=f"jsonl-{self.path.name}", daemon=True)
+            self._thread.start()
+
+    def append(self, record: dict):
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self._buffer.append(line)
+            self.records += 1
+            full = len(self._buffer) >= self.flush_every
+        # background thread가 있으면 주기적 flush에 맡긴다 (버퍼가 가득 찼을 때만 직접 기록)
+        if full:
+            self.flush()
+
+    def put(self, key, value):
+        self.append({"ts": time.time(), "op": "put", "key": key, "value": value})
+
+    def push(self, key, value):
+        """key의 리스트에 value 추가 (edit history 등)"""
+        self.append({"ts": time.time(), "op": "append", "key": key, "value": value})
+
+    def delete(self, key):
+        self.append({"ts": time.time(), "op": "delete", "key": key})
+
+    def flush(self):
+        with self._lock:
+            lines, self._buffer = self._buffer, []
+        if not lines:
+            return
+        # 여러 thread가 flush해도 줄 단위 순서가 섞이지 않도록 기록은 직렬화
+        with self._write_lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            self.flushes += 1
+
+    def _flush_loop(self):
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+
+    def close(self):
+        self._closed.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_WRITERS = {}
+_WRITERS_LOCK = threading.Lock()
+
+
+def get_writer(filename: str, **kwargs) -> JsonlWriter:
+    """logfiles/{TIMESTAMP}/filename writer (같은 파일은 writer 하나를 공유)."""
+    path = log_path(filename)
+    with _WRITERS_LOCK:
+        writer = _WRITERS.get(path)
+        if writer is None:
+            writer = _WRITERS[path] = JsonlWriter(path, **kwargs)
+        return writer
+
+
+def flush_all():
+    with _WRITERS_LOCK:
+        writers = list(_WRITERS.values())
+    for writer in writers:
+        writer.flush()
+
+
+def close_all():
+    with _WRITERS_LOCK:
+        writers = list(_WRITERS.values())
+        _WRITERS.clear()
+    for writer in writers:
+        writer.close()
+
+
+atexit.register(close_all)
+
+
+def read_jsonl(path):
+    """JSONL 레코드 generator. 비정상 종료로 잘린 마지막 줄은 건너뛴다."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def rebuild_state(path) -> dict:
+    """put / append / delete 레코드를 순서대로 적용한 최종 상태."""
+    state = {}
+    for record in read_jsonl(path):
+        op = record.get("op")
+        key = record.get("key")
+        if op == "put":
+            state[key] = record.get("value")
+        elif op == "append":
+            state.setdefault(key, []).append(record.get("value"))
+        elif op == "delete":
+            state.pop(key, None)
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the latest state from a JSONL state log")
+    parser.add_argument("path", type=str)
+    parser.add_argument("--out", type=str, default=None, help="state를 JSON으로 저장 (생략 시 요약만 출력)")
+    args = parser.parse_args()
+
+    state = rebuild_state(args.path)
+    if args.out:
+        Path(args.out).write_text(json.dumps(state, ensure_ascii=False, indent=4), encoding="utf-8")
+    print(f"{len(state)} keys: {sorted(state, key=str)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+# llm_cache.py
+"""
+Content-addressed response cache for call_llm (opt-in).
+
+key = sha256(model, messages, tools, tool_choice, temperature, ...)
+- memory tier: in-process LRU (max_entries)
+- disk tier  : logfiles/llm_cache/<key>.json (max_bytes, oldest-used evicted first)
+Entries older than ttl seconds are treated as misses.
+
+Enable with LLM_CACHE=1 or enable_response_cache(). Replaying the same
+instruction on the same deck then needs no network (and no API key).
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from loguru import logger
+
+
+CACHE_ROOT = Path.cwd() / "logfiles" / "llm_cache"
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        cache_dir: Path = CACHE_ROOT,
+        max_entries: int = 256,
+        max_bytes: int = 200 * 1024 * 1024,
+        ttl: float = 7 * 24 * 3600,
+        persist: bool = True,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.persist = persist
+
+        self._memory = OrderedDict()  # key -> (created_at, response)
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+        if self.persist:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # key
+    # ------------------------------------------------------------------
+    @staticmethod
+    def make_key(payload: dict) -> str:
+        """payload: call_llm이 보내는 요청 dict (model, input, tools, temperature, ...)"""
+        canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------------
+    # get / put
+    # ------------------------------------------------------------------
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, response = entry
+                if now - created_at <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return response
+                del self._memory[key]
+
+        response = self._read_disk(key, now)
+        with self._lock:
+            if response is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+        self._remember(key, now, response)
+        return response
+
+    def put(self, key: str, response):
+        now = time.time()
+        self._remember(key, now, response)
+        with self._lock:
+            self.stores += 1
+        if self.persist:
+            self._write_disk(key, now, response)
+
+    def _remember(self, key, created_at, response):
+        with self._lock:
+            self._memory[key] = (created_at, response)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # disk tier
+    # ------------------------------------------------------------------
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _read_disk(self, key: str, now: float):
+        if not self.persist:
+            return None
+        path = self._path(key)
+        try:
+            record = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"LLM cache entry unreadable ({path.name}): {e}")
+            return None
+
+        if now - record.get("created_at", 0) > self.ttl:
+            path.unlink(missing_ok=True)
+            return None
+
+        # LRU 기준 시각 갱신
+        os.utime(path, None)
+        return _deserialize(record)
+
+    def _write_disk(self, key: str, created_at: float, response):
+        record = _serialize(response)
+        if record is None:
+            return
+        record["created_at"] = created_at
+        path = self._path(key)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(record, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+        self._evict_disk()
+
+    def _evict_disk(self):
+        files = []
+        total = 0
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(files):
+            path.unlink(missing_ok=True)
+            total -= size
+            with self._lock:
+                self.evictions += 1
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        if self.persist:
+            for path in self.cache_dir.glob("*.json"):
+                path.unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    # stats
+    # ------------------------------------------------------------------
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+        }
+
+
+def _serialize(response):
+    """openai Response → JSON record. 직렬화할 수 없는 객체는 disk에 쓰지 않는다."""
+    if hasattr(response, "model_dump"):
+        return {"kind": "openai.responses", "data": response.model_dump(mode="json")}
+    if isinstance(response, str):
+        return {"kind": "text", "data": response}
+    return None
+
+
+def _deserialize(record: dict):
+    kind = record.get("kind")
+    if kind == "openai.responses":
+        from openai.types.responses import Response
+        return Response.model_validate(record["data"])
+    if kind == "text":
+        return record["data"]
+    return None
+
+
+_RESPONSE_CACHE = None
+
+
+def enable_response_cache(**kwargs) -> ResponseCache:
+    """call_llm 응답 캐시 활성화. kwargs는 ResponseCache 인자."""
+    global _RESPONSE_CACHE
+    _RESPONSE_CACHE = ResponseCache(**kwargs)
+    return _RESPONSE_CACHE
+
+
+def disable_response_cache():
+    global _RESPONSE_CACHE
+    _RESPONSE_CACHE = None
+
+
+def get_response_cache():
+    """활성화된 캐시 반환 (LLM_CACHE=1 이면 첫 호출 시 자동 생성)."""
+    global _RESPONSE_CACHE
+    if _RESPONSE_CACHE is None and _env_flag("LLM_CACHE"):
+        _RESPONSE_CACHE = ResponseCache(
+            max_entries=int(os.environ.get("LLM_CACHE_MAX_ENTRIES", 256)),
+            max_bytes=int(os.environ.get("LLM_CACHE_MAX_MB", 200)) * 1024 * 1024,
+            ttl=float(os.environ.get("LLM_CACHE_TTL", 7 * 24 * 3600)),
+        )
+    return _RESPONSE_CACHE
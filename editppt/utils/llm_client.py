@@ -7,8 +7,16 @@ from google import genai
 from google.genai import types
 import base64
 import json
+import asyncio
+import threading
+import time
 from io import BytesIO
 from PIL import Image
+import httpx
+
+from editppt.utils.llm_cache import get_response_cache
+from editppt.utils.tracer import span
+from editppt.utils.llm_ledger import get_ledger, openai_usage, gemini_usage
 
 
 load_dotenv()
@@ -18,6 +26,24 @@ ANTHROPIC_API_KEY = os.environ.get("ANTHROPIC_API_KEY")
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
 GEMINI_API_KEY = os.environ.get("GEMINI")
 
+PROVIDER_BASE_URLS = {
+    "openai": os.environ.get("OPENAI_BASE_URL"),
+    "upstage": "https://api.upstage.ai/v1",
+}
+
+# HTTP connection pool / timeout 설정 (환경변수 또는 configure_http()로 변경)
+HTTP_SETTINGS = {
+    "timeout": float(os.environ.get("LLM_HTTP_TIMEOUT", 120.0)),
+    "connect_timeout": float(os.environ.get("LLM_HTTP_CONNECT_TIMEOUT", 10.0)),
+    "max_connections": int(os.environ.get("LLM_MAX_CONNECTIONS", 20)),
+    "max_keepalive_connections": int(os.environ.get("LLM_MAX_KEEPALIVE_CONNECTIONS", 10)),
+    "keepalive_expiry": float(os.environ.get("LLM_KEEPALIVE_EXPIRY", 60.0)),
+}
+
+# (provider, api_key, base_url) -> client. 호출마다 새 connection pool / TLS handshake를 만들지 않도록 재사용
+_CLIENTS = {}
+_CLIENTS_LOCK = threading.Lock()
+
 
 def get_api_key_and_provider(model: str):
     """
@@ -55,28 +81,84 @@ def get_api_key_and_provider(model: str):
     return provider, api_key
 
 
-def get_client_for_model(model: str):
+def configure_http(**settings):
     """
-    모델에 맞는 OpenAI 스타일 클라이언트 반환
+    HTTP pool / timeout 설정 변경. 기존 client는 닫고 다음 호출 시 새 설정으로 생성.
+    keys: timeout, connect_timeout, max_connections, max_keepalive_connections, keepalive_expiry
     """
-    provider, api_key = get_api_key_and_provider(model)
+    unknown = set(settings) - set(HTTP_SETTINGS)
+    if unknown:
+        raise ValueError(f"알 수 없는 HTTP 설정: {sorted(unknown)}")
+    HTTP_SETTINGS.update(settings)
+    close_clients()
+
+
+def close_clients():
+    """캐시된 모든 client의 connection pool을 닫는다."""
+    with _CLIENTS_LOCK:
+        for client in _CLIENTS.values():
+            close = getattr(client, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception as e:
+                    logger.warning(f"LLM client close 실패: {e}")
+        _CLIENTS.clear()
+
 
-    if provider == "openai":
-        client = OpenAI(api_key=api_key)
-        
-    elif provider == "upstage":
-        client = OpenAI(api_key=api_key, base_url="https://api.upstage.ai/v1")
+def _build_http_client():
+    return httpx.Client(
+        limits=httpx.Limits(
+            max_connections=HTTP_SETTINGS["max_connections"],
+            max_keepalive_connections=HTTP_SETTINGS["max_keepalive_connections"],
+            keepalive_expiry=HTTP_SETTINGS["keepalive_expiry"],
+        ),
+        timeout=httpx.Timeout(
+            HTTP_SETTINGS["timeout"],
+            connect=HTTP_SETTINGS["connect_timeout"],
+        ),
+    )
+
+
+def _create_client(provider: str, api_key: str, base_url: str = None):
+    """provider별 client 생성 (keep-alive connection pool 포함)"""
+    if provider in ("openai", "upstage"):
+        return OpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=_build_http_client(),
+        )
 
     elif provider == "anthropic":
         # TODO: 나중에 Anthropic SDK로 구현
         ...
     
     elif provider == "gemini":
-        client = genai.Client(api_key=api_key)
+        # genai.Client는 내부 httpx client를 유지하므로 캐시만으로 keep-alive가 된다
+        return genai.Client(
+            api_key=api_key,
+            http_options=types.HttpOptions(timeout=int(HTTP_SETTINGS["timeout"] * 1000)),
+        )
     
     else:
         raise ValueError(f"알 수 없는 provider: {provider}")
 
+
+def get_client_for_model(model: str):
+    """
+    모델에 맞는 OpenAI 스타일 클라이언트 반환
+    (provider, api_key, base_url)마다 하나의 long-lived client를 재사용
+    """
+    provider, api_key = get_api_key_and_provider(model)
+    base_url = PROVIDER_BASE_URLS.get(provider)
+    key = (provider, api_key, base_url)
+
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            client = _create_client(provider, api_key, base_url)
+            _CLIENTS[key] = client
+
     return client, provider
 
 
@@ -85,13 +167,14 @@ def call_llm(
     messages,
     tools=None,
     tool_choice=None,
+    stage: str = None,
     **kwargs,
 ):
     """
     공통 llm 호출 래퍼
+    응답 캐시가 활성화되어 있으면 (LLM_CACHE=1) 같은 요청은 네트워크 없이 재사용
+    stage: ledger에 기록할 호출 단계 (planner / edit_agent / text_validator / vision / style_mapping)
     """
-    client, provider = get_client_for_model(model)
-
     payload = {
         "model": model,
         "input": messages, 
@@ -105,31 +188,97 @@ def call_llm(
 
     payload.update(kwargs)
 
-    return client.responses.create(**payload)
+    if stage and model.startswith("gpt-") and "prompt_cache_key" not in payload:
+        # 같은 stage 요청을 같은 prompt cache로 라우팅 (고정 prefix 재사용률 향상).
+        # SDK 버전에 상관없이 전달되도록 extra_body 사용
+        payload["extra_body"] = {**payload.get("extra_body", {}), "prompt_cache_key": f"editppt-{stage}"}
+
+    ledger = get_ledger()
+    with span("llm", model=model, stage=stage) as current:
+        t0 = time.perf_counter()
+        cache = get_response_cache()
+        if cache is not None:
+            cache_key = cache.make_key(payload)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                current.set(cached=True)
+                ledger.record(stage, model, time.perf_counter() - t0, response_cache=True,
+                              **openai_usage(cached, messages, model))
+                return cached
+
+        client, provider = get_client_for_model(model)
+        try:
+            response = client.responses.create(**payload)
+        except Exception as e:
+            ledger.record(stage, model, time.perf_counter() - t0, error=type(e).__name__)
+            raise
+        seconds = time.perf_counter() - t0
+
+        usage = openai_usage(response, messages, model)
+        ledger.record(stage, model, seconds, **usage)
+        current.set(input_tokens=usage["input_tokens"], cached_tokens=usage["cached_tokens"],
+                    output_tokens=usage["output_tokens"])
+        logger.debug(
+            f"LLM {stage or model}: {usage['input_tokens']} input tokens "
+            f"({usage['cached_tokens']} cached), {usage['output_tokens']} output, {seconds:.2f}s"
+        )
+
+        if cache is not None:
+            cache.put(cache_key, response)
+        return response
 
 
 def call_llm_gemini(
     model: str,
     messages: str,
-    image: base64 = None
-    ,
+    image: base64 = None,
+    mime_type: str = "image/png",
+    stage: str = None,
+    instructions: str = None,
     # tools=None,
     # tool_choice=None,
     # **kwargs,
 ):
     """
     Gemini 전용 호출 래퍼 (google-genai v1.0+ 기준)
+    instructions: 호출마다 같은 고정 지시문. image보다 앞에 두어 implicit prompt cache의 prefix가 되게 한다
     """
     client, provider = get_client_for_model(model)
-    try:
-        response = client.models.generate_content(
-            model=model, 
-            contents=[
-                types.Part.from_bytes(data=image, mime_type="image/png"),
-                messages
-            ]
-        )
-        return response.text
-    
-    except Exception as e:
-        return f"[Gemini Error] {str(e)}"
\ No newline at end of file
+    ledger = get_ledger()
+    with span("llm", model=model, stage=stage) as current:
+        t0 = time.perf_counter()
+        try:
+            response = client.models.generate_content(
+                model=model, 
+                contents=([instructions] if instructions else []) + [
+                    types.Part.from_bytes(data=image, mime_type=mime_type),
+                    messages
+                ]
+            )
+            usage = gemini_usage(response, (instructions or "") + messages, model)
+            ledger.record(stage, model, time.perf_counter() - t0, **usage)
+            current.set(input_tokens=usage["input_tokens"], cached_tokens=usage["cached_tokens"],
+                        output_tokens=usage["output_tokens"])
+            return response.text
+
+        except Exception as e:
+            ledger.record(stage, model, time.perf_counter() - t0, error=type(e).__name__)
+            current.set(error=type(e).__name__)
+            return f"[Gemini Error] {str(e)}"
+
+
+async def acall_llm(model: str, messages, tools=None, tool_choice=None, **kwargs):
+    """
+    call_llm의 asyncio 버전.
+    pooled client와 응답 캐시를 그대로 쓰도록 worker thread에서 실행한다 (event loop는 막지 않음).
+    scheduler는 task 전체(EditAgent.run)를 worker thread에서 돌리므로 내부에서는 call_llm을 쓴다.
+    """
+    return await asyncio.to_thread(
+        call_llm, model, messages, tools=tools, tool_choice=tool_choice, **kwargs
+    )
+
+
+async def acall_llm_gemini(model: str, messages: str, image: base64 = None, mime_type: str = "image/png",
+                           stage: str = None, instructions: str = None):
+    """call_llm_gemini의 asyncio 버전."""
+    return await asyncio.to_thread(call_llm_gemini, model, messages, image, mime_type, stage, instructions)
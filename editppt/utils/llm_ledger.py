@@ -0,0 +1,271 @@
+# llm_ledger.py
+"""
+Token / cost / latency ledger for every call_llm / call_llm_gemini call.
+
+- 호출마다 logfiles/{TIMESTAMP}/llm_ledger.jsonl에 한 줄
+  {"ts", "stage", "model", "task", "page", "seconds", "input_tokens", "cached_tokens",
+   "output_tokens", "estimated", "response_cache", "cost_usd", "error"}
+  stage: planner | edit_agent | text_validator | vision | style_mapping (call_llm(stage=...))
+  task / page: 실행 중인 EditAgent.run이 ledger_task()로 지정 (EDITPPT_TRACE와 무관, 없으면 None)
+- 토큰은 response.usage 기준. usage가 없으면 count_tokens()로 추정 (estimated=True)
+- 응답 캐시(LLM_CACHE=1) hit은 API를 부르지 않았으므로 cost 0, 요약 토큰 합계에서도 제외
+- 세션 요약: summary() / format_summary(), 종료 시 llm_ledger_summary.json
+
+    python -m editppt.utils.llm_ledger logfiles/<ts>/llm_ledger.jsonl
+"""
+import json
+import time
+import atexit
+import argparse
+import itertools
+import threading
+import contextvars
+from contextlib import contextmanager
+
+import tiktoken
+from loguru import logger
+
+from editppt.utils.jsonl_log import get_writer, read_jsonl
+from editppt.utils.logger_manual import log_path
+
+
+LEDGER_FILE = "llm_ledger.jsonl"
+SUMMARY_FILE = "llm_ledger_summary.json"
+
+_TASK_IDS = itertools.count(1)
+_TASK = contextvars.ContextVar("editppt_ledger_task", default=(None, None))
+
+# 모델별 토큰당 단가 (USD). 날짜가 붙은 모델명은 가장 긴 prefix로 찾는다
+PRICING = {
+    "gpt-4.1":          {"prompt": 2.00/1000000, "cached_prompt": 0.50/1000000, "completion": 8.00/1000000},
+    "gpt-4.1-mini":     {"prompt": 0.40/1000000, "cached_prompt": 0.10/1000000, "completion": 1.60/1000000},
+    "gpt-4.1-nano":     {"prompt": 0.10/1000000, "cached_prompt": 0.025/1000000, "completion": 0.40/1000000},
+    "gpt-4o":           {"prompt": 2.50/1000000, "cached_prompt": 1.25/1000000, "completion": 10.00/1000000},
+    "o4-mini":          {"prompt": 1.10/1000000, "cached_prompt": 0.275/1000000, "completion": 4.40/1000000},
+    "gemini-2.5-pro":   {"prompt": 1.25/1000000, "cached_prompt": 0.31/1000000, "completion": 10.00/1000000},
+    "gemini-2.5-flash": {"prompt": 0.30/1000000, "cached_prompt": 0.075/1000000, "completion": 2.50/1000000},
+}
+
+
+def count_tokens(text: str, model: str) -> int:
+    """tiktoken으로 토큰 수 계산"""
+    try:
+        enc = tiktoken.encoding_for_model(model)
+    except KeyError:
+        enc = tiktoken.get_encoding("cl100k_base")
+    return len(enc.encode(text))
+
+
+def price_for(model: str):
+    """PRICING 항목 (없으면 None)"""
+    if model in PRICING:
+        return PRICING[model]
+    prefixes = [name for name in PRICING if model.startswith(name)]
+    return PRICING[max(prefixes, key=len)] if prefixes else None
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int, cached_tokens: int = 0):
+    """USD (단가를 모르는 모델이면 None)"""
+    rates = price_for(model)
+    if rates is None:
+        return None
+    cached = min(cached_tokens or 0, input_tokens)
+    return ((input_tokens - cached) * rates["prompt"]
+            + cached * rates.get("cached_prompt", rates["prompt"])
+            + output_tokens * rates["completion"])
+
+
+def _message_text(messages) -> str:
+    """call_llm input (str 또는 Responses API message list)의 텍스트 부분"""
+    if isinstance(messages, str):
+        return messages
+    parts = []
+    for message in messages or []:
+        content = message.get("content") if isinstance(message, dict) else None
+        if isinstance(content, str):
+            parts.append(content)
+        elif isinstance(content, list):
+            # input_image 등은 세지 않는다
+            parts.extend(c.get("text", "") for c in content if isinstance(c, dict))
+    return "\n".join(parts)
+
+
+def _estimate_tokens(text: str, model: str) -> int:
+    try:
+        return count_tokens(text, model)
+    except Exception:
+        # encoding 파일을 받을 수 없는 환경 등
+        return len(text) // 4
+
+
+def openai_usage(response, messages, model: str) -> dict:
+    """Responses API 응답 → {"input_tokens", "cached_tokens", "output_tokens", "estimated"}"""
+    usage = getattr(response, "usage", None)
+    if usage is not None and usage.input_tokens is not None:
+        details = getattr(usage, "input_tokens_details", None)
+        return {
+            "input_tokens": usage.input_tokens,
+            "cached_tokens": getattr(details, "cached_tokens", 0) or 0,
+            "output_tokens": usage.output_tokens or 0,
+            "estimated": False,
+        }
+    return {
+        "input_tokens": _estimate_tokens(_message_text(messages), model),
+        "cached_tokens": 0,
+        "output_tokens": _estimate_tokens(getattr(response, "output_text", "") or "", model),
+        "estimated": True,
+    }
+
+
+def gemini_usage(response, prompt: str, model: str) -> dict:
+    """generate_content 응답 → openai_usage()와 같은 형식 (이미지 토큰은 usage에만 포함)"""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is not None and usage.prompt_token_count is not None:
+        return {
+            "input_tokens": usage.prompt_token_count,
+            "cached_tokens": usage.cached_content_token_count or 0,
+            "output_tokens": usage.candidates_token_count or 0,
+            "estimated": False,
+        }
+    return {
+        "input_tokens": _estimate_tokens(prompt or "", model),
+        "cached_tokens": 0,
+        "output_tokens": _estimate_tokens(getattr(response, "text", "") or "", model),
+        "estimated": True,
+    }
+
+
+@contextmanager
+def ledger_task(page, task_id=None):
+    """
+    이 block 안의 기록에 task / page를 붙인다.
+    task_id가 없으면 (tracing off) ledger 자체 번호를 쓴다.
+    """
+    token = _TASK.set((task_id if task_id is not None else next(_TASK_IDS), page))
+    try:
+        yield
+    finally:
+        _TASK.reset(token)
+
+
+class LLMLedger:
+    def __init__(self, filename: str = LEDGER_FILE):
+        self.filename = filename
+        self.entries = []
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, model: str, seconds: float, input_tokens: int = 0,
+               output_tokens: int = 0, cached_tokens: int = 0, estimated: bool = False,
+               response_cache: bool = False, error: str = None) -> dict:
+        task, page = _TASK.get()
+        cost = 0.0 if response_cache else estimate_cost(model, input_tokens, output_tokens, cached_tokens)
+        entry = {
+            "ts": time.time(),
+            "stage": stage or "unknown",
+            "model": model,
+            "task": task,
+            "page": page,
+            "seconds": round(seconds, 4),
+            "input_tokens": input_tokens,
+            "cached_tokens": cached_tokens,
+            "output_tokens": output_tokens,
+            "estimated": estimated,
+            "response_cache": response_cache,
+            "cost_usd": cost,
+            "error": error,
+        }
+        with self._lock:
+            self.entries.append(entry)
+        get_writer(self.filename).append(entry)
+        return entry
+
+    def summary(self) -> dict:
+        with self._lock:
+            entries = list(self.entries)
+        return summarize(entries)
+
+    def format_summary(self) -> str:
+        return format_summary(self.summary())
+
+
+def summarize(entries: list) -> dict:
+    """
+    Returns:
+        {"total": {...}, "by_stage": {stage: {...}}, "by_model": {model: {...}}}
+        각 {...}: calls, errors, seconds, input_tokens, cached_tokens, output_tokens,
+                  cost_usd (단가 모르는 호출은 제외), unpriced_calls, response_cache_hits
+        response_cache hit은 API 호출이 아니므로 calls / seconds에만 들어가고 토큰 합계에서는 빠진다
+    """
+    def bucket():
+        return {"calls": 0, "errors": 0, "seconds": 0.0, "input_tokens": 0, "cached_tokens": 0,
+                "output_tokens": 0, "cost_usd": 0.0, "unpriced_calls": 0, "response_cache_hits": 0}
+
+    total, by_stage, by_model = bucket(), {}, {}
+    for entry in entries:
+        for b in (total, by_stage.setdefault(entry["stage"], bucket()),
+                  by_model.setdefault(entry["model"], bucket())):
+            b["calls"] += 1
+            b["errors"] += entry.get("error") is not None
+            b["seconds"] += entry["seconds"]
+            if entry.get("response_cache"):
+                b["response_cache_hits"] += 1
+                continue
+            b["input_tokens"] += entry["input_tokens"]
+            b["cached_tokens"] += entry.get("cached_tokens") or 0
+            b["output_tokens"] += entry["output_tokens"]
+            if entry["cost_usd"] is None:
+                b["unpriced_calls"] += 1
+            else:
+                b["cost_usd"] += entry["cost_usd"]
+    return {"total": total, "by_stage": by_stage, "by_model": by_model}
+
+
+def format_summary(summary: dict) -> str:
+    lines = [
+        "[LLM ledger]",
+        f"{'stage':<18}{'calls':>6}{'seconds':>10}{'input':>10}{'cached':>9}{'cached %':>9}{'output':>9}{'cost $':>10}",
+    ]
+    rows = sorted(summary["by_stage"].items(), key=lambda kv: kv[1]["cost_usd"], reverse=True)
+    for name, b in rows + [("total", summary["total"])]:
+        cost = f"{b['cost_usd']:.4f}" + ("*" if b["unpriced_calls"] else "")
+        # provider prompt cache가 재사용한 input 비율
+        cached_share = b["cached_tokens"] / b["input_tokens"] if b["input_tokens"] else 0.0
+        lines.append(
+            f"{name:<18}{b['calls']:>6}{b['seconds']:>10.1f}{b['input_tokens']:>10}"
+            f"{b['cached_tokens']:>9}{cached_share:>9.1%}{b['output_tokens']:>9}{cost:>10}"
+        )
+    if summary["total"]["unpriced_calls"]:
+        lines.append("* some calls use a model without a PRICING entry (not included)")
+    return "\n".join(lines)
+
+
+_LEDGER = LLMLedger()
+
+
+def get_ledger() -> LLMLedger:
+    return _LEDGER
+
+
+def _write_summary():
+    summary = _LEDGER.summary()
+    if not summary["total"]["calls"]:
+        return
+    log_path(SUMMARY_FILE).write_text(json.dumps(summary, indent=4), encoding="utf-8")
+    logger.info("\n" + format_summary(summary))
+
+
+atexit.register(_write_summary)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize an llm_ledger.jsonl file")
+    parser.add_argument("path", type=str)
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args()
+
+    summary = summarize(read_jsonl(args.path))
+    print(json.dumps(summary, indent=4) if args.json else format_summary(summary))
+
+
+if __name__ == "__main__":
+    main()
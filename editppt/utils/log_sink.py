@@ -0,0 +1,232 @@
+# log_sink.py
+"""
+Queued debug-dump sink: serialization (json.dumps / text formatting) and disk
+writes run on one background thread instead of the agent's retry loop.
+
+- write_text / write_json take a str, an object, or a zero-arg callable
+  (e.g. response.model_dump) — callables run on the worker thread.
+  Objects are serialized later, so pass a snapshot (list(messages)) when
+  the caller keeps mutating them
+- bounded memory: at most `max_items` queued entries
+    on_full="drop_oldest" (default) | "drop_newest" | "block"
+  overwrite ("w") entries for a path that is still queued are coalesced —
+  only the latest content of that file is written
+- sampling: sample_every={"parse_dump": 5} keeps 1 of every 5 entries of a kind
+- environment overrides for the shared sink (get_sink()):
+    EDITPPT_LOG_SINK_MAX_ITEMS=256
+    EDITPPT_LOG_SINK_ON_FULL=drop_oldest
+    EDITPPT_LOG_SINK_SAMPLE=parse_dump=5,agent_messages=2
+    EDITPPT_LOG_SINK_SYNC=1   (호출한 thread에서 바로 기록, 디버깅용)
+"""
+import os
+import json
+import atexit
+import threading
+from collections import deque, Counter
+from pathlib import Path
+
+from loguru import logger
+
+
+ON_FULL_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+
+class _Entry:
+    __slots__ = ("path", "mode", "render", "kind")
+
+    def __init__(self, path, mode, render, kind):
+        self.path = path
+        self.mode = mode
+        self.render = render
+        self.kind = kind
+
+
+class LogSink:
+    def __init__(self, max_items: int = 256, on_full: str = "drop_oldest",
+                 sample_every: dict = None, sync: bool = False):
+        """
+        Args:
+            max_items: queue에 쌓아 둘 최대 entry 수
+            on_full: queue가 가득 찼을 때 정책 (ON_FULL_POLICIES)
+            sample_every: {kind: n} → kind별로 n개 중 1개만 기록
+            sync: True면 worker 없이 호출한 thread에서 바로 기록
+        """
+        if on_full not in ON_FULL_POLICIES:
+            raise ValueError(f"on_full must be one of {ON_FULL_POLICIES}, got {on_full!r}")
+        self.max_items = max(1, max_items)
+        self.on_full = on_full
+        self.sample_every = {k: max(1, int(v)) for k, v in (sample_every or {}).items()}
+        self.sync = sync
+
+        self._queue = deque()
+        self._pending = {}          # path → 아직 기록 안 된 "w" entry (coalescing)
+        self._seen = Counter()      # kind별 제출 수 (sampling)
+        self._cond = threading.Condition()
+        self._busy = False
+        self._closed = False
+        self.stats = Counter()      # submitted / written / coalesced / sampled_out / dropped / errors
+
+        self._thread = None
+        if not sync:
+            self._thread = threading.Thread(target=self._run, name="log-sink", daemon=True)
+            self._thread.start()
+
+    # ---- submit ----
+    def write_text(self, path, content, mode: str = "w", kind: str = "default") -> bool:
+        """
+        Args:
+            content: str 또는 str을 반환하는 callable (worker thread에서 호출)
+        Returns:
+            queue에 들어갔으면 True (sampling/drop으로 버려지면 False)
+        """
+        render = content if callable(content) else (lambda: content)
+        return self._submit(_Entry(Path(path), mode, render, kind))
+
+    def write_json(self, path, obj, mode: str = "w", kind: str = "default", indent: int = 4,
+                   prefix: str = "", suffix: str = "") -> bool:
+        """obj (또는 obj()) 를 worker thread에서 json.dumps 해서 기록"""
+        def render():
+            value = obj() if callable(obj) else obj
+            return prefix + json.dumps(value, ensure_ascii=False, indent=indent, default=str) + suffix
+        return self._submit(_Entry(Path(path), mode, render, kind))
+
+    def _submit(self, entry: _Entry) -> bool:
+        with self._cond:
+            if self._closed:
+                return False
+            self.stats["submitted"] += 1
+            self._seen[entry.kind] += 1
+            every = self.sample_every.get(entry.kind, 1)
+            if (self._seen[entry.kind] - 1) % every:
+                self.stats["sampled_out"] += 1
+                return False
+
+            if not self.sync:
+                return self._enqueue(entry)
+
+        self._write(entry)
+        return True
+
+    def _enqueue(self, entry: _Entry) -> bool:
+        """self._cond를 잡은 상태에서 호출"""
+        if entry.mode == "w" and entry.path in self._pending:
+            # 같은 파일을 덮어쓰는 entry가 아직 대기 중이면 내용만 교체
+            self._pending[entry.path].render = entry.render
+            self.stats["coalesced"] += 1
+            return True
+        if len(self._queue) >= self.max_items:
+            if self.on_full == "drop_newest":
+                self.stats["dropped"] += 1
+                return False
+            if self.on_full == "drop_oldest":
+                self._drop_oldest()
+            else:
+                while len(self._queue) >= self.max_items and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return False
+        self._queue.append(entry)
+        if entry.mode == "w":
+            self._pending[entry.path] = entry
+        self._cond.notify_all()
+        return True
+
+    def _drop_oldest(self):
+        old = self._queue.popleft()
+        if self._pending.get(old.path) is old:
+            del self._pending[old.path]
+        self.stats["dropped"] += 1
+
+    # ---- worker ----
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                entry = self._queue.popleft()
+                if self._pending.get(entry.path) is entry:
+                    del self._pending[entry.path]
+                self._busy = True
+                self._cond.notify_all()
+            try:
+                self._write(entry)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _write(self, entry: _Entry):
+        try:
+            text = entry.render()
+            entry.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(entry.path, entry.mode, encoding="utf-8") as f:
+                f.write(text)
+            with self._cond:
+                self.stats["written"] += 1
+        except Exception as e:
+            with self._cond:
+                self.stats["errors"] += 1
+            logger.warning(f"Log sink write failed ({entry.path.name}): {e}")
+
+    # ---- lifecycle ----
+    def flush(self, timeout: float = None) -> bool:
+        """대기 중인 entry가 모두 기록될 때까지 기다린다 (timeout 초과 시 False)."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._queue and not self._busy, timeout)
+
+    def close(self, timeout: float = 10):
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _parse_sample(spec: str) -> dict:
+    """'parse_dump=5,agent_messages=2' → {"parse_dump": 5, "agent_messages": 2}"""
+    sample = {}
+    for item in filter(None, (s.strip() for s in spec.split(","))):
+        kind, _, every = item.partition("=")
+        sample[kind.strip()] = int(every or 1)
+    return sample
+
+
+_SINK = None
+_SINK_LOCK = threading.Lock()
+
+
+def get_sink() -> LogSink:
+    """프로세스 공용 sink (환경 변수로 설정, 종료 시 남은 entry 기록)"""
+    global _SINK
+    with _SINK_LOCK:
+        if _SINK is None:
+            _SINK = LogSink(
+                max_items=int(os.getenv("EDITPPT_LOG_SINK_MAX_ITEMS", 256)),
+                on_full=os.getenv("EDITPPT_LOG_SINK_ON_FULL", "drop_oldest"),
+                sample_every=_parse_sample(os.getenv("EDITPPT_LOG_SINK_SAMPLE", "")),
+                sync=os.getenv("EDITPPT_LOG_SINK_SYNC", "0") == "1",
+            )
+        return _SINK
+
+
+def close_sink():
+    global _SINK
+    with _SINK_LOCK:
+        sink, _SINK = _SINK, None
+    if sink is not None:
+        sink.close()
+        if any(sink.stats[k] for k in ("dropped", "sampled_out", "errors")):
+            logger.info(f"Log sink: {dict(sink.stats)}")
+
+
+atexit.register(close_sink)
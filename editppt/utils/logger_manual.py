@@ -11,12 +11,15 @@ def ensure_log_dir():
     LOG_ROOT.mkdir(parents=True, exist_ok=True)
     return LOG_ROOT
 
-def log_path(filename: str) -> Path:
+def log_path(filename: str, subdir: str = None) -> Path:
     """
-    logfiles/{TIMESTAMP}/filename 경로 반환
+    logfiles/{TIMESTAMP}/[subdir/]filename 경로 반환
     """
-    ensure_log_dir()
-    return LOG_ROOT / filename
+    root = ensure_log_dir()
+    if subdir:
+        root = root / subdir
+        root.mkdir(parents=True, exist_ok=True)
+    return root / filename
 
 
 
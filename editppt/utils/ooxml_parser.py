@@ -0,0 +1,1005 @@
+# ooxml_parser.py
+"""
+Pure-file parser backend: reads a .pptx (zip) directly and produces the same
+slide dict as parse_active_slide_objects(), without PowerPoint / COM.
+
+- slide XML is streamed with iterparse; each top-level shape is handled and
+  cleared as soon as its element closes
+- placeholder geometry / text styles are inherited slide -> layout -> master,
+  theme fonts (+mn-lt / +mj-lt) and scheme colors (clrMap, lumMod/lumOff) are
+  resolved the way PowerPoint reports them
+- geometry goes through float32 like COM's Single (342899 EMU -> 26.99992...)
+- runs are merged with the same key as snap(), paragraphs follow
+  parse_paragraph_bullets()
+
+What COM computes at render time (autofit, ListString of restarted lists,
+chart types beyond the common ones) is approximated; golden comparison lives
+in benchmarks/bench_ooxml_parse.py.
+"""
+import colorsys
+import os
+import posixpath
+import struct
+import zipfile
+import xml.etree.ElementTree as ET
+
+from editppt.utils.msoffice_map import SHAPE_TYPE_MAP, BULLET_STYLE_MAP, BULLET_CHAR_MAP
+
+
+A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+P = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+R = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+C = "{http://schemas.openxmlformats.org/drawingml/2006/chart}"
+MC = "{http://schemas.openxmlformats.org/markup-compatibility/2006}"
+PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+MATH = "{http://schemas.openxmlformats.org/officeDocument/2006/math}"
+
+EMU_PER_POINT = 12700
+
+SHAPE_TAGS = (P + "sp", P + "pic", P + "grpSp", P + "graphicFrame", P + "cxnSp", MC + "AlternateContent")
+
+GRAPHIC_URI_TYPES = {
+    "http://schemas.openxmlformats.org/drawingml/2006/table": 19,
+    "http://schemas.openxmlformats.org/drawingml/2006/chart": 3,
+    "http://schemas.openxmlformats.org/drawingml/2006/diagram": 24,
+    "http://schemas.openxmlformats.org/presentationml/2006/ole": 7,
+}
+
+# <p:cSld> layout type -> PpSlideLayout
+LAYOUT_TYPE_CODES = {
+    "title": 1, "tx": 2, "twoColTx": 3, "tbl": 4, "txAndChart": 5, "chartAndTx": 6,
+    "dgm": 7, "chart": 8, "txAndClipArt": 9, "clipArtAndTx": 10, "titleOnly": 11,
+    "blank": 12, "txAndObj": 13, "objAndTx": 14, "objOnly": 15, "obj": 16,
+    "txAndMedia": 17, "mediaAndTx": 18, "objOverTx": 19, "txOverObj": 20,
+    "txAndTwoObj": 21, "twoObjAndTx": 22, "twoObjOverTx": 23, "fourObj": 24,
+    "vertTx": 25, "clipArtAndVertTx": 26, "vertTitleAndTx": 27,
+    "vertTitleAndTxOverChart": 28, "twoObj": 29, "objAndTwoObj": 30,
+    "twoObjAndObj": 31, "cust": 32, "secHead": 33, "twoTxTwoObj": 34,
+    "objTx": 35, "picTx": 36,
+}
+
+# <a:buAutoNum type> -> PpNumberedBulletStyle (BULLET_STYLE_MAP key)
+AUTONUM_STYLE_CODES = {
+    "alphaLcPeriod": 1, "alphaUcPeriod": 2, "arabicParenR": 3, "arabicPeriod": 4,
+    "romanLcParenBoth": 5, "romanLcPeriod": 6, "romanUcPeriod": 7,
+    "alphaLcParenBoth": 8, "alphaLcParenR": 9, "alphaUcParenBoth": 10,
+    "alphaUcParenR": 11, "arabicParenBoth": 12, "arabicPlain": 13,
+    "romanLcParenR": 14, "romanUcParenBoth": 15, "romanUcParenR": 16,
+}
+
+# <p:transition> 효과 → PpEntryEffect (자주 쓰는 것만, 나머지는 태그 이름 그대로)
+TRANSITION_EFFECTS = {"cut": 257, "random": 513, "dissolve": 1537, "fade": 1793}
+
+FILL_TYPES = {
+    "solidFill": "Solid", "pattFill": "Pattern", "gradFill": "Gradient", "blipFill": "Picture",
+}
+
+# XlChartType
+CHART_TYPES = {
+    ("barChart", "col", "clustered"): 51, ("barChart", "col", "stacked"): 52,
+    ("barChart", "col", "percentStacked"): 53, ("barChart", "bar", "clustered"): 57,
+    ("barChart", "bar", "stacked"): 58, ("barChart", "bar", "percentStacked"): 59,
+    "lineChart": 4, "pieChart": 5, "areaChart": 1, "doughnutChart": -4120,
+    "scatterChart": -4169, "radarChart": -4151, "bubbleChart": 15,
+}
+
+TITLE_PH_TYPES = ("title", "ctrTitle")
+OTHER_PH_TYPES = ("dt", "ftr", "sldNum", "hdr")
+
+DEFAULT_FONT_SIZE = 18.0
+
+
+def _f32(value: float) -> float:
+    """COM Single과 같은 값 (float32 왕복)"""
+    return struct.unpack("f", struct.pack("f", value))[0]
+
+
+def _pt(emu) -> float:
+    return _f32(int(emu) / EMU_PER_POINT)
+
+
+def _roman(n: int) -> str:
+    out = ""
+    for value, numeral in ((1000, "M"), (900, "CM"), (500, "D"), (400, "CD"), (100, "C"), (90, "XC"),
+                           (50, "L"), (40, "XL"), (10, "X"), (9, "IX"), (5, "V"), (4, "IV"), (1, "I")):
+        while n >= value:
+            out += numeral
+            n -= value
+    return out
+
+
+def _list_label(fmt: str, c: int) -> str:
+    """BULLET_STYLE_MAP 예시 포맷 ("1.", "(a)", "i.") → c번째 라벨"""
+    if "1" in fmt:
+        return fmt.replace("1", str(c))
+    if "a" in fmt:
+        return fmt.replace("a", chr(96 + (c % 26 or 26)))
+    if "A" in fmt:
+        return fmt.replace("A", chr(64 + (c % 26 or 26)))
+    if "i" in fmt:
+        return fmt.replace("i", _roman(c).lower())
+    if "I" in fmt:
+        return fmt.replace("I", _roman(c))
+    return fmt
+
+
+def _to_linear(c: float) -> float:
+    return c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+
+
+def _to_srgb(c: float) -> float:
+    return c * 12.92 if c <= 0.0031308 else 1.055 * c ** (1 / 2.4) - 0.055
+
+
+def _apply_color_transforms(rgb: tuple, color_el) -> tuple:
+    """lumMod / lumOff / satMod는 HSL, tint / shade는 linear RGB에서 적용 (PowerPoint와 동일)"""
+    rgb = [v / 255 for v in rgb]
+    for t in color_el:
+        name = t.tag[len(A):] if t.tag.startswith(A) else None
+        val = t.get("val")
+        if name is None or val is None:
+            continue
+        v = int(val) / 100000
+        if name in ("tint", "shade"):
+            linear = [_to_linear(c) for c in rgb]
+            if name == "tint":
+                linear = [1 - (1 - c) * v for c in linear]
+            else:
+                linear = [c * v for c in linear]
+            rgb = [_to_srgb(min(max(c, 0.0), 1.0)) for c in linear]
+        elif name in ("lumMod", "lumOff", "satMod"):
+            h, l, s = colorsys.rgb_to_hls(*rgb)
+            if name == "lumMod":
+                l *= v
+            elif name == "lumOff":
+                l += v
+            else:
+                s *= v
+            rgb = list(colorsys.hls_to_rgb(h, min(max(l, 0.0), 1.0), min(max(s, 0.0), 1.0)))
+    return tuple(int(round(min(max(c, 0.0), 1.0) * 255)) for c in rgb)
+
+
+def _hex_rgb(value: str) -> tuple:
+    return int(value[0:2], 16), int(value[2:4], 16), int(value[4:6], 16)
+
+
+def _alternate_choice(el):
+    """mc:AlternateContent → Choice(없으면 Fallback)의 첫 자식"""
+    for branch in (MC + "Choice", MC + "Fallback"):
+        node = el.find(branch)
+        if node is not None and len(node):
+            return node[0]
+    return None
+
+
+class _Part:
+    """zip 안의 XML part 하나 (rels 포함)"""
+
+    def __init__(self, package, name: str):
+        self.package = package
+        self.name = name
+        self._root = None
+        self._rels = None
+
+    @property
+    def root(self):
+        if self._root is None:
+            self._root = ET.fromstring(self.package.zip.read(self.name))
+        return self._root
+
+    @property
+    def rels(self) -> dict:
+        """rId -> (type 접미사, 절대 part 경로 또는 외부 URL)"""
+        if self._rels is None:
+            self._rels = {}
+            folder, base = posixpath.split(self.name)
+            rels_name = posixpath.join(folder, "_rels", base + ".rels")
+            if rels_name in self.package.names:
+                for rel in ET.fromstring(self.package.zip.read(rels_name)).iter(PKG_REL + "Relationship"):
+                    target = rel.get("Target")
+                    if rel.get("TargetMode") != "External":
+                        target = posixpath.normpath(posixpath.join(folder, target))
+                    self._rels[rel.get("Id")] = (rel.get("Type").rsplit("/", 1)[-1], target)
+        return self._rels
+
+    def rel_target(self, rel_type: str):
+        for kind, target in self.rels.values():
+            if kind == rel_type:
+                return target
+        return None
+
+
+class _Placeholders:
+    """layout/master placeholder 색인 (idx, type)"""
+
+    def __init__(self, root):
+        self.by_idx = {}
+        self.by_type = {}
+        sp_tree = root.find(f"{P}cSld/{P}spTree")
+        for el in sp_tree.iter() if sp_tree is not None else ():
+            ph = el.find(f"./*/{P}nvPr/{P}ph")
+            if ph is None:
+                continue
+            ph_type = ph.get("type", "obj")
+            idx = int(ph.get("idx", 0))
+            self.by_idx.setdefault(idx, el)
+            self.by_type.setdefault(ph_type, el)
+
+    def match(self, ph_type: str, idx: int):
+        if idx and idx in self.by_idx:
+            return self.by_idx[idx]
+        if ph_type in self.by_type:
+            return self.by_type[ph_type]
+        if ph_type in TITLE_PH_TYPES:
+            return self.by_type.get("title") or self.by_type.get("ctrTitle")
+        return None
+
+    def match_master(self, ph_type: str):
+        """layout → master: title / body / dt / ftr / sldNum"""
+        if ph_type in TITLE_PH_TYPES:
+            return self.by_type.get("title")
+        if ph_type in OTHER_PH_TYPES:
+            return self.by_type.get(ph_type)
+        return self.by_type.get("body")
+
+
+class _ShapeStyle:
+    """
+    shape 하나의 텍스트 스타일 chain (가장 구체적인 것부터).
+    list_styles[0]은 shape 자신의 lstStyle, font_ref는 <p:style><a:fontRef>
+    (자신의 lstStyle 다음, 상속된 스타일보다 우선).
+    """
+
+    def __init__(self, list_styles: list, font_ref=None):
+        self.list_styles = list_styles
+        self.font_ref = font_ref if font_ref is not None and len(font_ref) else None
+
+    def level_props(self, lvl: int) -> list:
+        tag = f"{A}lvl{lvl + 1}pPr"
+        return [el for el in (ls.find(tag) for ls in self.list_styles if ls is not None) if el is not None]
+
+    def default_rprs(self, lvl: int) -> list:
+        tag = f"{A}lvl{lvl + 1}pPr"
+        out = []
+        for i, ls in enumerate(self.list_styles):
+            if i == 1 and self.font_ref is not None:
+                out.append(_Wrap(self.font_ref))
+            level = ls.find(tag) if ls is not None else None
+            if level is not None:
+                out.append(level.find(A + "defRPr"))
+        return out
+
+
+class OoxmlPresentation:
+    """
+    .pptx 파일 하나. parse_slide(n)은 parse_active_slide_objects(n, prs)와
+    같은 형식의 dict를 반환한다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.zip = zipfile.ZipFile(path)
+        self.names = set(self.zip.namelist())
+        self._parts = {}
+
+        pres_name = self._main_part_name()
+        self.presentation = self.part(pres_name)
+        root = self.presentation.root
+
+        self.slide_parts = [
+            self.presentation.rels[sld.get(R + "id")][1]
+            for sld in root.iterfind(f"{P}sldIdLst/{P}sldId")
+        ]
+        size = root.find(P + "sldSz")
+        self.slide_width = _pt(size.get("cx"))
+        self.slide_height = _pt(size.get("cy"))
+        self.default_text_style = root.find(P + "defaultTextStyle")
+        self._masters = {}
+        self._layouts = {}
+
+    # ---- package ----
+    def _main_part_name(self) -> str:
+        rels = ET.fromstring(self.zip.read("_rels/.rels"))
+        for rel in rels.iter(PKG_REL + "Relationship"):
+            if rel.get("Type").endswith("/officeDocument"):
+                return rel.get("Target").lstrip("/")
+        raise ValueError(f"{self.path}: no presentation part")
+
+    def part(self, name: str) -> _Part:
+        part = self._parts.get(name)
+        if part is None:
+            part = self._parts[name] = _Part(self, name)
+        return part
+
+    def close(self):
+        self.zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def slide_count(self) -> int:
+        return len(self.slide_parts)
+
+    # ---- master / layout / theme ----
+    def _master(self, name: str) -> dict:
+        master = self._masters.get(name)
+        if master is not None:
+            return master
+        part = self.part(name)
+        root = part.root
+        theme = self.part(part.rel_target("theme")).root
+        scheme = theme.find(f"{A}themeElements/{A}clrScheme")
+        colors = {}
+        for el in scheme:
+            child = el[0]
+            value = child.get("lastClr") if child.tag == A + "sysClr" else child.get("val")
+            colors[el.tag[len(A):]] = _hex_rgb(value or "000000")
+        fonts = theme.find(f"{A}themeElements/{A}fontScheme")
+        tx_styles = root.find(P + "txStyles")
+        fmt_scheme = theme.find(f"{A}themeElements/{A}fmtScheme")
+        master = self._masters[name] = {
+            "part": part,
+            "colors": colors,
+            "clr_map": dict(root.find(P + "clrMap").attrib),
+            "major": fonts.find(f"{A}majorFont/{A}latin").get("typeface"),
+            "minor": fonts.find(f"{A}minorFont/{A}latin").get("typeface"),
+            "title_style": tx_styles.find(P + "titleStyle"),
+            "body_style": tx_styles.find(P + "bodyStyle"),
+            "other_style": tx_styles.find(P + "otherStyle"),
+            "placeholders": _Placeholders(root),
+            "layout_ids": [
+                part.rels[el.get(R + "id")][1]
+                for el in root.iterfind(f"{P}sldLayoutIdLst/{P}sldLayoutId")
+            ],
+            "bg_fills": fmt_scheme.find(A + "bgFillStyleLst") if fmt_scheme is not None else None,
+            "fills": fmt_scheme.find(A + "fillStyleLst") if fmt_scheme is not None else None,
+        }
+        return master
+
+    def _layout(self, name: str) -> dict:
+        layout = self._layouts.get(name)
+        if layout is None:
+            part = self.part(name)
+            layout = self._layouts[name] = {
+                "part": part,
+                "master": self._master(part.rel_target("slideMaster")),
+                "placeholders": _Placeholders(part.root),
+            }
+        return layout
+
+    # ---- colors / fonts ----
+    def _scheme_rgb(self, master: dict, name: str) -> tuple:
+        name = master["clr_map"].get(name, name)
+        return master["colors"].get(name, (0, 0, 0))
+
+    def _color(self, master: dict, fill_parent):
+        """solidFill 등 fill을 가진 요소 → (r, g, b) 또는 None"""
+        fill = fill_parent.find(A + "solidFill")
+        if fill is None:
+            fill = fill_parent.find(f"{A}gradFill/{A}gsLst/{A}gs")
+        if fill is None or not len(fill):
+            return None
+        el = fill[0]
+        tag = el.tag[len(A):]
+        if tag == "srgbClr":
+            rgb = _hex_rgb(el.get("val"))
+        elif tag == "schemeClr":
+            name = el.get("val")
+            rgb = self._scheme_rgb(master, "tx1" if name == "phClr" else name)
+        elif tag == "sysClr":
+            rgb = _hex_rgb(el.get("lastClr", "000000"))
+        elif tag == "scrgbClr":
+            rgb = tuple(int(round(int(el.get(k)) / 100000 * 255)) for k in ("r", "g", "b"))
+        else:
+            return None
+        return _apply_color_transforms(rgb, el)
+
+    def _typeface(self, master: dict, typeface: str) -> str:
+        if typeface and typeface.startswith("+mj"):
+            return master["major"]
+        if typeface and typeface.startswith("+mn"):
+            return master["minor"]
+        return typeface
+
+    # ---- slides ----
+    def parse_all(self) -> dict:
+        return {n: self.parse_slide(n) for n in range(1, self.slide_count + 1)}
+
+    def parse_slide(self, slide_num: int) -> dict:
+        output = {
+            "Presentation_Name": os.path.basename(self.path),
+            "Total_Slide_Number": self.slide_count,
+            "Current_Slide_Number": slide_num,
+            "Slide Width": self.slide_width,
+            "Slide Height": self.slide_height,
+        }
+        if slide_num < 1 or slide_num > self.slide_count:
+            return {"status": f"Invalid slide number (1~{self.slide_count})"}
+
+        slide = self.part(self.slide_parts[slide_num - 1])
+        layout = self._layout(slide.rel_target("slideLayout"))
+        ctx = {"slide": slide, "layout": layout, "master": layout["master"]}
+
+        shapes = []
+        background = None
+        transition = None
+        with self.zip.open(slide.name) as stream:
+            for kind, el in _iter_slide(stream):
+                if kind == "shape":
+                    info = self._shape_info(el, ctx, None)
+                    if info is not None:
+                        shapes.append(info)
+                elif kind == "bg":
+                    background = _fill_kind(el, ctx["master"])
+                elif kind == "transition" and transition is None:
+                    transition = _transition(el)
+                el.clear()
+
+        output["Slide_Properties"] = self._slide_properties(ctx, background, transition)
+        output["Objects_Overview"] = f"Found {len(shapes)} objects"
+        output["Objects_Detail"] = []
+        for i, info in enumerate(shapes, start=1):
+            more_detail = info.pop("More_detail")
+            output["Objects_Detail"].append({"Object_number": i, **info, "More_detail": more_detail})
+        output["Slide_Notes"] = self._slide_notes(slide, ctx)
+        return output
+
+    def _slide_properties(self, ctx: dict, background, transition) -> dict:
+        layout_root = ctx["layout"]["part"].root
+        master = ctx["master"]
+        layout_name = ctx["layout"]["part"].name
+
+        if background is None:
+            for root in (layout_root, master["part"].root):
+                bg = root.find(f"{P}cSld/{P}bg")
+                if bg is not None:
+                    background = _fill_kind(bg, master)
+                    break
+
+        result = {
+            "Slide Layout Code": LAYOUT_TYPE_CODES.get(layout_root.get("type", "cust"), 32),
+            "CustomLayout Name": layout_root.find(P + "cSld").get("name", ""),
+            "CustomLayout Index": (
+                master["layout_ids"].index(layout_name) + 1
+                if layout_name in master["layout_ids"] else None
+            ),
+            "Background Fill Type": background or "Solid",
+        }
+        result.update(transition or {
+            "Transition Effect": 0,
+            "Advance Time (s)": 0.0,
+            "Advance On Click": True,
+            "Advance On Time": False,
+        })
+        return result
+
+    def _slide_notes(self, slide: _Part, ctx: dict) -> dict:
+        notes_name = slide.rel_target("notesSlide")
+        if notes_name is None:
+            return {"Has Notes Page": False, "Notes Content": None}
+
+        notes = self.part(notes_name)
+        sp_tree = notes.root.find(f"{P}cSld/{P}spTree")
+        shapes = [el for el in sp_tree if el.tag in SHAPE_TAGS]
+        texts = []
+        for el in shapes:
+            ph = el.find(f"./*/{P}nvPr/{P}ph")
+            body = el.find(P + "txBody")
+            if ph is not None and ph.get("type") == "body" and body is not None:
+                text = "\r".join(
+                    "".join(segment for segment, _ in _paragraph_segments(p)) for p in body.iter(A + "p")
+                )
+                if text:
+                    texts.append(text)
+        return {
+            "Has Notes Page": True,
+            "Notes Shapes Count": len(shapes),
+            "Notes Content": "".join(texts) if texts else None,
+        }
+
+    # ---- shapes ----
+    def _inherited(self, el, ctx: dict):
+        """placeholder면 (layout ph, master ph, ph type), 아니면 (None, None, None)"""
+        ph = el.find(f"./*/{P}nvPr/{P}ph")
+        if ph is None:
+            return None, None, None
+        ph_type = ph.get("type", "obj")
+        layout_ph = ctx["layout"]["placeholders"].match(ph_type, int(ph.get("idx", 0)))
+        master_type = ph_type
+        if layout_ph is not None:
+            layout_inner = layout_ph.find(f"./*/{P}nvPr/{P}ph")
+            master_type = layout_inner.get("type", "obj")
+        master_ph = ctx["master"]["placeholders"].match_master(master_type)
+        return layout_ph, master_ph, ph_type
+
+    def _geometry(self, el, inherited, transform):
+        xfrm = _xfrm(el)
+        if xfrm is None:
+            for base in inherited:
+                if base is not None and _xfrm(base) is not None:
+                    xfrm = _xfrm(base)
+                    break
+        if xfrm is None:
+            x = y = cx = cy = 0
+        else:
+            off, ext = xfrm.find(A + "off"), xfrm.find(A + "ext")
+            x, y = int(off.get("x")), int(off.get("y"))
+            cx, cy = int(ext.get("cx")), int(ext.get("cy"))
+        if transform is not None:
+            x, y, cx, cy = transform(x, y, cx, cy)
+        return {
+            "Position_Left": _pt(x),
+            "Position_Top": _pt(y),
+            "Size_Width": _pt(cx),
+            "Size_Height": _pt(cy),
+        }
+
+    def _shape_type(self, el) -> int:
+        tag = el.tag
+        if el.find(f"./*/{P}nvPr/{P}ph") is not None:
+            return 14
+        if tag == P + "grpSp":
+            return 6
+        if tag == P + "pic":
+            return 13
+        if tag == P + "graphicFrame":
+            data = el.find(f"{A}graphic/{A}graphicData")
+            return GRAPHIC_URI_TYPES.get(data.get("uri") if data is not None else None, 1)
+        if tag == P + "cxnSp":
+            geom = el.find(f"{P}spPr/{A}prstGeom")
+            return 9 if geom is None or geom.get("prst") in ("line", "straightConnector1") else 1
+        c_nv_sp = el.find(f"{P}nvSpPr/{P}cNvSpPr")
+        if c_nv_sp is not None and c_nv_sp.get("txBox") == "1":
+            return 17
+        if el.find(f"{P}spPr/{A}custGeom") is not None:
+            return 5
+        geom = el.find(f"{P}spPr/{A}prstGeom")
+        if geom is not None and geom.get("prst") == "line":
+            return 9
+        return 1
+
+    def _shape_info(self, el, ctx: dict, transform):
+        if el.tag == MC + "AlternateContent":
+            el = _alternate_choice(el)
+            if el is None or el.tag not in SHAPE_TAGS:
+                return None
+        c_nv_pr = el.find(f"./*/{P}cNvPr")
+        if c_nv_pr is None:
+            return None
+
+        layout_ph, master_ph, ph_type = self._inherited(el, ctx)
+        stype = self._shape_type(el)
+        info = {
+            "Shape_Id": int(c_nv_pr.get("id")),
+            "Name": c_nv_pr.get("name", ""),
+            "Type": SHAPE_TYPE_MAP.get(stype, stype),
+            **self._geometry(el, (layout_ph, master_ph), transform),
+        }
+
+        more_detail = {}
+        text = self._text_detail(el, ctx, layout_ph, master_ph, ph_type)
+        if text:
+            more_detail["Text"] = text
+
+        if stype == 6:
+            more_detail["Group"] = {"Items": self._group_items(el, ctx, transform)}
+        elif stype == 13:
+            more_detail["Picture"] = {"AlternativeText": c_nv_pr.get("descr", "")}
+        elif stype == 3:
+            more_detail["Chart"] = self._chart(el, ctx)
+        elif stype == 19:
+            more_detail["Table"] = _table_dims(el)
+
+        info["More_detail"] = more_detail
+        return info
+
+    def _group_items(self, el, ctx: dict, transform) -> list:
+        """parse_group_shapes() 형식 (GroupItems 좌표는 슬라이드 기준)"""
+        xfrm = el.find(f"{P}grpSpPr/{A}xfrm")
+        if xfrm is not None:
+            off, ext = xfrm.find(A + "off"), xfrm.find(A + "ext")
+            ch_off, ch_ext = xfrm.find(A + "chOff"), xfrm.find(A + "chExt")
+            ox, oy = int(off.get("x")), int(off.get("y"))
+            cx, cy = int(ext.get("cx")), int(ext.get("cy"))
+            chx, chy = int(ch_off.get("x")), int(ch_off.get("y"))
+            chcx, chcy = int(ch_ext.get("cx")), int(ch_ext.get("cy"))
+            sx = cx / chcx if chcx else 1.0
+            sy = cy / chcy if chcy else 1.0
+
+            def child_transform(x, y, w, h):
+                x, y, w, h = ox + (x - chx) * sx, oy + (y - chy) * sy, w * sx, h * sy
+                if transform is not None:
+                    return transform(x, y, w, h)
+                return x, y, w, h
+        else:
+            child_transform = transform
+
+        items = []
+        for child in el:
+            if child.tag not in SHAPE_TAGS:
+                continue
+            info = self._shape_info(child, ctx, child_transform)
+            if info is None:
+                continue
+            more_detail = info.pop("More_detail")
+            if "Text" in more_detail:
+                info["Text"] = more_detail["Text"]
+            if "Group" in more_detail:
+                info["GroupItems"] = more_detail["Group"]["Items"]
+            for key in ("Picture", "Chart", "Table"):
+                if key in more_detail:
+                    info[key] = more_detail[key]
+            items.append(info)
+        return items
+
+    def _chart(self, el, ctx: dict) -> dict:
+        ref = el.find(f"{A}graphic/{A}graphicData/{C}chart")
+        target = ctx["slide"].rels.get(ref.get(R + "id")) if ref is not None else None
+        if target is None or target[1] not in self.names:
+            return {"ChartType": None, "HasTitle": False}
+        chart = self.part(target[1]).root.find(C + "chart")
+        chart_type = None
+        plot_area = chart.find(C + "plotArea")
+        for plot in plot_area if plot_area is not None else ():
+            kind = plot.tag[len(C):]
+            if kind == "barChart":
+                bar_dir = plot.find(C + "barDir")
+                grouping = plot.find(C + "grouping")
+                chart_type = CHART_TYPES.get((
+                    kind,
+                    bar_dir.get("val") if bar_dir is not None else "col",
+                    grouping.get("val") if grouping is not None else "clustered",
+                ))
+                break
+            if kind in CHART_TYPES:
+                chart_type = CHART_TYPES[kind]
+                break
+        deleted = chart.find(C + "autoTitleDeleted")
+        has_title = chart.find(C + "title") is not None and not (
+            deleted is not None and deleted.get("val") in ("1", "true")
+        )
+        return {"ChartType": chart_type, "HasTitle": has_title}
+
+    # ---- text ----
+    def _shape_style(self, el, ctx: dict, layout_ph, master_ph, ph_type) -> _ShapeStyle:
+        master = ctx["master"]
+        own = el.find(f"{P}txBody/{A}lstStyle")
+        if ph_type is None:
+            font_ref = el.find(f"{P}style/{A}fontRef")
+            return _ShapeStyle([own, self.default_text_style, master["other_style"]], font_ref)
+
+        if ph_type in TITLE_PH_TYPES:
+            master_style = master["title_style"]
+        elif ph_type in OTHER_PH_TYPES:
+            master_style = master["other_style"]
+        else:
+            master_style = master["body_style"]
+        chain = [own]
+        for base in (layout_ph, master_ph):
+            if base is not None:
+                chain.append(base.find(f"{P}txBody/{A}lstStyle"))
+        chain.append(master_style)
+        return _ShapeStyle(chain)
+
+    def _resolve_font(self, ctx: dict, rpr_chain: list) -> dict:
+        master = ctx["master"]
+        name = size = color = None
+        bold = italic = underline = False
+        baseline = 0
+        found = set()
+        for rpr in rpr_chain:
+            if rpr is None:
+                continue
+            if "sz" not in found and rpr.get("sz") is not None:
+                size = int(rpr.get("sz")) / 100
+                found.add("sz")
+            for attr in ("b", "i", "u", "baseline"):
+                value = rpr.get(attr)
+                if attr in found or value is None:
+                    continue
+                found.add(attr)
+                if attr == "b":
+                    bold = value in ("1", "true")
+                elif attr == "i":
+                    italic = value in ("1", "true")
+                elif attr == "u":
+                    underline = value != "none"
+                else:
+                    baseline = int(value)
+            if "latin" not in found:
+                latin = rpr.find(A + "latin")
+                if latin is not None and latin.get("typeface"):
+                    name = self._typeface(master, latin.get("typeface"))
+                    found.add("latin")
+            if "color" not in found:
+                rgb = self._color(master, rpr)
+                if rgb is not None:
+                    color = rgb
+                    found.add("color")
+                elif rpr.find(A + "noFill") is not None:
+                    found.add("color")
+
+        if "color" not in found:
+            color = self._scheme_rgb(master, "tx1")
+
+        font = {
+            "Name": name or master["minor"],
+            "Size": float(size if size is not None else DEFAULT_FONT_SIZE),
+        }
+        if bold:
+            font["Bold"] = True
+        if italic:
+            font["Italic"] = True
+        if underline:
+            font["Underline"] = True
+        if baseline < 0:
+            font["Subscript"] = True
+        elif baseline > 0:
+            font["Superscript"] = True
+        if color is not None:
+            font["Color"] = {"R": color[0], "G": color[1], "B": color[2]}
+        return font
+
+    def _text_detail(self, el, ctx: dict, layout_ph, master_ph, ph_type):
+        body = el.find(P + "txBody")
+        if body is None:
+            return None
+        paragraphs = body.findall(A + "p")
+        style = self._shape_style(el, ctx, layout_ph, master_ph, ph_type)
+        slide_rels = ctx["slide"].rels
+
+        segments = []   # (text, font, hyperlink)
+        para_texts = []
+        para_props = []
+        for p_index, p in enumerate(paragraphs):
+            ppr = p.find(A + "pPr")
+            lvl = int(ppr.get("lvl", 0)) if ppr is not None else 0
+            level_props = style.level_props(lvl)
+            def_rprs = [ppr.find(A + "defRPr") if ppr is not None else None] + style.default_rprs(lvl)
+
+            text = ""
+            for piece, rpr in _paragraph_segments(p):
+                hyperlink = None
+                link = rpr.find(A + "hlinkClick") if rpr is not None else None
+                if link is not None and link.get(R + "id") in slide_rels:
+                    hyperlink = slide_rels[link.get(R + "id")][1]
+                segments.append((piece, self._resolve_font(ctx, [rpr] + def_rprs), hyperlink))
+                text += piece
+
+            if p_index < len(paragraphs) - 1:
+                end_rpr = p.find(A + "endParaRPr")
+                if end_rpr is None:
+                    runs = p.findall(A + "r")
+                    end_rpr = runs[-1].find(A + "rPr") if runs else None
+                segments.append(("\r", self._resolve_font(ctx, [end_rpr] + def_rprs), None))
+                text += "\r"
+            para_texts.append(text)
+            para_props.append((lvl, [ppr] + level_props))
+
+        full = "".join(para_texts)
+        if not full:
+            return None
+
+        runs = _merge_segments(segments)
+        frame = {"Has Text": True, "Text": full, "Runs": runs,
+                 "Paragraphs": _paragraph_bullets(para_texts, para_props)}
+        links = {link for _, _, link in segments}
+        if len(links) == 1 and None not in links:
+            frame["Hyperlink"] = links.pop()
+        return {"TextFrame": frame}
+
+
+class _Wrap:
+    """fontRef처럼 색 요소를 직접 자식으로 가진 요소를 색만 있는 rPr처럼 보이게 한다."""
+
+    def __init__(self, el):
+        self.el = el
+
+    def get(self, attr, default=None):
+        return default
+
+    def find(self, tag):
+        return self.el if tag == A + "solidFill" else None
+
+
+def _iter_slide(stream):
+    """
+    slide XML을 iterparse로 스트리밍.
+    spTree 직속 shape, 배경, 전환 효과 요소가 닫힐 때마다 (kind, element)를 넘긴다.
+    """
+    stack = []
+    for event, el in ET.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            stack.append(el.tag)
+            continue
+        stack.pop()
+        parent = stack[-1] if stack else None
+        if parent == P + "spTree" and el.tag in SHAPE_TAGS:
+            yield "shape", el
+        elif el.tag == P + "bg" and parent == P + "cSld":
+            yield "bg", el
+        elif el.tag == P + "transition":
+            yield "transition", el
+
+
+def _xfrm(el):
+    for path in (f"{P}spPr/{A}xfrm", f"{P}grpSpPr/{A}xfrm", f"{P}xfrm"):
+        xfrm = el.find(path)
+        if xfrm is not None and xfrm.find(A + "off") is not None:
+            return xfrm
+    return None
+
+
+def _fill_kind(bg, master: dict):
+    bg_pr = bg.find(P + "bgPr")
+    if bg_pr is not None:
+        for child in bg_pr:
+            kind = child.tag[len(A):]
+            if kind in FILL_TYPES:
+                return FILL_TYPES[kind]
+        return None
+    bg_ref = bg.find(P + "bgRef")
+    if bg_ref is not None:
+        idx = int(bg_ref.get("idx", 0))
+        styles = master["bg_fills"] if idx >= 1001 else master["fills"]
+        pos = idx - 1001 if idx >= 1001 else idx - 1
+        if styles is not None and 0 <= pos < len(styles):
+            return FILL_TYPES.get(styles[pos].tag[len(A):])
+    return None
+
+
+def _transition(el) -> dict:
+    effect = 0
+    for child in el:
+        name = child.tag.rsplit("}", 1)[-1]
+        effect = TRANSITION_EFFECTS.get(name, name)
+        break
+    adv_tm = el.get("advTm")
+    return {
+        "Transition Effect": effect,
+        "Advance Time (s)": int(adv_tm) / 1000 if adv_tm is not None else 0.0,
+        "Advance On Click": el.get("advClick", "1") not in ("0", "false"),
+        "Advance On Time": adv_tm is not None,
+    }
+
+
+def _table_dims(el) -> dict:
+    tbl = el.find(f"{A}graphic/{A}graphicData/{A}tbl")
+    if tbl is None:
+        return {"Rows": 0, "Columns": 0}
+    return {
+        "Rows": len(tbl.findall(A + "tr")),
+        "Columns": len(tbl.findall(f"{A}tblGrid/{A}gridCol")),
+    }
+
+
+def _paragraph_segments(p):
+    """a:p → [(text, rPr)] (a:br는 COM과 같이 \\v)"""
+    out = []
+    for child in p:
+        tag = child.tag
+        if tag in (A + "r", A + "fld"):
+            t = child.find(A + "t")
+            text = t.text if t is not None and t.text else ""
+            if text:
+                out.append((text, child.find(A + "rPr")))
+        elif tag == A + "br":
+            out.append(("\v", child.find(A + "rPr")))
+        elif tag.endswith("}m"):
+            # a14:m (수식) — m:t 텍스트만 이어붙인다
+            text = "".join(t.text or "" for t in child.iter(MATH + "t"))
+            if text:
+                out.append((text, None))
+    return out
+
+
+def _snap_key(font: dict, hyperlink) -> tuple:
+    """utils.snap()과 같은 비교 키 (Strikethrough는 COM Font에 없어 항상 False)"""
+    color = font.get("Color")
+    return (
+        font.get("Name"),
+        round(font.get("Size", 0.0), 1),
+        bool(font.get("Bold")),
+        bool(font.get("Italic")),
+        bool(font.get("Underline")),
+        (color["R"], color["G"], color["B"]) if color else None,
+        False,
+        bool(font.get("Subscript")),
+        bool(font.get("Superscript")),
+    )
+
+
+def _merge_segments(segments: list) -> list:
+    runs = []
+    offset = 0
+    last_key = None
+    for text, font, hyperlink in segments:
+        key = _snap_key(font, hyperlink)
+        if runs and key == last_key:
+            runs[-1]["Text"] += text
+            if runs[-1].get("Hyperlink") != hyperlink:
+                runs[-1].pop("Hyperlink", None)
+        else:
+            run = {"Text": text, "Font": dict(font)}
+            if hyperlink:
+                run["Hyperlink"] = hyperlink
+            run["Run_Start_Index"] = offset
+            runs.append(run)
+            last_key = key
+        offset += len(text)
+    return runs
+
+
+def _paragraph_bullets(para_texts: list, para_props: list) -> list:
+    """parse_paragraph_bullets()와 같은 형식"""
+    result = []
+    style_counters = {}
+    for i, (p_text, (lvl, ppr_chain)) in enumerate(zip(para_texts, para_props), start=1):
+        if not p_text.strip() and i > 1:
+            continue
+
+        bullet = None
+        rel_size = 1.0
+        size_found = False
+        for ppr in ppr_chain:
+            if ppr is None:
+                continue
+            if bullet is None:
+                for tag in ("buNone", "buChar", "buAutoNum", "buBlip"):
+                    el = ppr.find(A + tag)
+                    if el is not None:
+                        bullet = (tag, el)
+                        break
+            if not size_found:
+                size = ppr.find(A + "buSzPct")
+                if size is not None:
+                    rel_size = int(size.get("val")) / 100000
+                    size_found = True
+
+        b_type = {"buChar": 1, "buAutoNum": 2, "buBlip": 3}.get(bullet[0], 0) if bullet else 0
+        para_info = {
+            "ParagraphIndex": i - 1,
+            "Text": p_text,
+            "HasBullet": b_type != 0,
+            "IndentLevel": lvl + 1,
+        }
+
+        if b_type:
+            actual_label = ""
+            style_code = 0
+            if b_type == 2:
+                style_code = AUTONUM_STYLE_CODES.get(bullet[1].get("type"), 4)
+                start_at = int(bullet[1].get("startAt", 1))
+                c = style_counters.get(style_code, start_at - 1) + 1
+                style_counters[style_code] = c
+                actual_label = _list_label(BULLET_STYLE_MAP.get(style_code, ["Standard", "1."])[1], c)
+            elif b_type == 1:
+                char = bullet[1].get("char", "•")
+                actual_label = BULLET_CHAR_MAP.get(ord(char[0]) if char else 8226, [None, "•"])[1]
+            style_info = BULLET_STYLE_MAP.get(style_code, ["Standard", "1."])
+
+            para_info.update({
+                "BulletType": b_type,
+                "ActualLabel": actual_label,
+                "BulletCharacter": style_info[0] if b_type == 2 else "Symbol",
+                "BulletDescription": f"Bullet: {actual_label}",
+                "BulletRelativeSize": rel_size,
+            })
+        result.append(para_info)
+    return result
+
+
+def parse_pptx_slide(path: str, slide_num: int) -> dict:
+    """파일에서 슬라이드 하나 파싱 (parse_active_slide_objects와 같은 형식)"""
+    with OoxmlPresentation(path) as prs:
+        return prs.parse_slide(slide_num)
+
+
+def parse_pptx(path: str) -> dict:
+    """파일 전체 파싱 → {slide_num: parse}"""
+    with OoxmlPresentation(path) as prs:
+        return prs.parse_all()
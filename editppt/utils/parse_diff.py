@@ -0,0 +1,244 @@
+# parse_diff.py
+"""
+Structural diff between two parse_active_slide_objects() snapshots.
+
+- shapes are matched by Shape_Id (added / removed / modified)
+- runs are matched by character offset (Run_Start_Index, or running offset)
+- paragraphs are matched by ParagraphIndex
+- every other field is compared by path ("More_detail.Table.Dimensions.Rows")
+
+Unchanged shapes are skipped with one dict comparison, so a diff costs about
+the same as the old `new_parse == old_parse` check.
+"""
+GEOMETRY_KEYS = ("Position_Left", "Position_Top", "Size_Width", "Size_Height")
+# 번호만 바뀌는 필드 (shape 추가/삭제 시 뒤쪽 shape 전부 바뀜)
+IGNORED_SHAPE_KEYS = ("Object_number",)
+IGNORED_SLIDE_KEYS = ("Objects_Detail", "Objects_Overview")
+# More_detail에서 group 하위 shape이 들어 있는 키 (COM: GroupShapes, bulk/OOXML: Group.Items)
+GROUP_DETAIL_KEYS = ("GroupShapes", "Group")
+
+
+def _index_runs(runs: list) -> dict:
+    """offset -> run (Run_Start_Index가 없으면 텍스트 길이로 누적)"""
+    out = {}
+    offset = 0
+    for run in runs or []:
+        start = run.get("Run_Start_Index", offset)
+        out[start] = run
+        offset = start + len(run.get("Text", ""))
+    return out
+
+
+def _diff_values(old, new, path: str, out: dict):
+    if old == new:
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in list(old) + [k for k in new if k not in old]:
+            _diff_values(old.get(key), new.get(key), f"{path}.{key}" if path else key, out)
+        return
+    out[path] = [old, new]
+
+
+def _diff_text_frame(old: dict, new: dict) -> dict:
+    old = old or {}
+    new = new or {}
+    changes = {}
+
+    if old.get("Text") != new.get("Text"):
+        changes["text"] = [old.get("Text"), new.get("Text")]
+
+    old_runs = _index_runs(old.get("Runs"))
+    new_runs = _index_runs(new.get("Runs"))
+    runs = []
+    for offset in sorted(set(old_runs) | set(new_runs)):
+        o, n = old_runs.get(offset), new_runs.get(offset)
+        if o == n:
+            continue
+        fields = {}
+        _diff_values(o or {}, n or {}, "", fields)
+        fields.pop("Run_Start_Index", None)
+        if fields:
+            runs.append({"offset": offset, "fields": fields})
+    if runs:
+        changes["runs"] = runs
+
+    old_paras = {p.get("ParagraphIndex", i + 1): p for i, p in enumerate(old.get("Paragraphs") or [])}
+    new_paras = {p.get("ParagraphIndex", i + 1): p for i, p in enumerate(new.get("Paragraphs") or [])}
+    paragraphs = []
+    for index in sorted(set(old_paras) | set(new_paras)):
+        o, n = old_paras.get(index), new_paras.get(index)
+        if o == n:
+            continue
+        fields = {}
+        _diff_values(o or {}, n or {}, "", fields)
+        if fields:
+            paragraphs.append({"index": index, "fields": fields})
+    if paragraphs:
+        changes["paragraphs"] = paragraphs
+
+    other = {}
+    _diff_values(
+        {k: v for k, v in old.items() if k not in ("Text", "Runs", "Paragraphs")},
+        {k: v for k, v in new.items() if k not in ("Text", "Runs", "Paragraphs")},
+        "",
+        other,
+    )
+    if other:
+        changes["fields"] = other
+    return changes
+
+
+def _find_text_frame(more_detail: dict):
+    text = (more_detail or {}).get("Text")
+    if isinstance(text, dict):
+        return text.get("TextFrame")
+    return None
+
+
+def _diff_shape(old: dict, new: dict) -> dict:
+    changes = {}
+
+    geometry = {
+        key: [old.get(key), new.get(key)]
+        for key in GEOMETRY_KEYS
+        if old.get(key) != new.get(key)
+    }
+    if geometry:
+        changes["geometry"] = geometry
+
+    old_detail = old.get("More_detail") or {}
+    new_detail = new.get("More_detail") or {}
+    old_frame = _find_text_frame(old_detail)
+    new_frame = _find_text_frame(new_detail)
+    if old_frame != new_frame:
+        changes["text_frame"] = _diff_text_frame(old_frame, new_frame)
+
+    skip = set(GEOMETRY_KEYS) | set(IGNORED_SHAPE_KEYS) | {"More_detail"}
+    fields = {}
+    _diff_values(
+        {k: v for k, v in old.items() if k not in skip},
+        {k: v for k, v in new.items() if k not in skip},
+        "",
+        fields,
+    )
+    # TextFrame 외 More_detail (Table, Picture, Fill, ...)
+    _diff_values(
+        {k: v for k, v in old_detail.items() if k != "Text"},
+        {k: v for k, v in new_detail.items() if k != "Text"},
+        "More_detail",
+        fields,
+    )
+    if fields:
+        changes["fields"] = fields
+    return changes
+
+
+def diff_parses(old_parse: dict, new_parse: dict) -> dict:
+    """
+    Returns:
+        {
+            "added": [Shape_Id, ...],
+            "removed": [Shape_Id, ...],
+            "modified": {Shape_Id: {"geometry", "text_frame", "fields"}},
+            "slide": {path: [old, new]},
+        }
+    """
+    old_parse = old_parse or {}
+    new_parse = new_parse or {}
+    old_shapes = {s.get("Shape_Id"): s for s in old_parse.get("Objects_Detail", [])}
+    new_shapes = {s.get("Shape_Id"): s for s in new_parse.get("Objects_Detail", [])}
+
+    modified = {}
+    for sid, old_shape in old_shapes.items():
+        new_shape = new_shapes.get(sid)
+        if new_shape is None or new_shape == old_shape:
+            continue
+        shape_changes = _diff_shape(old_shape, new_shape)
+        if shape_changes:
+            modified[sid] = shape_changes
+
+    slide = {}
+    _diff_values(
+        {k: v for k, v in old_parse.items() if k not in IGNORED_SLIDE_KEYS},
+        {k: v for k, v in new_parse.items() if k not in IGNORED_SLIDE_KEYS},
+        "",
+        slide,
+    )
+
+    return {
+        "added": [sid for sid in new_shapes if sid not in old_shapes],
+        "removed": [sid for sid in old_shapes if sid not in new_shapes],
+        "modified": modified,
+        "slide": slide,
+    }
+
+
+def group_owner_ids(parse: dict) -> dict:
+    """
+    Shape_Id of a shape inside a group (any depth) → Shape_Id of its top-level group.
+    diff_parses() reports a change inside a group on the top-level group's id.
+    """
+    owners = {}
+
+    def walk(value, owner):
+        if isinstance(value, dict):
+            if value.get("Shape_Id") is not None:
+                owners.setdefault(value["Shape_Id"], owner)
+            for child in value.values():
+                walk(child, owner)
+        elif isinstance(value, list):
+            for child in value:
+                walk(child, owner)
+
+    for shape in (parse or {}).get("Objects_Detail", []):
+        detail = shape.get("More_detail") or {}
+        for key in GROUP_DETAIL_KEYS:
+            walk(detail.get(key), shape.get("Shape_Id"))
+    return owners
+
+
+def has_changes(changes: dict) -> bool:
+    return any(changes.get(key) for key in ("added", "removed", "modified", "slide"))
+
+
+def changed_shape_ids(changes: dict) -> set:
+    return set(changes.get("added", [])) | set(changes.get("removed", [])) | set(changes.get("modified", {}))
+
+
+def _short(value, limit: int = 40) -> str:
+    text = repr(value)
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+def summarize_changes(changes: dict) -> str:
+    """validator 프롬프트용 한 줄 요약 목록."""
+    lines = []
+    for sid in changes.get("added", []):
+        lines.append(f"- shape {sid}: added")
+    for sid in changes.get("removed", []):
+        lines.append(f"- shape {sid}: removed")
+    for sid, shape_changes in changes.get("modified", {}).items():
+        parts = []
+        for key, (old, new) in shape_changes.get("geometry", {}).items():
+            parts.append(f"{key} {_short(old)} -> {_short(new)}")
+        frame = shape_changes.get("text_frame", {})
+        if "text" in frame:
+            parts.append("text changed")
+        for run in frame.get("runs", []):
+            fields = ", ".join(
+                f"{path} {_short(o)} -> {_short(n)}" for path, (o, n) in run["fields"].items() if path != "Text"
+            )
+            if fields:
+                parts.append(f"run@{run['offset']} {fields}")
+        for para in frame.get("paragraphs", []):
+            fields = ", ".join(
+                f"{path} {_short(o)} -> {_short(n)}" for path, (o, n) in para["fields"].items() if path != "Text"
+            )
+            if fields:
+                parts.append(f"paragraph {para['index']} {fields}")
+        for path, (old, new) in {**frame.get("fields", {}), **shape_changes.get("fields", {})}.items():
+            parts.append(f"{path} {_short(old)} -> {_short(new)}")
+        lines.append(f"- shape {sid}: " + "; ".join(parts or ["changed"]))
+    for path, (old, new) in changes.get("slide", {}).items():
+        lines.append(f"- slide {path}: {_short(old)} -> {_short(new)}")
+    return "\n".join(lines) or "- no changes"
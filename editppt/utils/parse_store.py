@@ -0,0 +1,202 @@
+# parse_store.py
+"""
+Whole-deck pre-parse for Parser with the file backend (utils/ooxml_parser.py).
+
+- slides are parsed across a ProcessPoolExecutor; each worker gets a chunk of
+  slides so masters / layouts / theme are loaded once per worker
+- results persist in logfiles/parse_store/<deck_key>.json
+    deck_key  = sha256(STORE_VERSION, shared parts: masters, layouts, themes,
+                slide size, default text style)
+    slide_key = sha256(slide XML, its rels, notes / chart parts)
+  re-opening an unchanged deck loads every slide from disk; after editing one
+  slide on disk only that slide is parsed again
+"""
+import os
+import json
+import time
+import hashlib
+import zipfile
+import posixpath
+from copy import deepcopy
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import xml.etree.ElementTree as ET
+
+from loguru import logger
+
+from editppt.utils.ooxml_parser import OoxmlPresentation, P, R, PKG_REL
+
+
+STORE_ROOT = Path.cwd() / "logfiles" / "parse_store"
+# ooxml_parser 출력 형식이 바뀌면 올려서 기존 store를 무효화
+STORE_VERSION = 1
+SHARED_PART_PREFIXES = ("ppt/slideMasters/", "ppt/slideLayouts/", "ppt/theme/")
+# 슬라이드 번호/덱 이름처럼 저장된 parse가 아니라 현재 덱 기준으로 채우는 필드
+PER_OPEN_FIELDS = ("Presentation_Name", "Total_Slide_Number", "Current_Slide_Number")
+
+
+def _slide_names(zf: zipfile.ZipFile) -> list:
+    """presentation.xml의 sldIdLst 순서대로 slide part 경로"""
+    pres = ET.fromstring(zf.read("ppt/presentation.xml"))
+    rels = ET.fromstring(zf.read("ppt/_rels/presentation.xml.rels"))
+    targets = {
+        rel.get("Id"): posixpath.normpath(posixpath.join("ppt", rel.get("Target")))
+        for rel in rels.iter(PKG_REL + "Relationship")
+    }
+    return [targets[sld.get(R + "id")] for sld in pres.iterfind(f"{P}sldIdLst/{P}sldId")]
+
+
+def _rels_name(part: str) -> str:
+    folder, base = posixpath.split(part)
+    return posixpath.join(folder, "_rels", base + ".rels")
+
+
+def deck_fingerprint(path) -> tuple:
+    """
+    Returns:
+        (deck_key, {slide_num: slide_key})
+    """
+    with zipfile.ZipFile(path) as zf:
+        names = set(zf.namelist())
+
+        deck = hashlib.sha256(f"v{STORE_VERSION}".encode())
+        pres = ET.fromstring(zf.read("ppt/presentation.xml"))
+        for tag in ("sldSz", "defaultTextStyle"):
+            el = pres.find(P + tag)
+            if el is not None:
+                deck.update(ET.tostring(el))
+        for name in sorted(n for n in names if n.startswith(SHARED_PART_PREFIXES)):
+            deck.update(name.encode())
+            deck.update(zf.read(name))
+
+        slide_keys = {}
+        for num, part in enumerate(_slide_names(zf), start=1):
+            h = hashlib.sha256(zf.read(part))
+            rels_name = _rels_name(part)
+            if rels_name in names:
+                rels_bytes = zf.read(rels_name)
+                h.update(rels_bytes)
+                folder = posixpath.dirname(part)
+                # layout은 deck_key에 포함, media는 parse 결과에 영향 없음
+                for rel in ET.fromstring(rels_bytes).iter(PKG_REL + "Relationship"):
+                    if rel.get("TargetMode") == "External" or rel.get("Type").endswith("/slideLayout"):
+                        continue
+                    target = posixpath.normpath(posixpath.join(folder, rel.get("Target")))
+                    if target.endswith(".xml") and target in names:
+                        h.update(zf.read(target))
+            slide_keys[num] = h.hexdigest()
+    return deck.hexdigest(), slide_keys
+
+
+class ParseStore:
+    """<deck_key>.json = {"created_at", "slides": {slide_key: parse}}"""
+
+    def __init__(self, store_dir: Path = STORE_ROOT, max_decks: int = 32):
+        self.store_dir = Path(store_dir)
+        self.max_decks = max_decks
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, deck_key: str) -> Path:
+        return self.store_dir / f"{deck_key}.json"
+
+    def load(self, deck_key: str) -> dict:
+        path = self._path(deck_key)
+        try:
+            record = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Parse store entry unreadable ({path.name}): {e}")
+            return {}
+        os.utime(path, None)
+        return record.get("slides", {})
+
+    def save(self, deck_key: str, slides: dict):
+        path = self._path(deck_key)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({"created_at": time.time(), "slides": slides}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        os.replace(tmp, path)
+        self._evict()
+
+    def _evict(self):
+        files = sorted(self.store_dir.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        for path in files[:max(0, len(files) - self.max_decks)]:
+            path.unlink(missing_ok=True)
+
+    def clear(self):
+        for path in self.store_dir.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+
+def _parse_chunk(path: str, slide_nums: list) -> dict:
+    """worker process: 슬라이드 묶음 파싱"""
+    with OoxmlPresentation(path) as prs:
+        return {num: prs.parse_slide(num) for num in slide_nums}
+
+
+def _chunks(items: list, n: int) -> list:
+    n = max(1, min(n, len(items)))
+    return [items[i::n] for i in range(n)]
+
+
+def preparse_deck(path, store: ParseStore = None, max_workers: int = None, min_parallel: int = 8) -> tuple:
+    """
+    덱 전체를 파일 backend로 파싱. store에 있는 슬라이드는 그대로 읽는다.
+
+    Args:
+        path: .pptx 경로
+        store: ParseStore (None이면 기본 위치)
+        max_workers: worker process 수 (None → os.cpu_count())
+        min_parallel: 파싱할 슬라이드가 이보다 적으면 현재 process에서 파싱
+            (process 기동 비용이 더 큼)
+
+    Returns:
+        ({slide_num: parse}, stats)
+    """
+    t0 = time.perf_counter()
+    path = str(path)
+    store = store or ParseStore()
+    deck_key, slide_keys = deck_fingerprint(path)
+    stored = store.load(deck_key)
+
+    database = {}
+    missing = []
+    used = set()
+    for num, key in slide_keys.items():
+        if key not in stored:
+            missing.append(num)
+            continue
+        # 내용이 같은 슬라이드는 store 항목 하나를 공유 → 번호 필드를 채우기 전에 복사
+        database[num] = deepcopy(stored[key]) if key in used else stored[key]
+        used.add(key)
+
+    workers = 0
+    if missing:
+        max_workers = max_workers or os.cpu_count() or 1
+        if max_workers > 1 and len(missing) >= min_parallel:
+            chunks = _chunks(missing, max_workers)
+            workers = len(chunks)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for parsed in pool.map(_parse_chunk, [path] * workers, chunks):
+                    database.update(parsed)
+        else:
+            database.update(_parse_chunk(path, missing))
+
+        # 현재 덱에 없는 슬라이드는 버리고 저장
+        store.save(deck_key, {slide_keys[num]: database[num] for num in slide_keys})
+
+    name = os.path.basename(path)
+    for num, parse in database.items():
+        parse.update(zip(PER_OPEN_FIELDS, (name, len(slide_keys), num)))
+
+    stats = {
+        "slides": len(slide_keys),
+        "from_store": len(slide_keys) - len(missing),
+        "parsed": len(missing),
+        "workers": workers,
+        "seconds": time.perf_counter() - t0,
+    }
+    return dict(sorted(database.items())), stats
@@ -0,0 +1,139 @@
+# slide_image.py
+"""
+Slide render → image for the vision validator.
+
+- the COM side exports once at a target pixel width (Slide.Export ScaleWidth /
+  ScaleHeight). COM can only export to a file, so that PNG is read into memory
+  once and deleted; everything below works on that one buffer
+- optional crop to the union of the modified shapes' boxes plus a margin
+  (validator prompt already limits its scope to modified / adjacent shapes)
+- re-encode in memory to a lossy format the provider accepts ("auto" keeps the
+  smallest of them)
+"""
+import io
+import math
+
+from PIL import Image
+
+
+MIME_TYPES = {"png": "image/png", "jpeg": "image/jpeg", "webp": "image/webp"}
+# 두 provider 모두 PNG / JPEG / WebP 입력을 받는다
+PROVIDER_FORMATS = {
+    "gpt": ("webp", "jpeg", "png"),
+    "gemini": ("webp", "jpeg", "png"),
+}
+PIL_FORMATS = {"png": "PNG", "jpeg": "JPEG", "webp": "WEBP"}
+
+
+def provider_of(model: str) -> str:
+    return "gemini" if model.startswith("gemini") else "gpt"
+
+
+def crop_region(boxes, slide_width: float, slide_height: float, margin: float = 36.0,
+                max_ratio: float = 0.85):
+    """
+    Args:
+        boxes: [(left, top, width, height), ...] in points
+        max_ratio: 잘라낸 영역이 슬라이드 면적의 이 비율보다 크면 자르지 않는다
+
+    Returns:
+        (left, top, right, bottom) in points, 또는 None (전체 슬라이드)
+    """
+    boxes = [b for b in boxes if all(math.isfinite(v) for v in b)]
+    if not boxes:
+        return None
+    left = max(0.0, min(b[0] for b in boxes) - margin)
+    top = max(0.0, min(b[1] for b in boxes) - margin)
+    right = min(slide_width, max(b[0] + b[2] for b in boxes) + margin)
+    bottom = min(slide_height, max(b[1] + b[3] for b in boxes) + margin)
+    if right <= left or bottom <= top:
+        return None
+    if (right - left) * (bottom - top) > max_ratio * slide_width * slide_height:
+        return None
+    return left, top, right, bottom
+
+
+def _encode(image: Image.Image, image_format: str, quality: int) -> bytes:
+    buffer = io.BytesIO()
+    if image_format == "png":
+        image.save(buffer, "PNG", optimize=True)
+    else:
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        image.save(buffer, PIL_FORMATS[image_format], quality=quality)
+    return buffer.getvalue()
+
+
+def decode_image(png_bytes: bytes) -> Image.Image:
+    image = Image.open(io.BytesIO(png_bytes))
+    image.load()
+    return image
+
+
+def prepare_image(png_bytes: bytes, slide_size: tuple, boxes=None, provider: str = "gpt",
+                  image_format: str = "auto", quality: int = 80, margin: float = 36.0,
+                  max_crop_ratio: float = 0.85, image: Image.Image = None) -> tuple:
+    """
+    Args:
+        png_bytes: Slide.Export 결과
+        image: 이미 decode한 png_bytes (있으면 다시 decode하지 않음)
+        slide_size: (slide_width, slide_height) in points
+        boxes: 수정된 shape의 (left, top, width, height) 목록 (None이면 자르지 않음)
+        image_format: 'auto' | 'webp' | 'jpeg' | 'png'
+
+    Returns:
+        (image_bytes, mime_type, info)
+    """
+    allowed = PROVIDER_FORMATS.get(provider, ("png",))
+    if image_format == "auto":
+        candidates = [f for f in allowed if f != "png"] or ["png"]
+    elif image_format in allowed:
+        candidates = [image_format]
+    else:
+        raise ValueError(f"Image format {image_format!r} not accepted by {provider} (allowed: {allowed})")
+
+    if image is None:
+        image = decode_image(png_bytes)
+    export_size = image.size
+
+    region = crop_region(boxes or [], *slide_size, margin=margin, max_ratio=max_crop_ratio)
+    if region is not None:
+        sx = image.width / slide_size[0]
+        sy = image.height / slide_size[1]
+        image = image.crop((
+            int(region[0] * sx), int(region[1] * sy),
+            math.ceil(region[2] * sx), math.ceil(region[3] * sy),
+        ))
+
+    encoded = {fmt: _encode(image, fmt, quality) for fmt in candidates}
+    image_format = min(encoded, key=lambda fmt: len(encoded[fmt]))
+    data = encoded[image_format]
+
+    info = {
+        "export_size": export_size,
+        "size": image.size,
+        "cropped": region is not None,
+        "format": image_format,
+        "png_bytes": len(png_bytes),
+        "bytes": len(data),
+        "tokens_full": estimate_image_tokens(*export_size, provider),
+        "tokens": estimate_image_tokens(*image.size, provider),
+    }
+    return data, MIME_TYPES[image_format], info
+
+
+def estimate_image_tokens(width: int, height: int, provider: str = "gpt") -> int:
+    """
+    공개된 과금 규칙 기준 근사치.
+    gpt: 2048 박스 → 짧은 변 768로 축소 후 512px 타일당 170 + 85
+    gemini: 양 변 384 이하면 258, 아니면 768px 타일당 258
+    """
+    if provider == "gemini":
+        if width <= 384 and height <= 384:
+            return 258
+        return math.ceil(width / 768) * math.ceil(height / 768) * 258
+    scale = min(1.0, 2048 / max(width, height))
+    width, height = width * scale, height * scale
+    scale = min(1.0, 768 / min(width, height))
+    width, height = width * scale, height * scale
+    return 85 + 170 * math.ceil(width / 512) * math.ceil(height / 512)
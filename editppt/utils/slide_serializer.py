@@ -0,0 +1,243 @@
+# slide_serializer.py
+"""
+Compact prompt serialization of parse_active_slide_objects() output.
+
+The parser dict is kept as-is for tools (slide_json); this module only shrinks
+what goes into LLM prompts:
+- run fonts are deduplicated into a "Styles" table and referenced by id
+- False / None / empty fields are dropped, RGB dicts become "#RRGGBB"
+- geometry is rounded (1 decimal by default)
+- a run's Text is dropped when the frame has a single run (same as frame Text),
+  paragraph Text is always dropped (ParagraphIndex refers into frame Text)
+- diff mode keeps only shapes whose content changed between two parses
+"""
+import json
+
+
+# 프롬프트에 불필요한 필드 (tool 인자에는 원본 dict가 그대로 전달됨)
+DROP_KEYS = ("Object_number", "Objects_Overview", "Presentation_Name", "Total_Slide_Number")
+GEOMETRY_KEYS = (
+    "Position_Left", "Position_Top", "Size_Width", "Size_Height",
+    "Slide Width", "Slide Height", "LeftIndent", "FirstLineIndent",
+)
+# tool 실행 시 agent가 주입하는 인자 (slide 전체 JSON이라 로그/프롬프트에서는 제외)
+INJECTED_TOOL_ARGS = ("slide_json", "agent_request", "style_mapping")
+
+
+def _is_empty(value) -> bool:
+    return value is None or value is False or value == "" or value == [] or value == {}
+
+
+def _color_hex(color: dict) -> str:
+    return "#{:02X}{:02X}{:02X}".format(color.get("R", 0), color.get("G", 0), color.get("B", 0))
+
+
+def _round(value, ndigits):
+    if isinstance(value, float):
+        value = round(value, ndigits)
+        return int(value) if value.is_integer() else value
+    return value
+
+
+class StyleTable:
+    """font dict -> style id ("s1", "s2", ...). 여러 parse가 같은 table을 공유할 수 있다."""
+
+    def __init__(self):
+        self.ids = {}
+        self.styles = {}
+
+    def ref(self, font: dict) -> str:
+        key = json.dumps(font, sort_keys=True, ensure_ascii=False)
+        style_id = self.ids.get(key)
+        if style_id is None:
+            style_id = f"s{len(self.ids) + 1}"
+            self.ids[key] = style_id
+            self.styles[style_id] = font
+        return style_id
+
+
+def _compact_font(font: dict, ndigits: int) -> dict:
+    out = {}
+    for k, v in font.items():
+        if _is_empty(v):
+            continue
+        if k == "Color" and isinstance(v, dict):
+            v = _color_hex(v)
+        out[k] = _round(v, ndigits)
+    return out
+
+
+def _compact_text_frame(frame: dict, styles: StyleTable, ndigits: int) -> dict:
+    out = {}
+    runs = frame.get("Runs") or []
+    for k, v in frame.items():
+        if k in ("Runs", "Has Text") or _is_empty(v):
+            continue
+        if k == "Paragraphs":
+            # 문단 Text는 frame Text와 중복 → index와 bullet/indent 정보만 남긴다
+            v = [_compact(p, styles, ndigits) for p in v]
+            v = [
+                {pk: pv for pk, pv in p.items() if pk != "Text"}
+                for p in v if set(p) - {"ParagraphIndex", "Text"}
+            ]
+            if not v:
+                continue
+        out[k] = _round(v, ndigits)
+
+    compact_runs = []
+    for run in runs:
+        item = {}
+        if len(runs) > 1 or run.get("Text") != frame.get("Text"):
+            item["Text"] = run.get("Text", "")
+        font = _compact_font(run.get("Font") or {}, ndigits)
+        if font:
+            item["S"] = styles.ref(font)
+        for k, v in run.items():
+            if k not in ("Text", "Font") and not _is_empty(v):
+                item[k] = v
+        if item:
+            compact_runs.append(item)
+    if compact_runs:
+        out["Runs"] = compact_runs
+    return out
+
+
+def _compact(value, styles: StyleTable, ndigits: int):
+    if isinstance(value, dict):
+        if "TextFrame" in value and isinstance(value["TextFrame"], dict):
+            value = dict(value, TextFrame=_compact_text_frame(value["TextFrame"], styles, ndigits))
+        out = {}
+        for k, v in value.items():
+            if k in DROP_KEYS:
+                continue
+            if k != "TextFrame":
+                v = _compact(v, styles, ndigits)
+            if _is_empty(v):
+                continue
+            out[k] = _round(v, ndigits) if k in GEOMETRY_KEYS else v
+        return out
+    if isinstance(value, list):
+        return [_compact(v, styles, ndigits) for v in value]
+    return value
+
+
+def compact_slide(parse: dict, styles: StyleTable = None, ndigits: int = 1) -> dict:
+    """parse_active_slide_objects() 결과를 compact dict로 변환 (Styles table 포함)."""
+    if not isinstance(parse, dict):
+        return parse
+    own_table = styles is None
+    styles = styles or StyleTable()
+    out = _compact(parse, styles, ndigits)
+    if own_table and styles.styles:
+        out["Styles"] = styles.styles
+    return out
+
+
+def compact_slide_json(parse: dict, ndigits: int = 1) -> str:
+    """프롬프트용 compact JSON 문자열."""
+    if not isinstance(parse, dict):
+        return str(parse)
+    return json.dumps(compact_slide(parse, ndigits=ndigits), ensure_ascii=False, separators=(",", ":"))
+
+
+def diff_slides(old_parse: dict, new_parse: dict, target_ids=None, ndigits: int = 1) -> dict:
+    """
+    Validator diff mode: keeps only the shapes that differ (by Shape_Id) and
+    slide-level fields that changed. Both sides share one Styles table.
+    Unchanged shapes in target_ids (tool targets) are listed once under
+    "Unchanged_Targets" so "already satisfied" requests can still be judged.
+
+    Returns:
+        {"Before": {...}, "After": {...}, "Unchanged_Targets": [...],
+         "Unchanged_Shape_Ids": [...], "Styles": {...}}
+    """
+    target_ids = set(target_ids or ())
+    old_parse = old_parse or {}
+    new_parse = new_parse or {}
+    styles = StyleTable()
+
+    def by_id(parse):
+        return {
+            shape.get("Shape_Id"): compact_slide(shape, styles, ndigits)
+            for shape in parse.get("Objects_Detail", [])
+        }
+
+    old_shapes = by_id(old_parse)
+    new_shapes = by_id(new_parse)
+
+    before = {"Objects_Detail": []}
+    after = {"Objects_Detail": []}
+    unchanged = []
+    unchanged_targets = []
+    for sid in list(old_shapes) + [s for s in new_shapes if s not in old_shapes]:
+        old_shape = old_shapes.get(sid)
+        new_shape = new_shapes.get(sid)
+        if old_shape == new_shape:
+            if sid in target_ids:
+                unchanged_targets.append(old_shape)
+            else:
+                unchanged.append(sid)
+            continue
+        if old_shape is not None:
+            before["Objects_Detail"].append(old_shape)
+        if new_shape is not None:
+            after["Objects_Detail"].append(new_shape)
+
+    # slide-level 필드 (notes, properties, ...)
+    for key in set(old_parse) | set(new_parse):
+        if key == "Objects_Detail" or key in DROP_KEYS:
+            continue
+        old_value = compact_slide(old_parse.get(key), styles, ndigits)
+        new_value = compact_slide(new_parse.get(key), styles, ndigits)
+        if old_value != new_value:
+            if not _is_empty(old_value):
+                before[key] = old_value
+            if not _is_empty(new_value):
+                after[key] = new_value
+
+    used = set()
+    _collect_style_refs(before, used)
+    _collect_style_refs(after, used)
+    _collect_style_refs(unchanged_targets, used)
+    return {
+        "Before": before,
+        "After": after,
+        "Unchanged_Targets": unchanged_targets,
+        "Unchanged_Shape_Ids": unchanged,
+        "Styles": {sid: font for sid, font in styles.styles.items() if sid in used},
+    }
+
+
+def _collect_style_refs(value, used: set):
+    if isinstance(value, dict):
+        if "S" in value:
+            used.add(value["S"])
+        for v in value.values():
+            _collect_style_refs(v, used)
+    elif isinstance(value, list):
+        for v in value:
+            _collect_style_refs(v, used)
+
+
+def diff_slides_json(old_parse: dict, new_parse: dict, target_ids=None, ndigits: int = 1) -> str:
+    return json.dumps(
+        diff_slides(old_parse, new_parse, target_ids, ndigits),
+        ensure_ascii=False, separators=(",", ":"),
+    )
+
+
+def compact_tool_calls(tool_calls: list) -> list:
+    """프롬프트/feedback용 tool call 목록 (주입된 slide_json 등 제외)."""
+    out = []
+    for tc in tool_calls or []:
+        args = {
+            k: v for k, v in (tc.get("arguments") or {}).items()
+            if k not in INJECTED_TOOL_ARGS
+        }
+        out.append({"name": tc.get("name"), "arguments": args})
+    return out
+
+
+def format_tool_calls(tool_calls: list) -> str:
+    """'name({args})' 형식 (agent feedback 문자열)."""
+    return ", ".join(f"{tc['name']}({tc['arguments']})" for tc in compact_tool_calls(tool_calls))
@@ -0,0 +1,194 @@
+# tracer.py
+"""
+Lightweight span tracer for the agent loop (where does a task's time go).
+
+    @traced("parse")
+    def process(self, page_number): ...
+
+    with span("tool", tool=name):
+        ...
+    annotate(input_tokens=..., output_tokens=...)   # 현재 span에 속성 추가
+
+- 현재 span은 contextvars로 전달된다. asyncio.to_thread와 com_call()이 호출한
+  쪽의 context를 넘기므로 COM thread에서 실행된 span도 task 아래에 붙는다
+- 끝난 span은 logfiles/{TIMESTAMP}/trace_spans.jsonl에 한 줄씩 기록
+  {"id", "parent", "root", "name", "start", "seconds", "thread", "attrs"}
+- report=True인 root span(task, planner)이 끝나면 phase별 표를 출력
+  (self 시간 기준이라 share 합계가 100%)
+- EDITPPT_TRACE=0이면 끔
+"""
+import os
+import time
+import itertools
+import functools
+import threading
+import contextvars
+from contextlib import contextmanager
+
+from editppt.utils.jsonl_log import get_writer
+
+
+TRACE_FILE = "trace_spans.jsonl"
+ENABLED = os.getenv("EDITPPT_TRACE", "1") != "0"
+
+_IDS = itertools.count(1)
+_CURRENT = contextvars.ContextVar("editppt_span", default=None)
+
+
+class Span:
+    def __init__(self, name: str, parent: "Span", attrs: dict, report: bool = False):
+        self.id = next(_IDS)
+        self.name = name
+        self.parent = parent
+        self.root = parent.root if parent is not None else self
+        self.attrs = attrs
+        self.report = report
+        self.start = time.time()
+        self.t0 = time.perf_counter()
+        self.seconds = None
+        self.child_seconds = 0.0
+        if self.root is self:
+            # root만: 끝난 하위 span 목록 (COM thread에서도 끝나므로 lock)
+            self.finished = []
+            self.lock = threading.Lock()
+
+    @property
+    def self_seconds(self) -> float:
+        return max(0.0, (self.seconds or 0.0) - self.child_seconds)
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+class _NullSpan:
+    """tracer가 꺼져 있을 때 span()이 돌려주는 객체"""
+
+    def set(self, **attrs):
+        pass
+
+
+_NULL = _NullSpan()
+
+
+@contextmanager
+def span(name: str, report: bool = False, **attrs):
+    """
+    Args:
+        report: root span으로 끝나면 phase별 표를 출력
+        attrs: jsonl에 함께 기록할 속성 (page, tool, model 등)
+    """
+    if not ENABLED:
+        yield _NULL
+        return
+    current = Span(name, _CURRENT.get(), attrs, report)
+    token = _CURRENT.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.attrs["error"] = type(e).__name__
+        raise
+    finally:
+        _CURRENT.reset(token)
+        _finish(current)
+
+
+def traced(name: str, report: bool = False):
+    """함수 전체를 span으로 감싸는 decorator"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name, report=report):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def annotate(**attrs):
+    """현재 span에 속성 추가 (span 밖이면 무시)"""
+    current = _CURRENT.get()
+    if current is not None:
+        current.attrs.update(attrs)
+
+
+def current_span():
+    return _CURRENT.get()
+
+
+def _finish(current: Span):
+    current.seconds = time.perf_counter() - current.t0
+    root = current.root
+    with root.lock:
+        if current.parent is not None:
+            current.parent.child_seconds += current.seconds
+            root.finished.append(current)
+
+    get_writer(TRACE_FILE).append({
+        "id": current.id,
+        "parent": current.parent.id if current.parent is not None else None,
+        "root": root.id,
+        "name": current.name,
+        "start": current.start,
+        "seconds": round(current.seconds, 6),
+        "thread": threading.current_thread().name,
+        "attrs": current.attrs,
+    })
+
+    if current is root and current.report:
+        print(format_breakdown(current))
+
+
+def _phase(s: Span) -> str:
+    """표의 행 이름: root 바로 아래면 span 이름, 더 깊으면 '이름 < 부모'"""
+    if s.parent is None or s.parent is s.root:
+        return s.name
+    return f"{s.name} < {s.parent.name}"
+
+
+def breakdown(root: Span) -> list:
+    """
+    Returns:
+        [{"phase", "calls", "seconds", "self_seconds", "share", "input_tokens", "cached_tokens",
+          "output_tokens"}, ...]
+        self_seconds 내림차순, 마지막 행은 root 자체 (하위 span 밖에서 쓴 시간)
+    """
+    with root.lock:
+        spans = list(root.finished)
+    rows = {}
+    for s in spans:
+        row = rows.setdefault(_phase(s), {
+            "phase": _phase(s), "calls": 0, "seconds": 0.0, "self_seconds": 0.0,
+            "input_tokens": 0, "cached_tokens": 0, "output_tokens": 0,
+        })
+        row["calls"] += 1
+        row["seconds"] += s.seconds
+        row["self_seconds"] += s.self_seconds
+        row["input_tokens"] += s.attrs.get("input_tokens") or 0
+        row["cached_tokens"] += s.attrs.get("cached_tokens") or 0
+        row["output_tokens"] += s.attrs.get("output_tokens") or 0
+
+    ordered = sorted(rows.values(), key=lambda r: r["self_seconds"], reverse=True)
+    ordered.append({
+        "phase": f"({root.name}, untraced)", "calls": 1, "seconds": root.self_seconds,
+        "self_seconds": root.self_seconds, "input_tokens": 0, "cached_tokens": 0, "output_tokens": 0,
+    })
+    total = root.seconds or 0.0
+    for row in ordered:
+        row["share"] = row["self_seconds"] / total if total else 0.0
+    return ordered
+
+
+def format_breakdown(root: Span) -> str:
+    title = " ".join(f"{k}={str(v)[:40]}" for k, v in root.attrs.items() if isinstance(v, (int, float, str)))
+    lines = [
+        f"[Trace] {root.name} {title} — {root.seconds:.2f}s",
+        f"{'phase':<34}{'calls':>6}{'total s':>10}{'self s':>10}{'share':>8}{'tokens in(cached)/out':>26}",
+    ]
+    for row in breakdown(root):
+        tokens = ""
+        if row["input_tokens"] or row["output_tokens"]:
+            tokens = f"{row['input_tokens']}({row['cached_tokens']})/{row['output_tokens']}"
+        lines.append(
+            f"{row['phase'][:33]:<34}{row['calls']:>6}{row['seconds']:>10.3f}"
+            f"{row['self_seconds']:>10.3f}{row['share']:>8.1%}{tokens:>26}"
+        )
+    return "\n".join(lines)
@@ -5,10 +5,12 @@ from openai import OpenAI
 import re
 import json
 import ast
+import hashlib
 import unicodedata
 
 from editppt.utils.logger_manual import *
 from editppt.utils.msoffice_map import *
+from editppt.utils.bulk_export import build_text_detail
 
 
 def parse_llm_response(response):
@@ -97,23 +99,9 @@ def create_thinking_queue(plan_json):
 
 import openai
 from openai import OpenAI
-import tiktoken
-
-# 모델별 토큰당 단가(예시: USD/1K tokens)
-PRICING = {
-    #"gpt-4.1-2025-04-14":    {"prompt": 0.03/1000, "completion": 0.06/1000},
-    "gpt-4.1-mini-2025-04-14":{"prompt": 0.4/1000000, "completion": 1.6/1000000},
-    #"gpt-4.1-nano-2025-04-14":{"prompt": 0.001/1000, "completion": 0.001/1000},
-    #"o4-mini":               {"prompt": 0.002/1000, "completion": 0.002/1000},
-}
 
-def count_tokens(text: str, model: str) -> int:
-    """tiktoken으로 토큰 수 계산"""
-    try:
-        enc = tiktoken.encoding_for_model(model)
-    except KeyError:
-        enc = tiktoken.get_encoding("cl100k_base")
-    return len(enc.encode(text))
+# 단가표 / 토큰 계산은 call_llm ledger와 공유
+from editppt.utils.llm_ledger import PRICING, count_tokens, estimate_cost
 
 def _call_gpt_api(prompt: str, api_key: str, model: str):
     # --- API 키 설정 및 모델 검증/매핑 ---
@@ -149,11 +137,7 @@ def _call_gpt_api(prompt: str, api_key: str, model: str):
         out_toks = count_tokens(text, model)
 
     # --- 비용 계산 ---
-    rates = PRICING.get(model)
-    if rates is None:
-        total_cost = None
-    else:
-        total_cost = inp_toks * rates["prompt"] + out_toks * rates["completion"]
+    total_cost = estimate_cost(model, inp_toks, out_toks)
 
     # --- 항상 4개 값 반환 ---
     return text, inp_toks, out_toks, total_cost
@@ -551,6 +535,80 @@ def build_paragraph_ir_from_textframe(runs, paragraphs):
 #     return paragraph_ir
 
 
+def extract_runs_from_com_runs(tr, n):
+    """
+    TextRange.Runs() 기반 run 추출.
+    글자마다 Characters(i, 1) + snap()을 호출하는 대신, PowerPoint가 이미 나눠둔
+    run 단위로만 snap()을 호출하고 같은 snap을 가진 인접 run을 병합한다.
+    결과(Runs / Run_Start_Index)는 per-character 방식과 동일하다.
+
+    Returns:
+    - run dict 리스트
+    - None: run 경계가 전체 텍스트와 맞지 않는 경우 (per-character fallback 필요)
+    """
+    try:
+        run_count = tr.Runs().Count
+    except Exception:
+        return None
+    if not run_count:
+        return None
+
+    # [start(1-based), length, snap]
+    segments = []
+    expected_start = 1
+    for k in range(1, run_count + 1):
+        r = tr.Runs(k)
+        start = safe(r, "Start")
+        length = safe(r, "Length", 0)
+        if start != expected_start or length <= 0:
+            return None
+
+        run_snap = snap(safe(r, "Font"))
+        if segments and segments[-1][2] == run_snap:
+            segments[-1][1] += length
+        else:
+            segments.append([start, length, run_snap])
+        expected_start = start + length
+
+    if expected_start - 1 != n:
+        return None
+
+    runs = []
+    for start, length, _ in segments:
+        run = make_run_dict(tr.Characters(start, length))
+        run["Run_Start_Index"] = start - 1
+        runs.append(run)
+    return runs
+
+
+def extract_runs_per_character(tr, n):
+    """
+    글자 단위 snap() 비교로 run 경계를 찾는 기존 방식.
+    COM 호출이 글자 수에 비례하므로 extract_runs_from_com_runs 실패 시에만 사용.
+    """
+    runs = []
+    cur_idx = 1
+    cur_snap = snap(safe(tr.Characters(cur_idx, 1), "Font"))
+
+    for i in range(2, n + 1):
+        nxt_snap = snap(safe(tr.Characters(i, 1), "Font"))
+        if nxt_snap != cur_snap:
+            seg_len = i - cur_idx
+            if seg_len > 0:
+                run = make_run_dict(tr.Characters(cur_idx, seg_len))
+                run["Run_Start_Index"] = cur_idx - 1 
+                runs.append(run)
+            cur_idx = i
+            cur_snap = nxt_snap
+
+    last_len = n - cur_idx + 1
+    if last_len > 0:
+        run = make_run_dict(tr.Characters(cur_idx, last_len))
+        run["Run_Start_Index"] = cur_idx - 1           
+        runs.append(run)
+    return runs
+
+
 def parse_text_frame_debug(text_frame):
     out = {"Has Text": False}
     if not safe(text_frame, "HasText", False):
@@ -565,33 +623,20 @@ def parse_text_frame_debug(text_frame):
         out["Paragraphs"] = []
         return out
 
-    runs = []
     n = len(full)
     try:
-        cur_idx = 1
-        cur_snap = snap(safe(tr.Characters(cur_idx, 1), "Font"))
-
-        for i in range(2, n + 1):
-            nxt_snap = snap(safe(tr.Characters(i, 1), "Font"))
-            if nxt_snap != cur_snap:
-                seg_len = i - cur_idx
-                if seg_len > 0:
-                    # runs.append(make_run_dict(tr.Characters(cur_idx, seg_len)))
-                    run = make_run_dict(tr.Characters(cur_idx, seg_len))
-                    run["Run_Start_Index"] = cur_idx - 1 
-                    runs.append(run)
-                cur_idx = i
-                cur_snap = nxt_snap
-
-        last_len = n - cur_idx + 1
-        if last_len > 0:
-            run = make_run_dict(tr.Characters(cur_idx, last_len))
-            run["Run_Start_Index"] = cur_idx - 1           
-            runs.append(run)
-    except Exception as e:
-        print(f"Error parsing runs: {e}")
-        traceback.print_exc()
-        runs.append(make_run_dict(tr))
+        runs = extract_runs_from_com_runs(tr, n)
+    except Exception:
+        runs = None
+
+    # run 경계가 일관되지 않을 때만 글자 단위로 fallback
+    if runs is None:
+        try:
+            runs = extract_runs_per_character(tr, n)
+        except Exception as e:
+            print(f"Error parsing runs: {e}")
+            traceback.print_exc()
+            runs = [make_run_dict(tr)]
 
     out["Runs"] = runs
 
@@ -1032,12 +1077,39 @@ def parse_slide_properties(slide):
     return result
 
 
-def parse_active_slide_objects(slide_num: int, prs_obj):
+# 하위 항목이 fingerprint에 드러나지 않는 타입 (Group, Chart, Table) → 항상 재파싱
+UNCACHEABLE_SHAPE_TYPES = (3, 6, 19)
+
+def shape_fingerprint(shape, stype, left, top, width, height):
+    """
+    Shape 재파싱 여부를 판단하기 위한 저비용 fingerprint.
+    위치/크기 + TextRange.Text 1회 읽기(길이, 해시)만 사용한다.
+    캐시할 수 없는 타입이면 None 반환.
+    """
+    if stype in UNCACHEABLE_SHAPE_TYPES:
+        return None
+
+    text = ""
+    try:
+        if shape.HasTextFrame:
+            text = shape.TextFrame.TextRange.Text or ""
+    except Exception:
+        return None
+
+    text_hash = hashlib.sha1(text.encode("utf-8")).hexdigest()
+    return (stype, left, top, width, height, len(text), text_hash)
+
+
+def parse_active_slide_objects(slide_num: int, prs_obj, shape_cache=None, bulk_exporter=None):
     """
     Parse Every Object Information from a Slide.
     Args:
         slide_num (int): 파싱할 슬라이드 번호 (1-based)
         prs_obj: PPTContainer.prs 또는 win32com Presentation 객체
+        shape_cache: get(slide, shape_id, fingerprint) / put(...)을 제공하는 캐시 (선택).
+            fingerprint가 같은 shape은 text/run/bullet 파싱을 건너뛴다.
+        bulk_exporter: BulkSlideExporter (선택). 사용 가능하면 슬라이드 전체를
+            매크로 1회로 읽고, 실패 시 아래 속성 단위 파싱으로 fallback.
     """
 
     output = {}
@@ -1071,6 +1143,15 @@ def parse_active_slide_objects(slide_num: int, prs_obj):
         output["Objects_Overview"] = f"Found {shape_count} objects"
         output["Objects_Detail"] = []
 
+        records = bulk_exporter.export(slide) if bulk_exporter is not None else None
+        if records is not None and len(records) == shape_count:
+            output["Objects_Detail"] = [
+                shape_info_from_record(i, record, shapes)
+                for i, record in enumerate(records, start=1)
+            ]
+            output["Slide_Notes"] = parse_slide_notes(slide)
+            return output
+
         for i in range(1, shape_count + 1):
             shape = shapes(i)
 
@@ -1083,6 +1164,18 @@ def parse_active_slide_objects(slide_num: int, prs_obj):
             width = shape.Width
             height = shape.Height
 
+            # ---- 캐시된 상세 정보 재사용 (fingerprint가 같을 때만) ----
+            more_detail = None
+            fingerprint = None
+            if shape_cache is not None:
+                fingerprint = shape_fingerprint(shape, stype, left, top, width, height)
+                more_detail = shape_cache.get(slide_num, sid, fingerprint)
+
+            if more_detail is None:
+                more_detail = parse_shape_details_fast(shape, stype)
+                if shape_cache is not None:
+                    shape_cache.put(slide_num, sid, fingerprint, more_detail)
+
             shape_info = {
                 "Object_number": i,
                 "Shape_Id": sid,
@@ -1092,7 +1185,7 @@ def parse_active_slide_objects(slide_num: int, prs_obj):
                 "Position_Top": top,
                 "Size_Width": width,
                 "Size_Height": height,
-                "More_detail": parse_shape_details_fast(shape, stype),
+                "More_detail": more_detail,
             }
 
             output["Objects_Detail"].append(shape_info)
@@ -1307,6 +1400,31 @@ def parse_shape_details(shape, indent_level=1):
     
     return result
 
+# bulk payload에 없는 상세 정보가 필요한 타입 (Chart, Group, Picture, Table)
+BULK_DETAIL_SHAPE_TYPES = (3, 6, 13, 19)
+
+def shape_info_from_record(i, record, shapes):
+    """bulk_export 레코드 → Objects_Detail 항목 (필요한 경우만 shape 단위 COM 파싱)."""
+    stype = record["Type"]
+    text = build_text_detail(record)
+    if stype in BULK_DETAIL_SHAPE_TYPES or text is False:
+        more_detail = parse_shape_details_fast(shapes(i), stype)
+    else:
+        more_detail = {"Text": text} if text else {}
+
+    return {
+        "Object_number": i,
+        "Shape_Id": record["Id"],
+        "Name": record["Name"],
+        "Type": SHAPE_TYPE_MAP.get(stype, stype),
+        "Position_Left": record["Left"],
+        "Position_Top": record["Top"],
+        "Size_Width": record["Width"],
+        "Size_Height": record["Height"],
+        "More_detail": more_detail,
+    }
+
+
 def parse_shape_details_fast(shape, stype):
     result = {}
 
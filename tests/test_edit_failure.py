@@ -0,0 +1,45 @@
+# test_edit_failure.py
+"""parser.obvious_edit_failure: validator 전에 거르는 실패 판단"""
+from editppt.parser import obvious_edit_failure
+from editppt.utils.parse_diff import diff_parses
+
+PAGE = 1
+
+
+def _slide():
+    # parse_shape_details_fast()는 Rotation / table cell text를 기록하지 않으므로
+    # 회전이나 cell text를 바꿔도 파싱 결과는 같다
+    return {"Objects_Detail": [
+        {"Shape_Id": 3, "Shape_Name": "Box", "Left": 10, "Top": 10, "Width": 100, "Height": 50},
+        {"Shape_Id": 4, "Shape_Name": "Table", "Left": 10, "Top": 80, "Width": 200, "Height": 100},
+    ]}
+
+
+def _call(name, **args):
+    return {"name": name, "arguments": {"slide_number": PAGE, **args}}
+
+
+def test_rotation_only_layout_is_left_to_validator():
+    changes = diff_parses(_slide(), _slide())
+    used = [_call("adjust_layout", shape_id=3, rotation=45)]
+    assert obvious_edit_failure(changes, PAGE, used) is None
+
+
+def test_layout_without_visible_change_still_fails():
+    changes = diff_parses(_slide(), _slide())
+    used = [_call("adjust_layout", shape_id=3, left=40)]
+    assert "no differences" in obvious_edit_failure(changes, PAGE, used)
+
+
+def test_table_container_text_is_left_to_validator():
+    changes = diff_parses(_slide(), _slide())
+    for name in ("set_text_style_preserve_runs", "replace_shape_text"):
+        used = [_call(name, shape_id=4, container="table", row_index=1, col_index=1)]
+        assert obvious_edit_failure(changes, PAGE, used) is None
+
+
+def test_group_child_target_maps_to_group():
+    old = {"Objects_Detail": [{"Shape_Id": 5, "More_detail": {"GroupShapes": [{"Shape_Id": 9, "Text": "x"}]}}]}
+    new = {"Objects_Detail": [{"Shape_Id": 5, "More_detail": {"GroupShapes": [{"Shape_Id": 9, "Text": "y"}]}}]}
+    used = [_call("replace_shape_text", shape_id=9)]
+    assert obvious_edit_failure(diff_parses(old, new), PAGE, used, {9: 5}) is None
@@ -0,0 +1,54 @@
+# test_preparse.py
+"""OOXML pre-parse vs COM parse, Parser.com_baseline()"""
+from types import SimpleNamespace
+
+import pytest
+
+from editppt.benchmarks.fake_com import load_presentation
+from editppt.parser import Parser
+from editppt.tools import tools
+from editppt.utils.ooxml_parser import parse_pptx
+from editppt.utils.parse_diff import diff_parses, has_changes, summarize_changes
+from editppt.utils.utils import parse_active_slide_objects
+
+FIXTURES = ["math_simple.pptx", "news_card.pptx", "test.pptx"]
+
+
+def _path(request, name):
+    return str(request.config.rootpath / "sample_ppt" / name)
+
+
+@pytest.mark.parametrize("name", FIXTURES)
+def test_ooxml_and_com_parse_are_diff_equal(request, name):
+    # fake COM deck은 같은 파일로 만들어지므로 theme 상속 해석 차이는 여기서 보이지 않는다.
+    # run 병합(snap key), Run_Start_Index, 문단/bullet 구조가 diff 기준으로 같은지 본다.
+    path = _path(request, name)
+    tools.invalidate_shape_index()
+    prs = load_presentation(path)
+    ooxml = parse_pptx(path)
+    for page_number in range(1, prs.Slides.Count + 1):
+        changes = diff_parses(ooxml[page_number], parse_active_slide_objects(page_number, prs))
+        assert not has_changes(changes), f"slide {page_number}: {summarize_changes(changes)}"
+
+
+def test_com_baseline_replaces_the_preparsed_slide(request):
+    tools.invalidate_shape_index()
+    prs = load_presentation(_path(request, "math_simple.pptx"))
+    parser = Parser(SimpleNamespace(prs=prs), prs.Slides.Count)
+    page_number = 2
+
+    # pre-parse 결과가 COM 파싱과 다른 경우 (예: 상속 font를 다르게 해석)
+    preparsed = parse_active_slide_objects(page_number, prs)
+    preparsed["Objects_Detail"][0]["Shape_Name"] = "resolved differently"
+    parser.database[page_number] = preparsed
+    parser.preparsed = {page_number}
+
+    # prompt용으로는 pre-parse를 그대로 쓴다
+    assert parser.process(page_number) is preparsed
+
+    # 수정 전 기준은 COM으로 다시 읽는다
+    baseline = parser.com_baseline(page_number)
+    assert parser.database[page_number] is baseline
+    assert not has_changes(diff_parses(baseline, parse_active_slide_objects(page_number, prs)))
+    assert page_number not in parser.preparsed
+    assert parser.process(page_number) is not preparsed
@@ -0,0 +1,74 @@
+# test_tool_batch.py
+"""tools/batch.run_batches + EditAgent._apply_tool_calls: batch 안에서 실패한 call"""
+from types import SimpleNamespace
+
+import pytest
+
+from editppt.agent import EditAgent
+from editppt.benchmarks.fake_com import load_presentation
+from editppt.tools import tools
+from editppt.tools.batch import run_batches
+from editppt.tools.journal import EditJournal
+
+SAMPLE = "sample_ppt/math_simple.pptx"
+SLIDE = 3  # shape 9개
+
+
+def _layout(shape_id, **args):
+    return {"name": "adjust_layout", "arguments": {"slide_number": SLIDE, "shape_id": shape_id, **args}}
+
+
+@pytest.fixture
+def prs(request):
+    tools.invalidate_shape_index()
+    return load_presentation(str(request.config.rootpath / SAMPLE))
+
+
+def _shape_ids(prs, n):
+    shapes = prs.Slides(SLIDE).Shapes
+    return [shapes(i).Id for i in range(1, n + 1)]
+
+
+def test_run_batches_stops_at_the_raising_call(prs):
+    first, second, third = _shape_ids(prs, 3)
+    executed = []
+
+    def execute(name, args):
+        executed.append(args["shape_id"])
+        if args["shape_id"] == second:
+            raise ValueError("boom")
+
+    calls = [_layout(first, left=1), _layout(second, left=2), _layout(third, left=3)]
+    failure, report = run_batches(prs, calls, execute)
+
+    assert executed == [first, second]
+    failed_call, error = failure
+    assert failed_call["arguments"]["shape_id"] == second
+    assert str(error) == "boom"
+    assert report[0]["calls"] == 3
+
+
+def test_apply_tool_calls_reports_the_failing_tool(prs, monkeypatch):
+    first, second, third = _shape_ids(prs, 3)
+    real = tools.FUNCTION_MAP["adjust_layout"]
+
+    def adjust_layout(prs, slide_number, shape_id, **kwargs):
+        if shape_id == second:
+            raise RuntimeError("COM error")
+        return real(prs, slide_number, shape_id, **kwargs)
+
+    monkeypatch.setitem(tools.FUNCTION_MAP, "adjust_layout", adjust_layout)
+    before = prs.Slides(SLIDE).Shapes(3).Left
+    agent = EditAgent(SimpleNamespace(prs=prs), "gpt-4.1")
+    journal = EditJournal()
+
+    calls = [_layout(first, left=11), _layout(second, left=22), _layout(third, left=33)]
+    name, args, reason = agent._apply_tool_calls(SLIDE, calls, journal, refresh_backup=False)
+
+    assert name == "adjust_layout"
+    assert args["shape_id"] == second
+    assert "COM error" in reason
+    # 실패한 call 뒤의 call은 실행되지 않는다
+    assert prs.Slides(SLIDE).Shapes(3).Left == before
+    assert prs.Slides(SLIDE).Shapes(1).Left == 11
+    journal.undo()